@@ -1,6 +1,26 @@
 """Entry point for doc-analyzer when run as a module or frozen executable."""
 
-from doc_analyzer.cli import app
+import multiprocessing
+import sys
+
+from doc_analyzer import __version__
+
+
+def main() -> None:
+    """Entry point; answers version queries before importing the CLI.
+
+    Loading Rich and the CLI module dominates start-up time, so
+    requests that only need the version string skip it entirely.
+    """
+    if sys.argv[1:] in (["version"], ["--version"]):
+        print(f"doc-analyzer {__version__}")
+        return
+
+    from doc_analyzer.cli import main as cli_main
+    cli_main()
+
 
 if __name__ == "__main__":
-    app()
+    # Required for the parser's process pool in frozen executables
+    multiprocessing.freeze_support()
+    main()
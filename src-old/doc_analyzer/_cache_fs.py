@@ -0,0 +1,73 @@
+"""Embedding cache location and housekeeping that needs no numpy or asyncio.
+
+``cache-clear`` and ``cache-stats`` only touch the cache on disk, so they
+import this module instead of :mod:`doc_analyzer.cache`.
+"""
+
+import os
+import shutil
+import sqlite3
+from contextlib import closing
+
+from .config import DEFAULT_CONFIG_DIR
+
+CACHE_ROOT = DEFAULT_CONFIG_DIR / "cache"
+# Bumped whenever the key scheme or entry format changes, so entries written
+# by an older version can never be mistaken for current ones.
+CACHE_VERSION = "v2"
+CACHE_DIR = CACHE_ROOT / CACHE_VERSION
+CACHE_DB = CACHE_DIR / "embeddings.sqlite"
+
+
+def _count_entries() -> int:
+    """Count rows in the cache database, 0 if it has no table yet."""
+    if not CACHE_DB.exists():
+        return 0
+    with closing(sqlite3.connect(CACHE_DB)) as conn:
+        try:
+            (count,) = conn.execute("SELECT COUNT(*) FROM emb").fetchone()
+        except sqlite3.OperationalError:
+            return 0
+    return count
+
+
+def clear_cache() -> int:
+    """Clear all cached embeddings on disk.
+
+    The whole cache directory is removed, which also reclaims the database
+    file's space, drops entries left behind by older cache versions and
+    discards the parsed-statement cache under ``parsed/``.
+
+    Returns:
+        Number of embedding cache entries deleted (parsed files not counted)
+    """
+    if not CACHE_ROOT.exists():
+        return 0
+
+    deleted = _count_entries()
+
+    # Per-entry JSON files from the pre-SQLite layout
+    for cache_dir in (CACHE_ROOT, CACHE_DIR):
+        if not cache_dir.exists():
+            continue
+        with os.scandir(cache_dir) as entries:
+            deleted += sum(1 for e in entries if e.name.endswith(".json") and e.is_file())
+
+    shutil.rmtree(CACHE_ROOT, ignore_errors=True)
+    return deleted
+
+
+def get_cache_stats() -> dict:
+    """Get cache statistics."""
+    if not CACHE_DB.exists():
+        return {
+            "total_entries": 0,
+            "total_size_kb": 0,
+            "cache_dir": str(CACHE_DIR),
+        }
+
+    return {
+        "total_entries": _count_entries(),
+        "total_size_kb": round(CACHE_DB.stat().st_size / 1024, 2),
+        "cache_dir": str(CACHE_DIR),
+    }
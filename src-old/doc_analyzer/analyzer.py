@@ -1,10 +1,20 @@
 """Analyzer: Check statement pairs for contradictions using Claude CLI."""
 
+import asyncio
 import json
-import re
+import string
 import subprocess
+import time
+from collections import Counter
+from functools import lru_cache
+from statistics import fmean
 from typing import Any, Callable
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from .config import Config
 from .models import (
     ContradictionResult,
@@ -14,6 +24,17 @@ from .models import (
     Statement,
 )
 
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers need
+# only catch the stdlib error
+_json_loads = orjson.loads if orjson is not None else json.loads
+_JSON_DECODER = json.JSONDecoder()
+
+# Minimum seconds between progress callbacks while analyzing pairs
+PROGRESS_INTERVAL = 0.1
+
+# Most severe first, following the enum's declaration order
+_SEVERITY_RANK = {severity: rank for rank, severity in enumerate(Severity)}
+
 
 class AnalysisError(Exception):
     """Error during contradiction analysis."""
@@ -38,14 +59,14 @@ def analyze_pairs(
         List of ContradictionResult objects
     """
     results: list[ContradictionResult] = []
-    total = len(pairs)
+    report = _throttle_progress(progress_callback, len(pairs))
 
     for i, pair in enumerate(pairs, 1):
         stmt_a = statements[pair.idx_a]
         stmt_b = statements[pair.idx_b]
 
-        if progress_callback:
-            progress_callback(i, total)
+        if report:
+            report(i)
 
         try:
             result = analyze_pair(stmt_a, stmt_b, pair.similarity, config)
@@ -54,18 +75,92 @@ def analyze_pairs(
             # Skip failed analyses
             pass
 
+    return _finalize_results(results, config)
+
+
+async def analyze_pairs_async(
+    pairs: list[SimilarPair],
+    statements: list[Statement],
+    config: Config,
+    max_concurrent: int = 5,
+    progress_callback: Callable[[int, int], None] | None = None,
+) -> list[ContradictionResult]:
+    """Analyze pairs for contradictions using concurrent Claude CLI calls.
+
+    Up to ``max_concurrent`` CLI processes run at once. Results are
+    identical to :func:`analyze_pairs`.
+
+    Args:
+        pairs: List of similar pairs to check
+        statements: All statements (for lookup)
+        config: Configuration object
+        max_concurrent: Maximum concurrent Claude CLI processes (default: 5)
+        progress_callback: Optional callback(completed, total) for progress updates
+
+    Returns:
+        List of ContradictionResult objects
+    """
+    semaphore = asyncio.Semaphore(max_concurrent)
+    report = _throttle_progress(progress_callback, len(pairs))
+    completed = 0
+
+    async def process_pair(pair: SimilarPair) -> ContradictionResult | None:
+        """Analyze a single pair with semaphore."""
+        nonlocal completed
+        async with semaphore:
+            try:
+                return await analyze_pair_async(
+                    statements[pair.idx_a], statements[pair.idx_b], pair.similarity, config,
+                )
+            except AnalysisError:
+                # Skip failed analyses
+                return None
+            finally:
+                completed += 1
+                if report:
+                    report(completed)
+
+    # gather preserves pair order, so sorting ties break exactly as in sync mode
+    outcomes = await asyncio.gather(*(process_pair(pair) for pair in pairs))
+    results = [r for r in outcomes if r is not None]
+
+    return _finalize_results(results, config)
+
+
+def _throttle_progress(
+    progress_callback: Callable[[int, int], None] | None,
+    total: int,
+) -> Callable[[int], None] | None:
+    """Wrap a progress callback so it fires at most every PROGRESS_INTERVAL.
+
+    The final count is always reported.
+    """
+    if progress_callback is None:
+        return None
+
+    last = float("-inf")
+
+    def report(current: int) -> None:
+        nonlocal last
+        now = time.monotonic()
+        if current == total or now - last >= PROGRESS_INTERVAL:
+            last = now
+            progress_callback(current, total)
+
+    return report
+
+
+def _finalize_results(
+    results: list[ContradictionResult],
+    config: Config,
+) -> list[ContradictionResult]:
+    """Filter and sort analysis results for reporting."""
     # Filter to only contradictions if configured
     if not config.output.include_non_contradictions:
         results = [r for r in results if r.is_contradiction]
 
     # Sort by severity and confidence
-    severity_order = {
-        Severity.CRITICAL: 0,
-        Severity.HIGH: 1,
-        Severity.MEDIUM: 2,
-        Severity.LOW: 3,
-    }
-    results.sort(key=lambda r: (severity_order.get(r.severity, 4), -r.confidence))
+    results.sort(key=lambda r: (_SEVERITY_RANK[r.severity], -r.confidence))
 
     return results
 
@@ -87,20 +182,52 @@ def analyze_pair(
     Returns:
         ContradictionResult
     """
-    # Build prompt
-    prompt = config.prompt_template.format(
-        file_a=stmt_a.source_file.name,
-        line_a=stmt_a.line_number,
-        text_a=stmt_a.text,
-        file_b=stmt_b.source_file.name,
-        line_b=stmt_b.line_number,
-        text_b=stmt_b.text,
-    )
-
-    # Call Claude CLI
+    prompt = _build_prompt(stmt_a, stmt_b, config)
     response = _call_claude(prompt, config)
+    return _build_result(stmt_a, stmt_b, similarity, response)
+
+
+async def analyze_pair_async(
+    stmt_a: Statement,
+    stmt_b: Statement,
+    similarity: float,
+    config: Config,
+) -> ContradictionResult:
+    """Analyze a single pair for contradiction (async version).
+
+    Args:
+        stmt_a: First statement
+        stmt_b: Second statement
+        similarity: Similarity score
+        config: Configuration object
+
+    Returns:
+        ContradictionResult
+    """
+    prompt = _build_prompt(stmt_a, stmt_b, config)
+    response = await _call_claude_async(prompt, config)
+    return _build_result(stmt_a, stmt_b, similarity, response)
+
+
+def _build_prompt(stmt_a: Statement, stmt_b: Statement, config: Config) -> str:
+    """Fill the configured prompt template for a statement pair."""
+    return _render_prompt(config.prompt_template, {
+        "file_a": stmt_a.source_file.name,
+        "line_a": stmt_a.line_number,
+        "text_a": stmt_a.text,
+        "file_b": stmt_b.source_file.name,
+        "line_b": stmt_b.line_number,
+        "text_b": stmt_b.text,
+    })
 
-    # Parse response
+
+def _build_result(
+    stmt_a: Statement,
+    stmt_b: Statement,
+    similarity: float,
+    response: str,
+) -> ContradictionResult:
+    """Turn a raw Claude response into a ContradictionResult."""
     parsed = _parse_response(response)
 
     return ContradictionResult(
@@ -115,6 +242,40 @@ def analyze_pair(
     )
 
 
+@lru_cache(maxsize=8)
+def _compile_prompt(template: str) -> tuple | None:
+    """Split a prompt template into (literal, field, spec, conversion) parts.
+
+    Returns None for templates using attribute/index access or nested
+    specs, which are left to ``str.format_map``.
+    """
+    parts = tuple(string.Formatter().parse(template))
+    for _, field, spec, _ in parts:
+        if field is not None and (not field.isidentifier() or "{" in spec):
+            return None
+    return parts
+
+
+def _render_prompt(template: str, values: dict[str, Any]) -> str:
+    """Fill a prompt template, parsing it only once per distinct template."""
+    parts = _compile_prompt(template)
+    if parts is None:
+        return template.format_map(values)
+
+    out: list[str] = []
+    for literal, field, spec, conversion in parts:
+        out.append(literal)
+        if field is None:
+            continue
+        value = values[field]
+        if conversion == "r":
+            value = repr(value)
+        elif conversion == "a":
+            value = ascii(value)
+        out.append(format(value, spec) if spec else str(value))
+    return "".join(out)
+
+
 def _call_claude(prompt: str, config: Config) -> str:
     """Call Claude CLI and return response."""
     cmd = [config.claude.command] + config.claude.args + [prompt]
@@ -141,63 +302,109 @@ def _call_claude(prompt: str, config: Config) -> str:
         )
 
 
-def _parse_response(response: str) -> dict[str, Any]:
-    """Parse Claude's JSON response."""
-    # Try to extract JSON from response
-    # Claude might wrap it in markdown code blocks
-
-    # Remove markdown code blocks if present
-    json_match = re.search(r"```(?:json)?\s*(\{[\s\S]*?\})\s*```", response)
-    if json_match:
-        json_str = json_match.group(1)
-    else:
-        # Try to find raw JSON
-        json_match = re.search(r"\{[\s\S]*\}", response)
-        if json_match:
-            json_str = json_match.group(0)
-        else:
-            # Return defaults if no JSON found
-            return {
-                "contradiction": False,
-                "confidence": 0.0,
-                "type": "none",
-                "severity": "low",
-                "explanation": "Could not parse response",
-            }
+async def _call_claude_async(prompt: str, config: Config) -> str:
+    """Call Claude CLI without blocking the event loop and return response."""
+    # Each pair deliberately gets a fresh process: a long-lived streaming
+    # session would carry earlier pairs in its conversation context, biasing
+    # verdicts and growing every request. Process start-up is amortized by
+    # running up to max_concurrent of these at once instead.
+    cmd = [config.claude.command] + config.claude.args + [prompt]
 
     try:
-        return json.loads(json_str)
-    except json.JSONDecodeError:
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+    except FileNotFoundError:
+        raise AnalysisError(
+            f"Claude CLI not found: {config.claude.command}. "
+            "Install it or configure correct path in config."
+        )
+
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), config.claude.timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise AnalysisError(f"Claude CLI timeout after {config.claude.timeout}s")
+
+    if proc.returncode != 0:
+        raise AnalysisError(f"Claude CLI error: {stderr.decode(errors='replace')}")
+
+    return stdout.decode(errors="replace").strip()
+
+
+def _parse_response(response: str) -> dict[str, Any]:
+    """Parse Claude's JSON response.
+
+    Claude might wrap the JSON in a markdown code block or surround it with
+    prose, so the object is located by scanning rather than by regex.
+    """
+    start = response.find("{")
+    if start < 0:
+        # Return defaults if no JSON found
         return {
             "contradiction": False,
             "confidence": 0.0,
             "type": "none",
             "severity": "low",
-            "explanation": "Invalid JSON in response",
+            "explanation": "Could not parse response",
         }
 
+    # Fast path: everything between the outermost braces is the object
+    try:
+        parsed = _json_loads(response[start:response.rfind("}") + 1])
+        if isinstance(parsed, dict):
+            return parsed
+    except json.JSONDecodeError:
+        pass
+
+    # Otherwise decode from each "{" in turn, ignoring trailing text
+    while start >= 0:
+        try:
+            parsed, _ = _JSON_DECODER.raw_decode(response, start)
+            if isinstance(parsed, dict):
+                return parsed
+        except json.JSONDecodeError:
+            pass
+        start = response.find("{", start + 1)
+
+    return {
+        "contradiction": False,
+        "confidence": 0.0,
+        "type": "none",
+        "severity": "low",
+        "explanation": "Invalid JSON in response",
+    }
+
+
+_TYPE_MAP = {
+    "direct": ContradictionType.DIRECT,
+    "numerical": ContradictionType.NUMERICAL,
+    "temporal": ContradictionType.TEMPORAL,
+    "implicit": ContradictionType.IMPLICIT,
+    "none": ContradictionType.NONE,
+}
+
+_SEVERITY_MAP = {
+    "critical": Severity.CRITICAL,
+    "high": Severity.HIGH,
+    "medium": Severity.MEDIUM,
+    "low": Severity.LOW,
+}
 
+
+@lru_cache(maxsize=16)
 def _parse_type(type_str: str) -> ContradictionType:
     """Parse contradiction type string."""
-    type_map = {
-        "direct": ContradictionType.DIRECT,
-        "numerical": ContradictionType.NUMERICAL,
-        "temporal": ContradictionType.TEMPORAL,
-        "implicit": ContradictionType.IMPLICIT,
-        "none": ContradictionType.NONE,
-    }
-    return type_map.get(type_str.lower(), ContradictionType.NONE)
+    return _TYPE_MAP.get(type_str.lower(), ContradictionType.NONE)
 
 
+@lru_cache(maxsize=16)
 def _parse_severity(severity_str: str) -> Severity:
     """Parse severity string."""
-    severity_map = {
-        "critical": Severity.CRITICAL,
-        "high": Severity.HIGH,
-        "medium": Severity.MEDIUM,
-        "low": Severity.LOW,
-    }
-    return severity_map.get(severity_str.lower(), Severity.LOW)
+    return _SEVERITY_MAP.get(severity_str.lower(), Severity.LOW)
 
 
 def test_claude_cli(config: Config) -> bool:
@@ -218,23 +425,13 @@ def get_contradiction_summary(results: list[ContradictionResult]) -> dict:
     """Get summary of contradiction analysis."""
     contradictions = [r for r in results if r.is_contradiction]
 
-    by_severity: dict[str, int] = {}
-    by_type: dict[str, int] = {}
-
-    for c in contradictions:
-        sev = c.severity.value
-        by_severity[sev] = by_severity.get(sev, 0) + 1
-
-        typ = c.contradiction_type.value
-        by_type[typ] = by_type.get(typ, 0) + 1
-
     return {
         "total_analyzed": len(results),
         "total_contradictions": len(contradictions),
-        "by_severity": by_severity,
-        "by_type": by_type,
+        "by_severity": dict(Counter(c.severity.value for c in contradictions)),
+        "by_type": dict(Counter(c.contradiction_type.value for c in contradictions)),
         "avg_confidence": (
-            sum(c.confidence for c in contradictions) / len(contradictions)
+            fmean(c.confidence for c in contradictions)
             if contradictions
             else 0.0
         ),
@@ -1,12 +1,35 @@
 """Hybrid anomaly detection: Ensemble of Isolation Forest, LOF, and HDBSCAN."""
 
+import os
+from collections import Counter
+from itertools import chain
+
 import numpy as np
+from scipy.linalg.blas import sgemm
 from sklearn.ensemble import IsolationForest
 from sklearn.neighbors import LocalOutlierFactor
-from sklearn.preprocessing import MinMaxScaler
 
 from .config import AnomalyConfig
 from .models import Anomaly, AnomalyMethod, AnomalyScores, ClusterResult, Statement
+from .similarity import PrecomputedSimilarity, normalize_rows
+
+# Optional: Numba fuses the ensemble arithmetic into a single pass
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+# Optional: psutil tells physical from logical cores
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Score boost for points flagged by at least min_methods_agree detectors
+AGREEMENT_BONUS = 0.2
+
+# Isolation Forest rows per scoring block
+IF_SCORE_BLOCK = 10_000
 
 
 def detect_anomalies(
@@ -14,6 +37,7 @@ def detect_anomalies(
     statements: list[Statement],
     cluster_result: ClusterResult,
     config: AnomalyConfig | None = None,
+    precomputed: PrecomputedSimilarity | None = None,
 ) -> list[Anomaly]:
     """Detect anomalous statements using hybrid ensemble approach.
 
@@ -24,10 +48,12 @@ def detect_anomalies(
     4. Ensemble - combines all methods with weighted voting
 
     Args:
-        embeddings: Embedding vectors (n_statements, embedding_dim)
+        embeddings: Embedding vectors (n_statements, embedding_dim); any float
+            dtype, including a float16 np.memmap (promoted to float32 once)
         statements: List of Statement objects
         cluster_result: Clustering result from HDBSCAN/KMeans
         config: Anomaly detection configuration
+        precomputed: Optional shared result of precompute_similarity (reused by LOF)
 
     Returns:
         List of Anomaly objects sorted by score (most anomalous first)
@@ -37,19 +63,30 @@ def detect_anomalies(
 
     method = AnomalyMethod(config.method)
 
+    # Single float32 contiguous copy for all detectors (halves memory traffic)
+    embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+
     # Calculate scores from each detector
     if_scores = _isolation_forest_scores(embeddings, config)
-    lof_scores = _lof_scores(embeddings, config)
+    lof_scores = _lof_scores(embeddings, config, precomputed)
     hdbscan_scores = _hdbscan_scores(cluster_result)
     centroid_scores = _centroid_distance_scores(embeddings, cluster_result)
 
+    # Per-detector thresholds (constant across statements)
+    if_threshold = np.percentile(if_scores, (1 - config.contamination) * 100)
+    lof_threshold = np.percentile(lof_scores, (1 - config.contamination) * 100)
+
+    if_flags = if_scores >= if_threshold
+    lof_flags = lof_scores >= lof_threshold
+    hdbscan_flags = hdbscan_scores > 0.5
+
     # Combine scores based on method
     if method == AnomalyMethod.ISOLATION_FOREST:
         combined_scores = if_scores
-        threshold = np.percentile(combined_scores, (1 - config.contamination) * 100)
+        threshold = if_threshold
     elif method == AnomalyMethod.LOF:
         combined_scores = lof_scores
-        threshold = np.percentile(combined_scores, (1 - config.contamination) * 100)
+        threshold = lof_threshold
     elif method == AnomalyMethod.HDBSCAN:
         combined_scores = hdbscan_scores
         threshold = 0.5  # Binary: noise or not
@@ -65,7 +102,7 @@ def detect_anomalies(
     anomalies: list[Anomaly] = []
 
     for i, (stmt, score, label) in enumerate(
-        zip(statements, combined_scores, cluster_result.labels)
+        zip(statements, combined_scores, cluster_result.labels.tolist())
     ):
         if score < threshold:
             continue
@@ -74,18 +111,15 @@ def detect_anomalies(
         methods_flagged = []
         reasons = []
 
-        if_threshold = np.percentile(if_scores, (1 - config.contamination) * 100)
-        lof_threshold = np.percentile(lof_scores, (1 - config.contamination) * 100)
-
-        if if_scores[i] >= if_threshold:
+        if if_flags[i]:
             methods_flagged.append("isolation_forest")
             reasons.append(f"Isolation Forest: {if_scores[i]:.3f}")
 
-        if lof_scores[i] >= lof_threshold:
+        if lof_flags[i]:
             methods_flagged.append("lof")
             reasons.append(f"LOF: {lof_scores[i]:.3f}")
 
-        if hdbscan_scores[i] > 0.5:
+        if hdbscan_flags[i]:
             methods_flagged.append("hdbscan")
             reasons.append("HDBSCAN noise")
 
@@ -127,34 +161,59 @@ def _isolation_forest_scores(
 
     Returns scores in [0, 1] where higher = more anomalous.
     """
+    n_samples = len(embeddings)
+
     iso = IsolationForest(
         n_estimators=config.isolation_forest_estimators,
+        max_samples=min(config.isolation_forest_max_samples, n_samples),
         contamination=config.contamination,
         random_state=42,
-        n_jobs=-1,
+        n_jobs=_physical_cores(),
     )
 
     # fit_predict returns -1 for anomalies, 1 for normal
     # decision_function returns negative for anomalies
     iso.fit(embeddings)
-    raw_scores = -iso.decision_function(embeddings)  # Negate so higher = anomaly
+
+    # Score in row blocks to keep the traversal working set small
+    raw_scores = np.concatenate([
+        -iso.decision_function(embeddings[i : i + IF_SCORE_BLOCK])  # Negate so higher = anomaly
+        for i in range(0, n_samples, IF_SCORE_BLOCK)
+    ])
 
     # Normalize to [0, 1]
     return _normalize_scores(raw_scores)
 
 
+def _physical_cores() -> int:
+    """Physical cores if psutil can tell, else logical CPUs.
+
+    Tree workloads don't gain from hyperthreads, but halving cpu_count()
+    would also halve machines without SMT.
+    """
+    if psutil is not None:
+        cores = psutil.cpu_count(logical=False)
+        if cores:
+            return cores
+    return os.cpu_count() or 1
+
+
 def _lof_scores(
     embeddings: np.ndarray,
     config: AnomalyConfig,
+    precomputed: PrecomputedSimilarity | None = None,
 ) -> np.ndarray:
     """Calculate anomaly scores using Local Outlier Factor.
 
     LOF measures local density deviation. Points in sparse regions
     relative to their neighbors are considered anomalies.
 
-    NOTE: For high-dimensional embeddings (1000D+), brute force is actually
-    faster than ball_tree/kd_tree due to curse of dimensionality.
-    Using algorithm='auto' lets sklearn choose optimally.
+    NOTE: If a dense cosine matrix was precomputed, LOF reuses it as
+    metric="precomputed". Otherwise, because cosine distance = ½‖a − b‖² for
+    unit vectors and LOF is invariant to scaling distances, we use squared
+    Euclidean on normalized rows, which sklearn's brute-force path computes as
+    a single GEMM instead of the slower generic cosine metric. Scores match
+    metric="cosine" up to float32 rounding.
 
     Returns scores in [0, 1] where higher = more anomalous.
     """
@@ -164,19 +223,25 @@ def _lof_scores(
     n_neighbors = min(config.lof_neighbors, n_samples - 1)
     n_neighbors = max(2, n_neighbors)
 
-    # Use cosine metric directly - for high-dim embeddings, brute force is optimal
-    # and cosine is semantically correct for text embeddings
+    if precomputed is not None and precomputed.matrix is not None:
+        metric = "precomputed"
+        lof_input = np.clip(1.0 - precomputed.matrix, 0.0, None)  # Cosine distance
+        np.fill_diagonal(lof_input, 0.0)
+    else:
+        metric = "sqeuclidean"
+        lof_input = precomputed.normed if precomputed is not None else normalize_rows(embeddings)
+
     lof = LocalOutlierFactor(
         n_neighbors=n_neighbors,
-        metric="cosine",
-        algorithm="auto",  # Let sklearn choose (will pick brute for high-dim)
+        metric=metric,
+        algorithm="brute",
         contamination=config.contamination,
         novelty=False,
         n_jobs=-1,
     )
 
     # fit_predict returns -1 for anomalies, 1 for normal
-    lof.fit_predict(embeddings)
+    lof.fit_predict(lof_input)
 
     # negative_outlier_factor_ is negative, more negative = more anomalous
     raw_scores = -lof.negative_outlier_factor_
@@ -193,9 +258,7 @@ def _hdbscan_scores(cluster_result: ClusterResult) -> np.ndarray:
 
     Returns scores in [0, 1] where higher = more anomalous.
     """
-    labels = np.array(cluster_result.labels)
-    scores = np.where(labels == -1, 1.0, 0.0)
-    return scores
+    return np.where(cluster_result.labels == -1, 1.0, 0.0)
 
 
 def _centroid_distance_scores(
@@ -206,21 +269,33 @@ def _centroid_distance_scores(
 
     Returns scores in [0, 1] where higher = farther from centroid.
     """
-    distances = np.zeros(len(embeddings))
-    centroids = np.array(cluster_result.centroids)
+    n = len(embeddings)
+    distances = np.zeros(n)
+    centroids = cluster_result.centroids
 
     if len(centroids) == 0:
         return distances
 
-    for i, (embedding, label) in enumerate(zip(embeddings, cluster_result.labels)):
-        if label == -1:
-            # Noise: use distance to nearest centroid
-            dists = np.linalg.norm(centroids - embedding, axis=1)
-            distances[i] = dists.min()
-        else:
-            # Distance to assigned centroid
-            if label < len(centroids):
-                distances[i] = np.linalg.norm(embedding - centroids[label])
+    # Squared distances to every centroid in one GEMM: ‖p‖² + ‖c‖² − 2p·c
+    # (sgemm applies the −2 scale in the same BLAS call)
+    points = np.asarray(embeddings, dtype=np.float32)
+    point_sq = np.einsum("ij,ij->i", points, points)[:, None]
+    centroid_sq = np.einsum("ij,ij->i", centroids, centroids)
+    dist_sq = sgemm(alpha=-2.0, a=points, b=centroids, trans_b=True)
+    dist_sq += point_sq
+    dist_sq += centroid_sq
+    np.maximum(dist_sq, 0.0, out=dist_sq)
+
+    labels = cluster_result.labels
+
+    # Noise: use distance to nearest centroid
+    noise = labels == -1
+    distances[noise] = np.sqrt(dist_sq[noise].min(axis=1))
+
+    # Distance to assigned centroid
+    assigned = (labels >= 0) & (labels < len(centroids))
+    idx = np.flatnonzero(assigned)
+    distances[idx] = np.sqrt(dist_sq[idx, labels[idx]])
 
     return _normalize_scores(distances)
 
@@ -251,21 +326,46 @@ def _ensemble_scores(
         Combined scores and threshold
     """
     # Normalize weights
-    weights = np.array(weights)
+    weights = np.asarray(weights, dtype=np.float64)
     weights = weights / weights.sum()
 
-    # Weighted average
-    combined = (
-        weights[0] * if_scores +
-        weights[1] * lof_scores +
-        weights[2] * hdbscan_scores
-    )
-
     # Calculate individual thresholds
     if_threshold = np.percentile(if_scores, (1 - contamination) * 100)
     lof_threshold = np.percentile(lof_scores, (1 - contamination) * 100)
     hdbscan_threshold = 0.5
 
+    # Weighted average, boosted for points flagged by multiple methods
+    combined = _combine_scores_fast(
+        np.ascontiguousarray(if_scores, dtype=np.float64),
+        np.ascontiguousarray(lof_scores, dtype=np.float64),
+        np.ascontiguousarray(hdbscan_scores, dtype=np.float64),
+        weights[0], weights[1], weights[2],
+        if_threshold, lof_threshold, hdbscan_threshold,
+        min_methods_agree,
+    )
+
+    # Dynamic threshold based on voting
+    # Points flagged by min_methods_agree+ get priority
+    threshold = np.percentile(combined, (1 - contamination) * 100)
+
+    return combined, threshold
+
+
+def _combine_scores(
+    if_scores: np.ndarray,
+    lof_scores: np.ndarray,
+    hdbscan_scores: np.ndarray,
+    w_if: float,
+    w_lof: float,
+    w_hdbscan: float,
+    if_threshold: float,
+    lof_threshold: float,
+    hdbscan_threshold: float,
+    min_methods_agree: int,
+) -> np.ndarray:
+    """Weighted sum + agreement bonus, clipped to [0, 1] (NumPy version)."""
+    combined = w_if * if_scores + w_lof * lof_scores + w_hdbscan * hdbscan_scores
+
     # Count how many methods flag each point
     votes = (
         (if_scores >= if_threshold).astype(int) +
@@ -273,25 +373,57 @@ def _ensemble_scores(
         (hdbscan_scores >= hdbscan_threshold).astype(int)
     )
 
-    # Boost score for points flagged by multiple methods
-    agreement_bonus = np.where(votes >= min_methods_agree, 0.2, 0.0)
-    combined = np.clip(combined + agreement_bonus, 0, 1)
+    agreement_bonus = np.where(votes >= min_methods_agree, AGREEMENT_BONUS, 0.0)
+    return np.clip(combined + agreement_bonus, 0, 1)
+
+
+def _combine_scores_loop(
+    if_scores,
+    lof_scores,
+    hdbscan_scores,
+    w_if,
+    w_lof,
+    w_hdbscan,
+    if_threshold,
+    lof_threshold,
+    hdbscan_threshold,
+    min_methods_agree,
+):
+    """Single-pass kernel equivalent to _combine_scores, compiled by Numba."""
+    n = len(if_scores)
+    out = np.empty(n)
+    for i in prange(n):
+        v = w_if * if_scores[i] + w_lof * lof_scores[i] + w_hdbscan * hdbscan_scores[i]
+        votes = (
+            (if_scores[i] >= if_threshold) +
+            (lof_scores[i] >= lof_threshold) +
+            (hdbscan_scores[i] >= hdbscan_threshold)
+        )
+        if votes >= min_methods_agree:
+            v += AGREEMENT_BONUS
+        out[i] = min(max(v, 0.0), 1.0)
+    return out
 
-    # Dynamic threshold based on voting
-    # Points flagged by min_methods_agree+ get priority
-    threshold = np.percentile(combined, (1 - contamination) * 100)
 
-    return combined, threshold
+_combine_scores_fast = (
+    njit(parallel=True, fastmath=True, cache=True)(_combine_scores_loop)
+    if njit is not None
+    else _combine_scores
+)
 
 
 def _normalize_scores(scores: np.ndarray) -> np.ndarray:
-    """Normalize scores to [0, 1] range using MinMax scaling."""
+    """Normalize scores to [0, 1] range using min-max scaling.
+
+    Constant inputs map to all zeros (same as sklearn's MinMaxScaler).
+    """
     if len(scores) == 0:
         return scores
 
-    scaler = MinMaxScaler()
-    normalized = scaler.fit_transform(scores.reshape(-1, 1)).flatten()
-    return normalized
+    lo, hi = scores.min(), scores.max()
+    if hi == lo:
+        return np.zeros_like(scores, dtype=np.float64)
+    return (scores - lo) * (1.0 / (hi - lo))
 
 
 # Legacy function for backward compatibility
@@ -306,19 +438,20 @@ def get_anomaly_summary(anomalies: list[Anomaly]) -> dict:
         }
 
     # Count by method
-    method_counts: dict[str, int] = {}
-    for a in anomalies:
-        for method in a.methods_flagged:
-            method_counts[method] = method_counts.get(method, 0) + 1
+    method_counts = Counter(chain.from_iterable(a.methods_flagged for a in anomalies))
 
-    scores = [a.score for a in anomalies]
+    n_anomalies = len(anomalies)
+    scores = np.fromiter((a.score for a in anomalies), dtype=np.float64, count=n_anomalies)
+    n_methods = np.fromiter(
+        (len(a.methods_flagged) for a in anomalies), dtype=np.int64, count=n_anomalies,
+    )
 
     return {
-        "total": len(anomalies),
-        "by_method": method_counts,
-        "avg_score": sum(scores) / len(scores),
-        "max_score": max(scores),
-        "multi_method_count": sum(1 for a in anomalies if len(a.methods_flagged) > 1),
+        "total": n_anomalies,
+        "by_method": dict(method_counts),
+        "avg_score": float(scores.mean()),
+        "max_score": float(scores.max()),
+        "multi_method_count": int((n_methods > 1).sum()),
     }
 
 
@@ -1,22 +1,94 @@
 """Embedding cache: store and retrieve embeddings by content hash."""
 
-import hashlib
-import json
-from pathlib import Path
+import asyncio
+import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import closing
+from functools import lru_cache
 from typing import TYPE_CHECKING
 
+import xxhash
+
 if TYPE_CHECKING:
     import numpy as np
 
-from .config import DEFAULT_CONFIG_DIR
+from . import _cache_fs
+from ._cache_fs import CACHE_DB, CACHE_DIR, CACHE_ROOT, CACHE_VERSION, get_cache_stats
+
+# Keys per SELECT; stays under SQLite's historical 999 bound-parameter limit.
+SELECT_BATCH = 900
+
+# Let SQLite read pages through a memory map instead of read() copies;
+# pages beyond this size fall back to regular I/O
+MMAP_SIZE = 256 * 1024 * 1024
 
-CACHE_DIR = DEFAULT_CONFIG_DIR / "cache"
+# Decoded vectors kept in memory, most recently used last; repeated lookups
+# in one process (e.g. several REPL commands) skip SQLite entirely
+HOT_CACHE_SIZE = 10_000
+_hot: OrderedDict = OrderedDict()
+# Lookups and saves run in asyncio.to_thread workers concurrently; an
+# eviction between get and move_to_end would otherwise raise KeyError
+_hot_lock = threading.Lock()
+
+# Rows whose blob length disagrees with dim (truncated writes) are skipped by
+# SQLite itself, so decoding needs no per-row checks
+_VALID_ROW = "length(vec) = dim * (CASE WHEN scale IS NULL THEN 4 ELSE 1 END)"
 
 
 def get_cache_key(statement, model: str) -> str:
-    """Generate cache key from statement content and model."""
-    content = f"{model}:{statement.text}"
-    return hashlib.sha256(content.encode()).hexdigest()[:16]
+    """Generate cache key from statement content and model.
+
+    The key only has to be stable and collision-free for a local cache, so a
+    non-cryptographic 64-bit hash is used instead of SHA-256.
+    """
+    return _cache_key(model, statement.text)
+
+
+@lru_cache(maxsize=100_000)
+def _cache_key(model: str, text: str) -> str:
+    """Hash (model, text); memoized across lookups and saves in one process."""
+    return xxhash.xxh3_64_hexdigest(f"{model}:{text}".encode())
+
+
+def _connect() -> sqlite3.Connection:
+    """Open the cache database, creating it on first use."""
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(CACHE_DB)
+    conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS emb ("
+        "key TEXT PRIMARY KEY, model TEXT NOT NULL, dim INTEGER NOT NULL, "
+        "scale REAL, vec BLOB NOT NULL)"
+    )
+    return conn
+
+
+def _encode(vec, quantize: bool) -> tuple:
+    """Encode a vector as (scale, blob).
+
+    Vectors are stored as raw float32 bytes with a NULL scale, or as int8
+    with a per-vector scale when ``quantize`` is set.
+    """
+    import numpy as np
+
+    vec = np.asarray(vec, dtype=np.float32).ravel()
+    if not quantize:
+        return None, vec.tobytes()
+
+    peak = float(np.abs(vec).max()) if vec.size else 0.0
+    scale = peak / 127 if peak > 0 else 1.0
+    q = np.rint(vec / np.float32(scale)).astype(np.int8)
+    return scale, q.tobytes()
+
+
+def _decode(scale, blob: bytes):
+    """Decode a stored blob back into a float32 vector."""
+    import numpy as np
+
+    if scale is None:
+        return np.frombuffer(blob, dtype=np.float32)
+    return np.frombuffer(blob, dtype=np.int8).astype(np.float32) * np.float32(scale)
 
 
 def get_cached_embeddings(
@@ -25,39 +97,65 @@ def get_cached_embeddings(
 ) -> tuple:
     """Get cached embeddings for statements.
 
+    Recently used vectors are served from an in-process LRU; the rest are
+    looked up in a handful of batched ``IN (...)`` queries.
+
     Returns:
-        Tuple of (embeddings array or None, list of indices that were NOT found in cache)
+        Tuple of (embeddings array or None, list of indices that were NOT found in cache).
+        On a partial hit the array is still full-size; rows listed as missing are zero.
     """
     import numpy as np
-    CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
-    embeddings: list[list[float] | None] = [None] * len(statements)
-    missing_indices: list[int] = []
+    keys = [get_cache_key(stmt, model) for stmt in statements]
+    found: dict = {}
+    cold: list[str] = []
+    with _hot_lock:
+        for key in keys:
+            vec = _hot.get(key)
+            if vec is None:
+                cold.append(key)
+            else:
+                _hot.move_to_end(key)
+                found[key] = vec
+
+    if cold:
+        with closing(_connect()) as conn:
+            for start in range(0, len(cold), SELECT_BATCH):
+                batch = cold[start:start + SELECT_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = conn.execute(
+                    f"SELECT key, scale, vec FROM emb WHERE key IN ({placeholders})"
+                    f" AND {_VALID_ROW}",
+                    batch,
+                )
+                for key, scale, vec in rows:
+                    found[key] = _remember(key, _decode(scale, vec))
+
+    missing_indices = [i for i, key in enumerate(keys) if key not in found]
 
-    for i, stmt in enumerate(statements):
-        cache_key = get_cache_key(stmt, model)
-        cache_file = CACHE_DIR / f"{cache_key}.json"
+    # If none found, return None
+    if keys and len(missing_indices) == len(keys):
+        return None, missing_indices
 
-        if cache_file.exists():
-            try:
-                with open(cache_file) as f:
-                    data = json.load(f)
-                embeddings[i] = data["embedding"]
-            except (json.JSONDecodeError, KeyError):
-                missing_indices.append(i)
-        else:
-            missing_indices.append(i)
+    # Copy hits straight into one preallocated array
+    dim = len(next(iter(found.values()))) if found else 0
+    alloc = np.zeros if missing_indices else np.empty
+    embeddings = alloc((len(keys), dim), dtype=np.float32)
+    for i, key in enumerate(keys):
+        if key in found:
+            embeddings[i] = found[key]
 
-    # If all found, return as array
-    if not missing_indices:
-        return np.array(embeddings), []
+    return embeddings, missing_indices
 
-    # If none found, return None
-    if len(missing_indices) == len(statements):
-        return None, missing_indices
 
-    # Partial cache hit - return what we have
-    return embeddings, missing_indices  # type: ignore
+def _remember(key: str, vec):
+    """Record a decoded vector in the in-process LRU and return it."""
+    with _hot_lock:
+        _hot[key] = vec
+        _hot.move_to_end(key)
+        if len(_hot) > HOT_CACHE_SIZE:
+            _hot.popitem(last=False)
+    return vec
 
 
 def save_embeddings(
@@ -65,6 +163,7 @@ def save_embeddings(
     embeddings,
     model: str,
     indices: list[int] | None = None,
+    quantize: bool = False,
 ) -> int:
     """Save embeddings to cache.
 
@@ -73,75 +172,73 @@ def save_embeddings(
         embeddings: Embeddings array
         model: Model name used
         indices: Optional specific indices to save (default: all)
+        quantize: Store int8 vectors with a per-vector scale (4x smaller,
+            slightly lossy) instead of float32
 
     Returns:
         Number of embeddings saved
     """
-    import numpy as np
-    CACHE_DIR.mkdir(parents=True, exist_ok=True)
-
     if indices is None:
         indices = list(range(len(statements)))
 
-    saved = 0
+    rows = []
     for i, idx in enumerate(indices):
         if idx >= len(statements) or i >= len(embeddings):
             continue
 
-        stmt = statements[idx]
-        embedding = embeddings[i].tolist() if isinstance(embeddings[i], np.ndarray) else embeddings[i]
+        key = get_cache_key(statements[idx], model)
+        scale, blob = _encode(embeddings[i], quantize)
+        dim = len(blob) if scale is not None else len(blob) // 4
+        rows.append((key, model, dim, scale, blob))
+        _remember(key, _decode(scale, blob))
 
-        cache_key = get_cache_key(stmt, model)
-        cache_file = CACHE_DIR / f"{cache_key}.json"
-
-        data = {
-            "text_hash": hashlib.sha256(stmt.text.encode()).hexdigest()[:16],
-            "model": model,
-            "embedding": embedding,
-        }
-
-        with open(cache_file, "w") as f:
-            json.dump(data, f)
+    if not rows:
+        return 0
 
-        saved += 1
+    with closing(_connect()) as conn, conn:
+        conn.executemany("INSERT OR REPLACE INTO emb VALUES (?, ?, ?, ?, ?)", rows)
 
-    return saved
+    return len(rows)
 
 
 def clear_cache() -> int:
-    """Clear all cached embeddings.
+    """Clear all cached embeddings, in memory and on disk.
 
     Returns:
-        Number of cache files deleted
+        Number of cache entries deleted
     """
-    if not CACHE_DIR.exists():
-        return 0
+    with _hot_lock:
+        _hot.clear()
+    return _cache_fs.clear_cache()
+
 
-    deleted = 0
-    for cache_file in CACHE_DIR.glob("*.json"):
-        cache_file.unlink()
-        deleted += 1
+def _unique_statements(statements: list) -> tuple:
+    """Collapse statements with identical text.
 
-    return deleted
+    Returns:
+        Tuple of (unique statements, inverse index list or None if no duplicates)
+    """
+    first_index: dict[str, int] = {}
+    unique: list = []
+    inverse: list[int] = []
+    for stmt in statements:
+        idx = first_index.setdefault(stmt.text, len(unique))
+        if idx == len(unique):
+            unique.append(stmt)
+        inverse.append(idx)
 
+    if len(unique) == len(statements):
+        return statements, None
+    return unique, inverse
 
-def get_cache_stats() -> dict:
-    """Get cache statistics."""
-    if not CACHE_DIR.exists():
-        return {
-            "total_entries": 0,
-            "total_size_kb": 0,
-            "cache_dir": str(CACHE_DIR),
-        }
 
-    files = list(CACHE_DIR.glob("*.json"))
-    total_size = sum(f.stat().st_size for f in files)
+def _expand(embeddings, inverse: list[int] | None):
+    """Scatter embeddings of unique statements back to every occurrence."""
+    if inverse is None:
+        return embeddings
 
-    return {
-        "total_entries": len(files),
-        "total_size_kb": round(total_size / 1024, 2),
-        "cache_dir": str(CACHE_DIR),
-    }
+    import numpy as np
+    return np.asarray(embeddings)[inverse]
 
 
 def embed_with_cache(
@@ -150,6 +247,7 @@ def embed_with_cache(
     model: str,
     progress=None,
     task_id=None,
+    quantize: bool = False,
 ):
     """Embed statements with caching.
 
@@ -159,39 +257,39 @@ def embed_with_cache(
         model: Model name for cache key
         progress: Optional rich Progress
         task_id: Optional task ID
+        quantize: Cache new embeddings as int8 (see save_embeddings)
 
     Returns:
         Complete embeddings array
     """
-    import numpy as np
+    # Embed each distinct text once; duplicates are filled in at the end
+    unique, inverse = _unique_statements(statements)
+
     # Check cache
-    cached, missing_indices = get_cached_embeddings(statements, model)
+    cached, missing_indices = get_cached_embeddings(unique, model)
 
     if not missing_indices:
         # All cached
         if progress and task_id is not None:
             progress.update(task_id, advance=len(statements))
-        return cached  # type: ignore
+        return _expand(cached, inverse)
 
     # Get uncached statements
-    uncached_statements = [statements[i] for i in missing_indices]
+    uncached_statements = [unique[i] for i in missing_indices]
 
     # Embed uncached
     new_embeddings = embed_fn(uncached_statements)
 
     # Save to cache
-    save_embeddings(uncached_statements, new_embeddings, model)
+    save_embeddings(uncached_statements, new_embeddings, model, quantize=quantize)
 
     # Merge results
     if cached is None:
-        return new_embeddings
-
-    # Fill in missing
-    result = np.array(cached, dtype=object)
-    for i, idx in enumerate(missing_indices):
-        result[idx] = new_embeddings[i]
+        return _expand(new_embeddings, inverse)
 
-    return np.array(result.tolist())
+    # Fill in missing rows of the preallocated cache array
+    cached[missing_indices] = new_embeddings
+    return _expand(cached, inverse)
 
 
 async def embed_with_cache_async(
@@ -200,6 +298,7 @@ async def embed_with_cache_async(
     model: str,
     progress=None,
     task_id=None,
+    quantize: bool = False,
 ):
     """Embed statements with caching (async version).
 
@@ -209,36 +308,38 @@ async def embed_with_cache_async(
         model: Model name for cache key
         progress: Optional rich Progress
         task_id: Optional task ID
+        quantize: Cache new embeddings as int8 (see save_embeddings)
 
     Returns:
         Complete embeddings array
     """
-    import numpy as np
-    # Check cache (sync - file I/O is fast)
-    cached, missing_indices = get_cached_embeddings(statements, model)
+    # Embed each distinct text once; duplicates are filled in at the end
+    unique, inverse = _unique_statements(statements)
+
+    # Check cache off the event loop so other tasks keep running during I/O
+    cached, missing_indices = await asyncio.to_thread(get_cached_embeddings, unique, model)
 
     if not missing_indices:
         # All cached
         if progress and task_id is not None:
             progress.update(task_id, advance=len(statements))
-        return cached  # type: ignore
+        return _expand(cached, inverse)
 
     # Get uncached statements
-    uncached_statements = [statements[i] for i in missing_indices]
+    uncached_statements = [unique[i] for i in missing_indices]
 
     # Embed uncached (async)
     new_embeddings = await embed_fn(uncached_statements)
 
-    # Save to cache (sync - fast)
-    save_embeddings(uncached_statements, new_embeddings, model)
+    # Save to cache, again off the event loop
+    await asyncio.to_thread(
+        save_embeddings, uncached_statements, new_embeddings, model, quantize=quantize,
+    )
 
     # Merge results
     if cached is None:
-        return new_embeddings
-
-    # Fill in missing
-    result = np.array(cached, dtype=object)
-    for i, idx in enumerate(missing_indices):
-        result[idx] = new_embeddings[i]
+        return _expand(new_embeddings, inverse)
 
-    return np.array(result.tolist())
+    # Fill in missing rows of the preallocated cache array
+    cached[missing_indices] = new_embeddings
+    return _expand(cached, inverse)
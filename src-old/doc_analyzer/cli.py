@@ -1,252 +1,437 @@
 """CLI: Command-line interface for doc-analyzer."""
 
-import asyncio
+import argparse
+import contextlib
+import copy
+import functools
+import importlib.util
+import sys
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional, TYPE_CHECKING
-
-import typer
-from rich.console import Console
+from typing import Optional
 
 from . import __version__
+from ._cache_fs import clear_cache, get_cache_stats
 from .config import Config, init_config, show_config, ensure_api_key
 
-# Lazy imports for heavy modules (sklearn, numpy) - only loaded when needed
-# This makes `doc-analyzer --help` fast
-if TYPE_CHECKING:
-    from .analyzer import analyze_pairs, test_claude_cli
-    from .anomaly import detect_anomalies
-    from .cache import clear_cache, embed_with_cache, embed_with_cache_async, get_cache_stats
-    from .clusterer import cluster_statements, get_cluster_keywords
-    from .embedder import embed_statements, embed_statements_async, close_async_client, test_connection
-    from .models import AnalysisReport
-    from .parser import parse_documents, get_file_stats
-    from .reporter import generate_report, save_report
-    from .similarity import find_similar_pairs
-    from .stats import calculate_stats, format_stats_summary
-
-
-_modules_loaded = False
-
-def _import_heavy_modules():
-    """Import heavy modules lazily with loading indicator."""
-    global _modules_loaded
-    global analyze_pairs, test_claude_cli, detect_anomalies
-    global clear_cache, embed_with_cache, embed_with_cache_async, get_cache_stats
-    global cluster_statements, get_cluster_keywords
-    global embed_statements, embed_statements_async, close_async_client, test_connection
-    global AnalysisReport, parse_documents, get_file_stats
-    global generate_report, save_report, find_similar_pairs
-    global calculate_stats, format_stats_summary
-
-    if _modules_loaded:
-        return
-
-    with console.status("[dim]Loading...[/dim]"):
-        from .analyzer import analyze_pairs, test_claude_cli
-        from .anomaly import detect_anomalies
-        from .cache import clear_cache, embed_with_cache, embed_with_cache_async, get_cache_stats
-        from .clusterer import cluster_statements, get_cluster_keywords
-        from .embedder import embed_statements, embed_statements_async, close_async_client, test_connection
-        from .models import AnalysisReport
-        from .parser import parse_documents, get_file_stats
-        from .reporter import generate_report, save_report
-        from .similarity import find_similar_pairs
-        from .stats import calculate_stats, format_stats_summary
-
-    _modules_loaded = True
-
+# Heavy modules (sklearn, numpy, httpx) are registered lazily: each one is
+# imported on first attribute access, so `doc-analyzer --help` stays fast and
+# every command loads only what it actually touches
+def _lazy(name: str):
+    """Return submodule ``name`` of this package, deferring its execution."""
+    full_name = importlib.util.resolve_name(name, __package__)
+    if full_name in sys.modules:
+        return sys.modules[full_name]
+    spec = importlib.util.find_spec(full_name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[full_name] = module
+    loader.exec_module(module)
+    return module
+
+
+_analyzer = _lazy(".analyzer")
+_anomaly = _lazy(".anomaly")
+_cache = _lazy(".cache")
+_clusterer = _lazy(".clusterer")
+_embedder = _lazy(".embedder")
+_models = _lazy(".models")
+_parser = _lazy(".parser")
+_reporter = _lazy(".reporter")
+_similarity = _lazy(".similarity")
+_stats = _lazy(".stats")
+
+
+@functools.cache
+def _console():
+    """Create the Rich console on first output.
+
+    Rich is only imported when something is printed, so argparse help and
+    usage errors never pay for it.
+    """
+    from rich.console import Console
+    return Console()
+
+
+# Rich layout and terminal control only pay off on a terminal; piped runs
+# (CI, scripts) get plain text and skip the transient "\r" progress lines
+_NO_TTY = not sys.stdout.isatty()
+
+
+def _log(msg: str = "", end: str = "\n") -> None:
+    """Print ``msg`` through Rich on a terminal, as plain text otherwise."""
+    if not _NO_TTY:
+        _console().print(msg, end=end)
+    elif end != "\r":
+        from rich.markup import render
+        print(render(msg).plain, end=end)
+
+
+def _status(msg: str):
+    """Show a spinner on a terminal; a no-op context otherwise."""
+    return contextlib.nullcontext() if _NO_TTY else _console().status(msg)
+
+
+# Parsed configs by config file, for scripts that run several commands in
+# one process. Commands override fields, so each call gets its own copy.
+_CONFIG_CACHE: dict[Optional[Path], Config] = {}
+
+
+def _load_config(config_file: Optional[Path], require_api_key: bool = False) -> Config:
+    """Load ``config_file`` once per process and return a private copy."""
+    config = _CONFIG_CACHE.get(config_file)
+    if config is None:
+        config = _CONFIG_CACHE[config_file] = Config.load(config_file)
+    if require_api_key:
+        # Prompts (and saves) at most once; the cached config keeps the key
+        ensure_api_key(config)
+    return copy.deepcopy(config)
 
-def _import_cache_only():
-    """Import only cache module (no sklearn/numpy needed)."""
-    global clear_cache, get_cache_stats
-    # These functions only use pathlib/json - no heavy deps
-    from .cache import clear_cache, get_cache_stats
 
-app = typer.Typer(
-    name="doc-analyzer",
-    help="Semantic document analysis: contradictions, anomalies, and statistics",
-    add_completion=False,
-)
-config_app = typer.Typer(help="Configuration management")
-app.add_typer(config_app, name="config")
-
-console = Console()
-
-
-@app.command()
 def analyze(
-    path: Optional[Path] = typer.Argument(None, help="Path to documents (default: from config)"),
-    output: Optional[Path] = typer.Option(None, "--output", "-o", help="Output file path"),
-    format: str = typer.Option("markdown", "--format", "-f", help="Output format (markdown/json)"),
-    threshold: float = typer.Option(0.75, "--threshold", "-t", help="Similarity threshold"),
-    max_pairs: int = typer.Option(100, "--max-pairs", "-m", help="Max pairs to analyze"),
-    no_contradictions: bool = typer.Option(False, "--no-contradictions", help="Skip contradiction analysis"),
-    no_anomalies: bool = typer.Option(False, "--no-anomalies", help="Skip anomaly detection"),
-    dry_run: bool = typer.Option(False, "--dry-run", help="Embeddings + clusters only, no LLM"),
-    use_async: bool = typer.Option(True, "--async/--sync", help="Use async parallel API calls (faster)"),
-    max_concurrent: int = typer.Option(5, "--max-concurrent", help="Max concurrent API requests (async mode)"),
-    verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose output"),
-    config_file: Optional[Path] = typer.Option(None, "--config", "-c", help="Config file path"),
+    path: Optional[Path] = None,
+    output: Optional[Path] = None,
+    format: str = "markdown",
+    threshold: float = 0.75,
+    max_pairs: int = 100,
+    no_contradictions: bool = False,
+    no_anomalies: bool = False,
+    dry_run: bool = False,
+    use_async: bool = True,
+    max_concurrent: int = 5,
+    verbose: bool = False,
+    pretty: bool = False,
+    config_file: Optional[Path] = None,
 ):
     """Run full document analysis."""
-    _import_heavy_modules()
-    config = Config.load(config_file)
-    config = ensure_api_key(config)
+    import asyncio
+    config = _load_config(config_file, require_api_key=True)
     config.analysis.similarity_threshold = threshold
     config.analysis.max_pairs_to_analyze = max_pairs
 
     # Use path from config if not provided
     docs_path = path or Path(config.documents.path)
-    extensions = tuple(config.documents.extensions)
 
-    # Parse documents
-    console.print("[dim]Parsing documents...[/dim]", end="\r")
-    statements = parse_documents(docs_path, config.analysis.min_statement_length, extensions)
+    statements, clusters, contradictions, anomalies, statistics = asyncio.run(_run_analysis(
+        docs_path, config,
+        use_async=use_async,
+        max_concurrent=max_concurrent,
+        find_contradictions=not no_contradictions and not dry_run,
+        find_anomalies=not no_anomalies and not dry_run,
+    ))
 
     if not statements:
-        console.print("[red]No statements found in documents[/red]")
-        raise typer.Exit(1)
+        _log("[red]No statements found in documents[/red]")
+        raise SystemExit(1)
 
-    console.print(f"[green]✓[/green] Parsed {len(statements)} statements     ")
+    # Generate report
+    report = _models.AnalysisReport(
+        statements=statements,
+        clusters=clusters,
+        contradictions=contradictions,
+        anomalies=anomalies,
+        statistics=statistics,
+    )
 
-    # Generate embeddings
-    console.print("[dim]Generating embeddings...[/dim]")
-    if use_async:
-        async def run_async_embeddings():
-            async def embed_fn_async(stmts):
-                return await embed_statements_async(stmts, config, max_concurrent=max_concurrent)
-            result = await embed_with_cache_async(
-                statements, embed_fn_async, config.openrouter.embedding_model,
+    # Output: stream into the file, only build the full string for stdout
+    if output:
+        _reporter.write_report(report, output, format, config.output.group_by, pretty)
+        _log(f"[green]Report saved to {output}[/green]")
+    else:
+        _log(_reporter.generate_report(report, format, config.output.group_by, pretty))
+
+
+async def _embed_async(statements: list, config: Config, max_concurrent: int = 5):
+    """Embed statements through the cache with concurrent API batches.
+
+    The API key is only asked for once some statement misses the cache, so
+    embedding-only commands run offline against a warm cache.
+    """
+    async def embed_fn_async(stmts):
+        ensure_api_key(config)
+        return await _embedder.embed_statements_async(
+            stmts, config,
+            batch_size=config.openrouter.embedding_batch_size,
+            max_concurrent=max_concurrent,
+        )
+
+    try:
+        embeddings = await _cache.embed_with_cache_async(
+            statements, embed_fn_async, config.openrouter.embedding_model,
+            quantize=config.cache.quantize,
+        )
+    finally:
+        await _embedder.close_async_client()
+    return _to_embedding_dtype(embeddings, config)
+
+
+def _to_embedding_dtype(embeddings, config: Config):
+    """Store embeddings in the configured dtype.
+
+    Similarity and anomaly kernels widen to float32 as they go, so float16
+    only halves the matrix held for the rest of the command.
+    """
+    return embeddings.astype(config.analysis.embedding_dtype, copy=False)
+
+
+async def _stream_embed(docs_path: Path, config: Config, max_concurrent: int = 5) -> tuple:
+    """Parse documents on a worker thread and embed them as they arrive.
+
+    Each chunk of ``embedding_batch_size`` distinct texts goes through the
+    cache while the parser is still reading later files.
+
+    Returns:
+        Tuple of (statements, embeddings or None if there are no statements)
+    """
+    import asyncio
+    import numpy as np
+
+    loop = asyncio.get_running_loop()
+    files: asyncio.Queue = asyncio.Queue()
+    done = object()
+
+    # Resolve on the loop thread; LazyLoader only guards first access with a
+    # lock from Python 3.12
+    iter_documents = _parser.iter_documents
+
+    def produce():
+        try:
+            for file_statements in iter_documents(
+                docs_path, config.analysis.min_statement_length, tuple(config.documents.extensions),
+            ):
+                loop.call_soon_threadsafe(files.put_nowait, file_statements)
+        finally:
+            loop.call_soon_threadsafe(files.put_nowait, done)
+
+    batch_size = config.openrouter.embedding_batch_size
+    semaphore = asyncio.Semaphore(max_concurrent)
+
+    # The semaphore is the only concurrency limit: each chunk is one batch
+    # and is embedded with max_concurrent=1, so at most max_concurrent
+    # requests are in flight in total
+    async def embed_chunk(chunk: list):
+        async with semaphore:
+            return await _cache.embed_with_cache_async(
+                chunk,
+                lambda stmts: _embedder.embed_statements_async(
+                    stmts, config, batch_size=batch_size, max_concurrent=1,
+                ),
+                config.openrouter.embedding_model,
+                quantize=config.cache.quantize,
             )
-            await close_async_client()
-            return result
-        embeddings = asyncio.run(run_async_embeddings())
+
+    # Distinct texts are embedded once, in first-seen order; rows maps every
+    # statement to its text's position in that order
+    statements: list = []
+    first_index: dict[str, int] = {}
+    rows: list[int] = []
+    chunk: list = []
+    jobs = []
+    producer = asyncio.create_task(asyncio.to_thread(produce))
+    try:
+        while (file_statements := await files.get()) is not done:
+            for stmt in file_statements:
+                statements.append(stmt)
+                index = first_index.get(stmt.text)
+                if index is None:
+                    index = first_index[stmt.text] = len(first_index)
+                    chunk.append(stmt)
+                    if len(chunk) == batch_size:
+                        jobs.append(asyncio.create_task(embed_chunk(chunk)))
+                        chunk = []
+                rows.append(index)
+        await producer
+        if chunk:
+            jobs.append(asyncio.create_task(embed_chunk(chunk)))
+        results = await asyncio.gather(*jobs)
+    finally:
+        await _embedder.close_async_client()
+
+    if not statements:
+        return statements, None
+    # Narrow while joining, so a float16 run never holds a float32 matrix
+    return statements, np.concatenate(results, dtype=config.analysis.embedding_dtype)[rows]
+
+
+async def _run_analysis(
+    docs_path: Path,
+    config: Config,
+    *,
+    use_async: bool,
+    max_concurrent: int,
+    find_contradictions: bool,
+    find_anomalies: bool,
+) -> tuple:
+    """Run the analysis pipeline on a single event loop.
+
+    In async mode embedding starts while documents are still being parsed.
+    Contradiction checks wait on the Claude CLI, so they run concurrently
+    with anomaly detection and statistics, which go to worker threads.
+
+    Returns:
+        Tuple of (statements, clusters, contradictions, anomalies, statistics);
+        everything but the empty statement list is None when nothing was parsed
+    """
+    import asyncio
+
+    # Parse documents and generate embeddings
+    _log("[dim]Parsing documents and generating embeddings...[/dim]")
+    if use_async:
+        statements, embeddings = await _stream_embed(docs_path, config, max_concurrent)
     else:
-        def embed_fn(stmts):
-            return embed_statements(stmts, config)
-        embeddings = embed_with_cache(
-            statements, embed_fn, config.openrouter.embedding_model,
+        statements = _parser.parse_documents(
+            docs_path, config.analysis.min_statement_length, tuple(config.documents.extensions),
         )
-    console.print(f"[green]✓[/green] Generated embeddings            ")
+        if statements:
+            def embed_fn(stmts):
+                return _embedder.embed_statements(stmts, config, batch_size=config.openrouter.embedding_batch_size)
+            embeddings = _to_embedding_dtype(await asyncio.to_thread(
+                _cache.embed_with_cache, statements, embed_fn, config.openrouter.embedding_model,
+                quantize=config.cache.quantize,
+            ), config)
+
+    if not statements:
+        return statements, None, None, None, None
+
+    _log(f"[green]✓[/green] Parsed {len(statements)} statements     ")
+    _log(f"[green]✓[/green] Generated embeddings            ")
 
     # Cluster
-    console.print("[dim]Clustering topics...[/dim]", end="\r")
-    clusters = cluster_statements(embeddings)
-    console.print(f"[green]✓[/green] Found {clusters.n_clusters} clusters           ")
-
-    # Find similar pairs
-    console.print("[dim]Finding similar pairs...[/dim]", end="\r")
-    pairs = find_similar_pairs(
-        embeddings, statements,
-        threshold=threshold,
-        skip_same_file=config.analysis.skip_same_file,
-        max_pairs=max_pairs,
-    )
-    console.print(f"[green]✓[/green] Found {len(pairs)} similar pairs       ")
+    _log("[dim]Clustering topics...[/dim]", end="\r")
+    clusters = _clusterer.cluster_statements(embeddings)
+    _log(f"[green]✓[/green] Found {clusters.n_clusters} clusters           ")
+
+    # Normalize once; pair search, LOF and statistics share the result
+    similarity = _similarity.precompute_similarity(embeddings)
+
+    # Find similar pairs; only contradiction checks use them, so skip the
+    # O(n²) search when those are off
+    if find_contradictions:
+        _log("[dim]Finding similar pairs...[/dim]", end="\r")
+        pairs = _similarity.find_similar_pairs(
+            embeddings, statements,
+            threshold=config.analysis.similarity_threshold,
+            skip_same_file=config.analysis.skip_same_file,
+            max_pairs=config.analysis.max_pairs_to_analyze,
+            precomputed=similarity,
+        )
+        _log(f"[green]✓[/green] Found {len(pairs)} similar pairs       ")
+    else:
+        pairs = []
+
+    async def skipped() -> list:
+        return []
 
     # Analyze contradictions
-    contradictions = []
-    if not no_contradictions and not dry_run and pairs:
+    if find_contradictions and pairs:
         def progress_callback(current: int, total: int):
-            console.print(f"[dim]Analyzing pairs... {current}/{total}[/dim]", end="\r")
-        contradictions = analyze_pairs(pairs, statements, config, progress_callback=progress_callback)
-        console.print(f"[green]✓[/green] Found {len(contradictions)} contradictions     ")
+            _log(f"[dim]Analyzing pairs... {current}/{total}[/dim]", end="\r")
+        if use_async:
+            contradictions_job = _analyzer.analyze_pairs_async(
+                pairs, statements, config,
+                max_concurrent=max_concurrent, progress_callback=progress_callback,
+            )
+        else:
+            contradictions_job = asyncio.to_thread(
+                _analyzer.analyze_pairs, pairs, statements, config, progress_callback=progress_callback,
+            )
+    else:
+        contradictions_job = skipped()
 
     # Detect anomalies
-    anomalies = []
-    if not no_anomalies and not dry_run:
-        console.print("[dim]Detecting anomalies...[/dim]", end="\r")
-        anomalies = detect_anomalies(embeddings, statements, clusters, config.anomaly)
-        console.print(f"[green]✓[/green] Found {len(anomalies)} anomalies          ")
+    if find_anomalies:
+        anomalies_job = asyncio.to_thread(
+            _anomaly.detect_anomalies, embeddings, statements, clusters, config.anomaly,
+            precomputed=similarity,
+        )
+    else:
+        anomalies_job = skipped()
 
     # Calculate statistics
-    console.print("[dim]Calculating statistics...[/dim]", end="\r")
-    statistics = calculate_stats(statements, embeddings, clusters)
-    console.print("[green]✓[/green] Statistics calculated            ")
-
-    # Generate report
-    report = AnalysisReport(
-        statements=statements,
-        clusters=clusters,
-        contradictions=contradictions,
-        anomalies=anomalies,
-        statistics=statistics,
+    stats_job = asyncio.to_thread(
+        _stats.calculate_stats, statements, embeddings, clusters, precomputed=similarity,
     )
 
-    report_content = generate_report(report, format, config.output.group_by)
+    _log("[dim]Analyzing contradictions, anomalies and statistics...[/dim]", end="\r")
+    contradictions, anomalies, statistics = await asyncio.gather(
+        contradictions_job, anomalies_job, stats_job,
+    )
+    if find_contradictions and pairs:
+        _log(f"[green]✓[/green] Found {len(contradictions)} contradictions     ")
+    if find_anomalies:
+        _log(f"[green]✓[/green] Found {len(anomalies)} anomalies          ")
+    _log("[green]✓[/green] Statistics calculated            ")
 
-    # Output
-    if output:
-        save_report(report_content, output)
-        console.print(f"[green]Report saved to {output}[/green]")
-    else:
-        console.print(report_content)
+    return statements, clusters, contradictions, anomalies, statistics
 
 
-@app.command()
 def contradictions(
-    path: Optional[Path] = typer.Argument(None, help="Path to documents (default: from config)"),
-    threshold: float = typer.Option(0.75, "--threshold", "-t"),
-    max_pairs: int = typer.Option(100, "--max-pairs", "-m"),
-    output: Optional[Path] = typer.Option(None, "--output", "-o"),
-    config_file: Optional[Path] = typer.Option(None, "--config", "-c"),
+    path: Optional[Path] = None,
+    threshold: float = 0.75,
+    max_pairs: int = 100,
+    output: Optional[Path] = None,
+    no_parse_cache: bool = False,
+    config_file: Optional[Path] = None,
 ):
     """Find contradictions only."""
-    _import_heavy_modules()
-    config = Config.load(config_file)
-    config = ensure_api_key(config)
+    import asyncio
+    config = _load_config(config_file, require_api_key=True)
     docs_path = path or Path(config.documents.path)
     extensions = tuple(config.documents.extensions)
 
     # Parse documents
-    console.print("[dim]Parsing documents...[/dim]", end="\r")
-    statements = parse_documents(docs_path, config.analysis.min_statement_length, extensions)
+    _log("[dim]Parsing documents...[/dim]", end="\r")
+    statements = _parser.parse_documents_cached(
+        docs_path, config.analysis.min_statement_length, extensions, use_cache=not no_parse_cache,
+    )
 
     if not statements:
-        console.print("[red]No statements found in documents[/red]")
-        raise typer.Exit(1)
+        _log("[red]No statements found in documents[/red]")
+        raise SystemExit(1)
 
-    console.print(f"[green]✓[/green] Parsed {len(statements)} statements     ")
+    _log(f"[green]✓[/green] Parsed {len(statements)} statements     ")
 
     # Generate embeddings
-    console.print("[dim]Generating embeddings...[/dim]")
-    embeddings = embed_statements(statements, config)
-    console.print(f"[green]✓[/green] Generated embeddings            ")
+    _log("[dim]Generating embeddings...[/dim]")
+    embeddings = asyncio.run(_embed_async(statements, config))
+    _log(f"[green]✓[/green] Generated embeddings            ")
 
-    # Find similar pairs
-    console.print("[dim]Finding similar pairs...[/dim]", end="\r")
-    pairs = find_similar_pairs(embeddings, statements, threshold, max_pairs=max_pairs)
-    console.print(f"[green]✓[/green] Found {len(pairs)} similar pairs       ")
+    # Find similar pairs. Nothing else here shares the similarity work, so let
+    # find_similar_pairs normalize once and stream its own GEMM tiles, which
+    # skip same-file blocks a dense precompute would have to fill in
+    _log("[dim]Finding similar pairs...[/dim]", end="\r")
+    pairs = _similarity.find_similar_pairs(embeddings, statements, threshold, max_pairs=max_pairs)
+    _log(f"[green]✓[/green] Found {len(pairs)} similar pairs       ")
 
     # Analyze contradictions
     if pairs:
         def progress_callback(current: int, total: int):
-            console.print(f"[dim]Analyzing pairs... {current}/{total}[/dim]", end="\r")
-        results = analyze_pairs(pairs, statements, config, progress_callback=progress_callback)
+            _log(f"[dim]Analyzing pairs... {current}/{total}[/dim]", end="\r")
+        results = _analyzer.analyze_pairs(pairs, statements, config, progress_callback=progress_callback)
     else:
         results = []
 
-    console.print(f"\n[bold]Found {len(results)} contradictions[/bold]\n")
+    _log(f"\n[bold]Found {len(results)} contradictions[/bold]\n")
 
     for i, c in enumerate(results, 1):
-        console.print(f"[yellow]{i}. {c.severity.value.upper()}[/yellow] ({c.confidence:.0%} confidence)")
-        console.print(f"   A: {c.statement_a.source_file.name}:{c.statement_a.line_number}")
-        console.print(f"   B: {c.statement_b.source_file.name}:{c.statement_b.line_number}")
-        console.print(f"   → {c.explanation}")
-        console.print()
+        _log(f"[yellow]{i}. {c.severity.value.upper()}[/yellow] ({c.confidence:.0%} confidence)")
+        _log(f"   A: {c.statement_a.source_file.name}:{c.statement_a.line_number}")
+        _log(f"   B: {c.statement_b.source_file.name}:{c.statement_b.line_number}")
+        _log(f"   → {c.explanation}")
+        _log()
 
 
-@app.command()
 def anomalies(
-    path: Optional[Path] = typer.Argument(None, help="Path to documents (default: from config)"),
-    method: str = typer.Option(None, "--method", "-m", help="Detection method: ensemble, isolation_forest, lof, hdbscan"),
-    output: Optional[Path] = typer.Option(None, "--output", "-o"),
-    config_file: Optional[Path] = typer.Option(None, "--config", "-c"),
+    path: Optional[Path] = None,
+    method: Optional[str] = None,
+    output: Optional[Path] = None,
+    no_parse_cache: bool = False,
+    config_file: Optional[Path] = None,
 ):
     """Detect anomalies using hybrid ensemble approach."""
-    _import_heavy_modules()
-    config = Config.load(config_file)
-    config = ensure_api_key(config)
+    import asyncio
+    config = _load_config(config_file)
     docs_path = path or Path(config.documents.path)
     extensions = tuple(config.documents.extensions)
 
@@ -256,30 +441,32 @@ def anomalies(
 
     # Parse documents first (fast operation)
     # Parse documents
-    console.print("[dim]Parsing documents...[/dim]", end="\r")
-    statements = parse_documents(docs_path, config.analysis.min_statement_length, extensions)
+    _log("[dim]Parsing documents...[/dim]", end="\r")
+    statements = _parser.parse_documents_cached(
+        docs_path, config.analysis.min_statement_length, extensions, use_cache=not no_parse_cache,
+    )
 
     if not statements:
-        console.print("[red]No statements found in documents[/red]")
-        raise typer.Exit(1)
+        _log("[red]No statements found in documents[/red]")
+        raise SystemExit(1)
 
-    console.print(f"[green]✓[/green] Parsed {len(statements)} statements     ")
+    _log(f"[green]✓[/green] Parsed {len(statements)} statements     ")
 
     # Generate embeddings
-    console.print("[dim]Generating embeddings...[/dim]")
-    embeddings = embed_statements(statements, config)
-    console.print(f"[green]✓[/green] Generated embeddings            ")
+    _log("[dim]Generating embeddings...[/dim]")
+    embeddings = asyncio.run(_embed_async(statements, config))
+    _log(f"[green]✓[/green] Generated embeddings            ")
 
     # Cluster
-    console.print("[dim]Clustering...[/dim]", end="\r")
-    clusters = cluster_statements(embeddings)
-    console.print(f"[green]✓[/green] Found {clusters.n_clusters} clusters           ")
+    _log("[dim]Clustering...[/dim]", end="\r")
+    clusters = _clusterer.cluster_statements(embeddings)
+    _log(f"[green]✓[/green] Found {clusters.n_clusters} clusters           ")
 
     # Detect anomalies
-    console.print(f"[dim]Detecting anomalies ({config.anomaly.method})...[/dim]", end="\r")
-    results = detect_anomalies(embeddings, statements, clusters, config.anomaly)
+    _log(f"[dim]Detecting anomalies ({config.anomaly.method})...[/dim]", end="\r")
+    results = _anomaly.detect_anomalies(embeddings, statements, clusters, config.anomaly)
 
-    console.print(f"\n[bold]Found {len(results)} anomalies[/bold] (method: {config.anomaly.method})\n")
+    _log(f"\n[bold]Found {len(results)} anomalies[/bold] (method: {config.anomaly.method})\n")
 
     for i, a in enumerate(results, 1):
         # Color based on severity
@@ -289,349 +476,494 @@ def anomalies(
         else:
             color = "yellow"
 
-        console.print(f"[{color}]{i}.[/{color}] {a.statement.source_file.name}:{a.statement.line_number}")
-        console.print(f"   \"{a.statement.text[:80]}...\"")
-        console.print(f"   Score: {a.score:.3f} | Methods: {methods_str}")
-        console.print(f"   IF: {a.scores.isolation_forest:.3f} | LOF: {a.scores.lof:.3f} | HDBSCAN: {a.scores.hdbscan:.0f}")
-        console.print(f"   Reason: {a.reason}")
-        console.print()
+        _log(f"[{color}]{i}.[/{color}] {a.statement.source_file.name}:{a.statement.line_number}")
+        _log(f"   \"{a.statement.text[:80]}...\"")
+        _log(f"   Score: {a.score:.3f} | Methods: {methods_str}")
+        _log(f"   IF: {a.scores.isolation_forest:.3f} | LOF: {a.scores.lof:.3f} | HDBSCAN: {a.scores.hdbscan:.0f}")
+        _log(f"   Reason: {a.reason}")
+        _log()
 
 
-@app.command()
 def stats(
-    path: Optional[Path] = typer.Argument(None, help="Path to documents (default: from config)"),
-    output: Optional[Path] = typer.Option(None, "--output", "-o"),
-    config_file: Optional[Path] = typer.Option(None, "--config", "-c"),
+    path: Optional[Path] = None,
+    output: Optional[Path] = None,
+    no_parse_cache: bool = False,
+    config_file: Optional[Path] = None,
 ):
     """Show statistics only."""
-    _import_heavy_modules()
-    config = Config.load(config_file)
-    config = ensure_api_key(config)
+    import asyncio
+    config = _load_config(config_file)
     docs_path = path or Path(config.documents.path)
     extensions = tuple(config.documents.extensions)
 
     # Parse documents first (fast operation)
     # Parse documents
-    console.print("[dim]Parsing documents...[/dim]", end="\r")
-    statements = parse_documents(docs_path, config.analysis.min_statement_length, extensions)
+    _log("[dim]Parsing documents...[/dim]", end="\r")
+    statements = _parser.parse_documents_cached(
+        docs_path, config.analysis.min_statement_length, extensions, use_cache=not no_parse_cache,
+    )
 
     if not statements:
-        console.print("[red]No statements found in documents[/red]")
-        raise typer.Exit(1)
+        _log("[red]No statements found in documents[/red]")
+        raise SystemExit(1)
 
-    console.print(f"[green]✓[/green] Parsed {len(statements)} statements     ")
+    _log(f"[green]✓[/green] Parsed {len(statements)} statements     ")
 
     # Generate embeddings
-    console.print("[dim]Generating embeddings...[/dim]")
-    embeddings = embed_statements(statements, config)
-    console.print(f"[green]✓[/green] Generated embeddings            ")
+    _log("[dim]Generating embeddings...[/dim]")
+    embeddings = asyncio.run(_embed_async(statements, config))
+    _log(f"[green]✓[/green] Generated embeddings            ")
 
     # Cluster
-    console.print("[dim]Clustering topics...[/dim]", end="\r")
-    clusters = cluster_statements(embeddings)
-    console.print(f"[green]✓[/green] Found {clusters.n_clusters} clusters           ")
+    _log("[dim]Clustering topics...[/dim]", end="\r")
+    clusters = _clusterer.cluster_statements(embeddings)
+    _log(f"[green]✓[/green] Found {clusters.n_clusters} clusters           ")
 
     # Calculate statistics
-    console.print("[dim]Calculating statistics...[/dim]", end="\r")
-    statistics = calculate_stats(statements, embeddings, clusters)
-    console.print("[green]✓[/green] Statistics calculated            ")
+    _log("[dim]Calculating statistics...[/dim]", end="\r")
+    statistics = _stats.calculate_stats(statements, embeddings, clusters)
+    _log("[green]✓[/green] Statistics calculated            ")
 
-    summary = format_stats_summary(statistics)
-    console.print(summary)
+    summary = _stats.format_stats_summary(statistics)
+    _log(summary)
 
 
-@app.command()
 def clusters(
-    path: Optional[Path] = typer.Argument(None, help="Path to documents (default: from config)"),
-    show_samples: bool = typer.Option(False, "--samples", "-s", help="Show sample statements"),
-    config_file: Optional[Path] = typer.Option(None, "--config", "-c"),
+    path: Optional[Path] = None,
+    show_samples: bool = False,
+    no_parse_cache: bool = False,
+    config_file: Optional[Path] = None,
 ):
     """Show topic clusters."""
-    _import_heavy_modules()
-    config = Config.load(config_file)
-    config = ensure_api_key(config)
+    import asyncio
+    config = _load_config(config_file)
     docs_path = path or Path(config.documents.path)
     extensions = tuple(config.documents.extensions)
 
     # Parse documents
-    console.print("[dim]Parsing documents...[/dim]", end="\r")
-    statements = parse_documents(docs_path, config.analysis.min_statement_length, extensions)
+    _log("[dim]Parsing documents...[/dim]", end="\r")
+    statements = _parser.parse_documents_cached(
+        docs_path, config.analysis.min_statement_length, extensions, use_cache=not no_parse_cache,
+    )
 
     if not statements:
-        console.print("[red]No statements found in documents[/red]")
-        raise typer.Exit(1)
+        _log("[red]No statements found in documents[/red]")
+        raise SystemExit(1)
 
-    console.print(f"[green]✓[/green] Parsed {len(statements)} statements     ")
+    _log(f"[green]✓[/green] Parsed {len(statements)} statements     ")
 
     # Generate embeddings
-    console.print("[dim]Generating embeddings...[/dim]")
-    embeddings = embed_statements(statements, config)
-    console.print(f"[green]✓[/green] Generated embeddings            ")
+    _log("[dim]Generating embeddings...[/dim]")
+    embeddings = asyncio.run(_embed_async(statements, config))
+    _log(f"[green]✓[/green] Generated embeddings            ")
 
     # Cluster
-    console.print("[dim]Clustering topics...[/dim]", end="\r")
-    clusters = cluster_statements(embeddings)
+    _log("[dim]Clustering topics...[/dim]", end="\r")
+    clusters = _clusterer.cluster_statements(embeddings)
 
-    console.print(f"\n[bold]Found {clusters.n_clusters} topic clusters[/bold]\n")
+    _log(f"\n[bold]Found {clusters.n_clusters} topic clusters[/bold]\n")
 
     sizes = clusters.get_cluster_sizes()
+    keywords_map = _clusterer.get_all_cluster_keywords(statements, clusters)
     for cluster_id in sorted(sizes.keys()):
         if cluster_id == -1:
             label = "Noise"
         else:
-            keywords = get_cluster_keywords(statements, clusters, cluster_id)
+            keywords = keywords_map.get(cluster_id, [])
             label = ", ".join(keywords) if keywords else f"Cluster {cluster_id}"
 
-        console.print(f"[cyan]{label}[/cyan] ({sizes[cluster_id]} statements)")
+        _log(f"[cyan]{label}[/cyan] ({sizes[cluster_id]} statements)")
 
         if show_samples:
             indices = clusters.get_cluster_indices(cluster_id)[:3]
             for idx in indices:
                 text = statements[idx].text[:60]
-                console.print(f"  • \"{text}...\"")
+                _log(f"  • \"{text}...\"")
 
-        console.print()
+        _log()
 
 
 # Config subcommands
-@config_app.command("init")
 def config_init():
     """Initialize default config file."""
     path = init_config()
-    console.print(f"[green]Config initialized at {path}[/green]")
+    _CONFIG_CACHE.clear()
+    _log(f"[green]Config initialized at {path}[/green]")
 
 
-@config_app.command("show")
-def config_show(
-    config_file: Optional[Path] = typer.Option(None, "--config", "-c"),
-):
+def config_show(config_file: Optional[Path] = None):
     """Show current configuration."""
-    config = Config.load(config_file)
-    console.print(show_config(config))
+    config = _load_config(config_file)
+    _log(show_config(config))
 
 
-@config_app.command("set")
-def config_set(
-    key: str = typer.Argument(..., help="Config key (e.g., openrouter.api_key)"),
-    value: str = typer.Argument(..., help="Value to set"),
-    config_file: Optional[Path] = typer.Option(None, "--config", "-c"),
-):
+def config_set(key: str, value: str, config_file: Optional[Path] = None):
     """Set a config value."""
-    config = Config.load(config_file)
+    config = _load_config(config_file)
     try:
         config.set(key, value)
         config.save(config_file)
-        console.print(f"[green]Set {key} = {value}[/green]")
+        _CONFIG_CACHE.clear()
+        _log(f"[green]Set {key} = {value}[/green]")
     except (KeyError, AttributeError) as e:
-        console.print(f"[red]Invalid key: {key}[/red]")
-        raise typer.Exit(1)
+        _log(f"[red]Invalid key: {key}[/red]")
+        raise SystemExit(1)
 
 
-@config_app.command("test")
-def config_test(
-    config_file: Optional[Path] = typer.Option(None, "--config", "-c"),
-):
+def config_test(config_file: Optional[Path] = None):
     """Test API connections."""
-    _import_heavy_modules()
-    config = Config.load(config_file)
+    import asyncio
+    config = _load_config(config_file)
+
+    # The HTTP round-trip and the CLI subprocess are independent, so both
+    # probes run at once; resolve them here since LazyLoader only guards
+    # first access with a lock from Python 3.12
+    test_connection = _embedder.test_connection
+    test_claude_cli = _analyzer.test_claude_cli
+
+    async def probe():
+        return await asyncio.gather(
+            asyncio.to_thread(test_connection, config),
+            asyncio.to_thread(test_claude_cli, config),
+        )
 
-    # Test OpenRouter
-    console.print("Testing OpenRouter API...", end=" ")
-    if test_connection(config):
-        console.print("[green]OK[/green]")
-    else:
-        console.print("[red]FAILED[/red]")
+    with _status("Testing API connections..."):
+        openrouter_ok, claude_ok = asyncio.run(probe())
 
-    # Test Claude CLI
-    console.print("Testing Claude CLI...", end=" ")
-    if test_claude_cli(config):
-        console.print("[green]OK[/green]")
-    else:
-        console.print("[red]FAILED[/red]")
+    for name, ok in (("OpenRouter API", openrouter_ok), ("Claude CLI", claude_ok)):
+        _log(f"Testing {name}...", end=" ")
+        _log("[green]OK[/green]" if ok else "[red]FAILED[/red]")
 
 
 # Cache commands
-@app.command("cache-clear")
 def cache_clear():
     """Clear embedding cache."""
-    _import_cache_only()
     deleted = clear_cache()
-    console.print(f"[green]Cleared {deleted} cached embeddings[/green]")
+    _log(f"[green]Cleared {deleted} cached embeddings[/green]")
 
 
-@app.command("cache-stats")
 def cache_stats():
     """Show cache statistics."""
-    _import_cache_only()
     stats = get_cache_stats()
-    console.print(f"Cache directory: {stats['cache_dir']}")
-    console.print(f"Total entries: {stats['total_entries']}")
-    console.print(f"Total size: {stats['total_size_kb']:.2f} KB")
+    _log(f"Cache directory: {stats['cache_dir']}")
+    _log(f"Total entries: {stats['total_entries']}")
+    _log(f"Total size: {stats['total_size_kb']:.2f} KB")
 
 
-@app.command()
 def version():
     """Show version."""
-    console.print(f"doc-analyzer {__version__}")
+    _log(f"doc-analyzer {__version__}")
+
+
+@dataclass
+class _ReplState:
+    """Data an interactive session loads once and its commands share.
+
+    Statements, embeddings and clusters are fixed for the session, so
+    cluster labels and statistics are computed on first use and reused.
+    """
+    statements: list
+    embeddings: object
+    clusters: object
+    similarity: object
+    config: Config
+    statistics: object = None
+    cluster_labels: dict[int, str] = field(default_factory=dict)
+
+    def get_statistics(self):
+        if self.statistics is None:
+            self.statistics = _stats.calculate_stats(
+                self.statements, self.embeddings, self.clusters, precomputed=self.similarity,
+            )
+        return self.statistics
+
+    def cluster_label(self, cluster_id: int) -> str:
+        label = self.cluster_labels.get(cluster_id)
+        if label is None:
+            keywords = _clusterer.get_cluster_keywords(self.statements, self.clusters, cluster_id)
+            label = self.cluster_labels[cluster_id] = ", ".join(keywords) if keywords else f"Cluster {cluster_id}"
+        return label
+
+    def find_pairs(self) -> list:
+        return _similarity.find_similar_pairs(
+            self.embeddings, self.statements,
+            threshold=self.config.analysis.similarity_threshold,
+            max_pairs=self.config.analysis.max_pairs_to_analyze,
+            precomputed=self.similarity,
+        )
 
 
-@app.command("interactive")
-def interactive_mode(
-    path: Path = typer.Argument(..., help="Path to documents"),
-    config_file: Optional[Path] = typer.Option(None, "--config", "-c"),
-):
+_REPL_HELP = """[bold]Commands:[/bold]
+  [cyan]stats[/cyan]           Show document statistics
+  [cyan]clusters[/cyan]        Show topic clusters
+  [cyan]anomalies[/cyan]       Detect anomalies
+  [cyan]contradictions[/cyan]  Find contradictions (uses Claude CLI)
+  [cyan]analyze[/cyan]         Run full analysis
+  [cyan]help[/cyan]            Show this help
+  [cyan]exit[/cyan]            Exit interactive mode
+"""
+
+_REPL_EXIT = ("exit", "quit", "q")
+
+
+def _progress(current: int, total: int):
+    """Overwrite one status line with pair-analysis progress."""
+    _log(f"[dim]Analyzing pairs... {current}/{total}[/dim]", end="\r")
+
+
+def _repl_help(state: _ReplState):
+    _log(_REPL_HELP)
+
+
+def _repl_stats(state: _ReplState):
+    _log(_stats.format_stats_summary(state.get_statistics()))
+
+
+def _repl_clusters(state: _ReplState):
+    _log(f"\n[bold]Found {state.clusters.n_clusters} topic clusters[/bold]\n")
+    sizes = state.clusters.get_cluster_sizes()
+    for cluster_id in sorted(sizes.keys()):
+        label = "Noise" if cluster_id == -1 else state.cluster_label(cluster_id)
+        _log(f"[cyan]{label}[/cyan] ({sizes[cluster_id]} statements)")
+
+
+def _repl_anomalies(state: _ReplState):
+    with _status("Detecting anomalies..."):
+        results = _anomaly.detect_anomalies(
+            state.embeddings, state.statements, state.clusters, state.config.anomaly,
+            precomputed=state.similarity,
+        )
+    _log(f"\n[bold]Found {len(results)} anomalies[/bold]\n")
+    for i, a in enumerate(results[:10], 1):  # Show top 10
+        _log(f"{i}. {a.statement.source_file.name}:{a.statement.line_number}")
+        _log(f"   \"{a.statement.text[:60]}...\"")
+        _log(f"   Score: {a.score:.3f} | {a.reason}\n")
+    if len(results) > 10:
+        _log(f"[dim]...and {len(results) - 10} more[/dim]")
+
+
+def _repl_contradictions(state: _ReplState):
+    _log("[dim]Finding similar pairs...[/dim]", end="\r")
+    pairs = state.find_pairs()
+    if not pairs:
+        _log("[yellow]No similar pairs found[/yellow]")
+        return
+    _log(f"[green]✓[/green] Found {len(pairs)} similar pairs       ")
+    results = _analyzer.analyze_pairs(pairs, state.statements, state.config, progress_callback=_progress)
+    _log(f"[green]✓[/green] Analyzed {len(pairs)} pairs               ")
+    _log(f"\n[bold]Found {len(results)} contradictions[/bold]\n")
+    for i, c in enumerate(results[:10], 1):
+        _log(f"[yellow]{i}. {c.severity.value.upper()}[/yellow] ({c.confidence:.0%})")
+        _log(f"   {c.explanation}\n")
+
+
+def _repl_analyze(state: _ReplState):
+    _log("[dim]Finding similar pairs...[/dim]", end="\r")
+    pairs = state.find_pairs()
+    _log(f"[green]✓[/green] Found {len(pairs)} similar pairs       ")
+    # Contradictions
+    contradictions = []
+    if pairs:
+        contradictions = _analyzer.analyze_pairs(pairs, state.statements, state.config, progress_callback=_progress)
+        _log(f"[green]✓[/green] Found {len(contradictions)} contradictions     ")
+    # Anomalies
+    _log("[dim]Detecting anomalies...[/dim]", end="\r")
+    anomalies = _anomaly.detect_anomalies(
+        state.embeddings, state.statements, state.clusters, state.config.anomaly,
+        precomputed=state.similarity,
+    )
+    _log(f"[green]✓[/green] Found {len(anomalies)} anomalies          ")
+    # Stats
+    if state.statistics is None:
+        _log("[dim]Calculating statistics...[/dim]", end="\r")
+    statistics = state.get_statistics()
+    _log("[green]✓[/green] Statistics calculated            ")
+    # Report
+    report = _models.AnalysisReport(
+        statements=state.statements, clusters=state.clusters,
+        contradictions=contradictions, anomalies=anomalies, statistics=statistics
+    )
+    _log(_reporter.generate_report(report, "markdown", state.config.output.group_by))
+
+
+_REPL_COMMANDS = {
+    "help": _repl_help,
+    "stats": _repl_stats,
+    "clusters": _repl_clusters,
+    "anomalies": _repl_anomalies,
+    "contradictions": _repl_contradictions,
+    "analyze": _repl_analyze,
+}
+
+
+def interactive_mode(path: Path, no_parse_cache: bool = False, config_file: Optional[Path] = None):
     """Interactive mode: load once, run many commands quickly."""
-    _import_heavy_modules()
-    config = Config.load(config_file)
-    config = ensure_api_key(config)
+    import asyncio
+    config = _load_config(config_file, require_api_key=True)
     docs_path = path
     extensions = tuple(config.documents.extensions)
 
     # Initial load
-    console.print(f"\n[bold]Interactive Mode[/bold] - {docs_path}\n")
+    _log(f"\n[bold]Interactive Mode[/bold] - {docs_path}\n")
 
-    console.print("[dim]Parsing documents...[/dim]")
-    statements = parse_documents(docs_path, config.analysis.min_statement_length, extensions)
+    _log("[dim]Parsing documents...[/dim]")
+    statements = _parser.parse_documents_cached(
+        docs_path, config.analysis.min_statement_length, extensions, use_cache=not no_parse_cache,
+    )
 
     if not statements:
-        console.print("[red]No statements found in documents[/red]")
-        raise typer.Exit(1)
+        _log("[red]No statements found in documents[/red]")
+        raise SystemExit(1)
 
-    console.print(f"[green]✓[/green] Found {len(statements)} statements")
+    _log(f"[green]✓[/green] Found {len(statements)} statements")
 
     # Generate embeddings
-    console.print("[dim]Generating embeddings...[/dim]")
-
-    async def run_async_embeddings():
-        async def embed_fn_async(stmts):
-            return await embed_statements_async(stmts, config)
-        result = await embed_with_cache_async(
-            statements, embed_fn_async, config.openrouter.embedding_model,
-        )
-        await close_async_client()
-        return result
+    _log("[dim]Generating embeddings...[/dim]")
 
-    embeddings = asyncio.run(run_async_embeddings())
-    console.print(f"[green]✓[/green] Generated embeddings")
+    embeddings = asyncio.run(_embed_async(statements, config))
+    _log(f"[green]✓[/green] Generated embeddings")
 
-    console.print("[dim]Clustering...[/dim]", end="\r")
-    clusters = cluster_statements(embeddings)
+    _log("[dim]Clustering...[/dim]", end="\r")
+    clusters = _clusterer.cluster_statements(embeddings)
+    state = _ReplState(
+        statements=statements,
+        embeddings=embeddings,
+        clusters=clusters,
+        similarity=_similarity.precompute_similarity(embeddings),
+        config=config,
+    )
 
-    console.print(f"\n[green]Ready![/green] {len(statements)} statements, {clusters.n_clusters} clusters\n")
+    _log(f"\n[green]Ready![/green] {len(statements)} statements, {clusters.n_clusters} clusters\n")
 
     # REPL
-    commands_help = """[bold]Commands:[/bold]
-  [cyan]stats[/cyan]           Show document statistics
-  [cyan]clusters[/cyan]        Show topic clusters
-  [cyan]anomalies[/cyan]       Detect anomalies
-  [cyan]contradictions[/cyan]  Find contradictions (uses Claude CLI)
-  [cyan]analyze[/cyan]         Run full analysis
-  [cyan]help[/cyan]            Show this help
-  [cyan]exit[/cyan]            Exit interactive mode
-"""
-    console.print(commands_help)
+    _log(_REPL_HELP)
 
     while True:
         try:
-            cmd = console.input("[bold blue]>[/bold blue] ").strip().lower()
+            cmd = _console().input("[bold blue]>[/bold blue] ").strip().lower()
         except (KeyboardInterrupt, EOFError):
-            console.print("\n[dim]Goodbye![/dim]")
+            _log("\n[dim]Goodbye![/dim]")
             break
 
         if not cmd:
             continue
 
-        if cmd in ("exit", "quit", "q"):
-            console.print("[dim]Goodbye![/dim]")
+        if cmd in _REPL_EXIT:
+            _log("[dim]Goodbye![/dim]")
             break
 
-        elif cmd == "help":
-            console.print(commands_help)
-
-        elif cmd == "stats":
-            statistics = calculate_stats(statements, embeddings, clusters)
-            console.print(format_stats_summary(statistics))
-
-        elif cmd == "clusters":
-            console.print(f"\n[bold]Found {clusters.n_clusters} topic clusters[/bold]\n")
-            sizes = clusters.get_cluster_sizes()
-            for cluster_id in sorted(sizes.keys()):
-                if cluster_id == -1:
-                    label = "Noise"
-                else:
-                    keywords = get_cluster_keywords(statements, clusters, cluster_id)
-                    label = ", ".join(keywords) if keywords else f"Cluster {cluster_id}"
-                console.print(f"[cyan]{label}[/cyan] ({sizes[cluster_id]} statements)")
-
-        elif cmd == "anomalies":
-            with console.status("Detecting anomalies..."):
-                results = detect_anomalies(embeddings, statements, clusters, config.anomaly)
-            console.print(f"\n[bold]Found {len(results)} anomalies[/bold]\n")
-            for i, a in enumerate(results[:10], 1):  # Show top 10
-                console.print(f"{i}. {a.statement.source_file.name}:{a.statement.line_number}")
-                console.print(f"   \"{a.statement.text[:60]}...\"")
-                console.print(f"   Score: {a.score:.3f} | {a.reason}\n")
-            if len(results) > 10:
-                console.print(f"[dim]...and {len(results) - 10} more[/dim]")
-
-        elif cmd == "contradictions":
-            console.print("[dim]Finding similar pairs...[/dim]", end="\r")
-            pairs = find_similar_pairs(
-                embeddings, statements,
-                threshold=config.analysis.similarity_threshold,
-                max_pairs=config.analysis.max_pairs_to_analyze
-            )
-            if not pairs:
-                console.print("[yellow]No similar pairs found[/yellow]")
-                continue
-            console.print(f"[green]✓[/green] Found {len(pairs)} similar pairs       ")
-            def progress_cb(current: int, total: int):
-                console.print(f"[dim]Analyzing pairs... {current}/{total}[/dim]", end="\r")
-            results = analyze_pairs(pairs, statements, config, progress_callback=progress_cb)
-            console.print(f"[green]✓[/green] Analyzed {len(pairs)} pairs               ")
-            console.print(f"\n[bold]Found {len(results)} contradictions[/bold]\n")
-            for i, c in enumerate(results[:10], 1):
-                console.print(f"[yellow]{i}. {c.severity.value.upper()}[/yellow] ({c.confidence:.0%})")
-                console.print(f"   {c.explanation}\n")
-
-        elif cmd == "analyze":
-            console.print("[dim]Finding similar pairs...[/dim]", end="\r")
-            pairs = find_similar_pairs(
-                embeddings, statements,
-                threshold=config.analysis.similarity_threshold,
-                max_pairs=config.analysis.max_pairs_to_analyze
-            )
-            console.print(f"[green]✓[/green] Found {len(pairs)} similar pairs       ")
-            # Contradictions
-            contradictions = []
-            if pairs:
-                def progress_cb2(current: int, total: int):
-                    console.print(f"[dim]Analyzing pairs... {current}/{total}[/dim]", end="\r")
-                contradictions = analyze_pairs(pairs, statements, config, progress_callback=progress_cb2)
-                console.print(f"[green]✓[/green] Found {len(contradictions)} contradictions     ")
-            # Anomalies
-            console.print("[dim]Detecting anomalies...[/dim]", end="\r")
-            anomalies = detect_anomalies(embeddings, statements, clusters, config.anomaly)
-            console.print(f"[green]✓[/green] Found {len(anomalies)} anomalies          ")
-            # Stats
-            console.print("[dim]Calculating statistics...[/dim]", end="\r")
-            statistics = calculate_stats(statements, embeddings, clusters)
-            console.print("[green]✓[/green] Statistics calculated            ")
-            # Report
-            report = AnalysisReport(
-                statements=statements, clusters=clusters,
-                contradictions=contradictions, anomalies=anomalies, statistics=statistics
-            )
-            console.print(generate_report(report, "markdown", config.output.group_by))
-
+        handler = _REPL_COMMANDS.get(cmd)
+        if handler is None:
+            _log(f"[red]Unknown command:[/red] {cmd}")
+            _log("[dim]Type 'help' for available commands[/dim]")
         else:
-            console.print(f"[red]Unknown command:[/red] {cmd}")
-            console.print("[dim]Type 'help' for available commands[/dim]")
+            handler(state)
+
 
+def _add_command(subparsers, name: str, handler) -> argparse.ArgumentParser:
+    """Register a subcommand whose help is the first line of the handler's docstring."""
+    summary = handler.__doc__.splitlines()[0]
+    parser = subparsers.add_parser(name, help=summary, description=summary)
+    parser.set_defaults(handler=handler)
+    return parser
 
-def main():
-    """Entry point."""
-    app()
+
+def _add_path(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("path", nargs="?", type=Path, help="Path to documents (default: from config)")
+
+
+def _add_parse_cache(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--no-parse-cache", action="store_true",
+                        help="Re-parse documents even if no file changed since the last run")
+
+
+def _add_config_file(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--config", "-c", dest="config_file", type=Path, help="Config file path")
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser; each subcommand dispatches to a function above."""
+    parser = argparse.ArgumentParser(
+        prog="doc-analyzer",
+        description="Semantic document analysis: contradictions, anomalies, and statistics",
+    )
+    commands = parser.add_subparsers(metavar="COMMAND", required=True)
+
+    p = _add_command(commands, "analyze", analyze)
+    _add_path(p)
+    p.add_argument("--output", "-o", type=Path, help="Output file path")
+    p.add_argument("--format", "-f", default="markdown", help="Output format (markdown/json)")
+    p.add_argument("--threshold", "-t", type=float, default=0.75, help="Similarity threshold")
+    p.add_argument("--max-pairs", "-m", type=int, default=100, help="Max pairs to analyze")
+    p.add_argument("--no-contradictions", action="store_true", help="Skip contradiction analysis")
+    p.add_argument("--no-anomalies", action="store_true", help="Skip anomaly detection")
+    p.add_argument("--dry-run", action="store_true", help="Embeddings + clusters only, no LLM")
+    p.add_argument("--async", dest="use_async", action="store_true", default=True,
+                   help="Use async parallel API calls (faster, default)")
+    p.add_argument("--sync", dest="use_async", action="store_false", help="Use sequential API calls")
+    p.add_argument("--max-concurrent", type=int, default=5, help="Max concurrent API requests (async mode)")
+    p.add_argument("--verbose", "-v", action="store_true", help="Verbose output")
+    p.add_argument("--pretty", action="store_true", help="Indent JSON output")
+    _add_config_file(p)
+
+    p = _add_command(commands, "contradictions", contradictions)
+    _add_path(p)
+    p.add_argument("--threshold", "-t", type=float, default=0.75)
+    p.add_argument("--max-pairs", "-m", type=int, default=100)
+    p.add_argument("--output", "-o", type=Path)
+    _add_parse_cache(p)
+    _add_config_file(p)
+
+    p = _add_command(commands, "anomalies", anomalies)
+    _add_path(p)
+    p.add_argument("--method", "-m", help="Detection method: ensemble, isolation_forest, lof, hdbscan")
+    p.add_argument("--output", "-o", type=Path)
+    _add_parse_cache(p)
+    _add_config_file(p)
+
+    p = _add_command(commands, "stats", stats)
+    _add_path(p)
+    p.add_argument("--output", "-o", type=Path)
+    _add_parse_cache(p)
+    _add_config_file(p)
+
+    p = _add_command(commands, "clusters", clusters)
+    _add_path(p)
+    p.add_argument("--samples", "-s", dest="show_samples", action="store_true", help="Show sample statements")
+    _add_parse_cache(p)
+    _add_config_file(p)
+
+    config_parser = commands.add_parser("config", help="Configuration management")
+    config_commands = config_parser.add_subparsers(metavar="COMMAND", required=True)
+    _add_command(config_commands, "init", config_init)
+    _add_config_file(_add_command(config_commands, "show", config_show))
+    p = _add_command(config_commands, "set", config_set)
+    p.add_argument("key", help="Config key (e.g., openrouter.api_key)")
+    p.add_argument("value", help="Value to set")
+    _add_config_file(p)
+    _add_config_file(_add_command(config_commands, "test", config_test))
+
+    _add_command(commands, "cache-clear", cache_clear)
+    _add_command(commands, "cache-stats", cache_stats)
+    _add_command(commands, "version", version)
+
+    p = _add_command(commands, "interactive", interactive_mode)
+    p.add_argument("path", type=Path, help="Path to documents")
+    _add_parse_cache(p)
+    _add_config_file(p)
+
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Entry point: parse ``argv`` and dispatch to the selected command."""
+    kwargs = vars(_build_parser().parse_args(sys.argv[1:] if argv is None else argv))
+    handler = kwargs.pop("handler")
+    handler(**kwargs)
+
+
+# Kept for callers that invoked the former Typer app object
+app = main
 
 
 if __name__ == "__main__":
@@ -1,11 +1,54 @@
 """Clusterer: Group statements into topic clusters."""
 
+import os
+import re
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
+from scipy import sparse
 from sklearn.cluster import KMeans, HDBSCAN
-from sklearn.metrics import silhouette_score
+from threadpoolctl import threadpool_limits
 
 from .models import ClusterResult, Statement
 
+# Optional: FAISS k-means assigns points with blocked BLAS, far faster than
+# sklearn on high-dimensional embeddings
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+# faiss-gpu builds train k-means on the GPU when one is visible
+_FAISS_GPU = faiss is not None and hasattr(faiss, "get_num_gpus") and faiss.get_num_gpus() > 0
+
+# Optional: the standalone hdbscan package computes core distances in
+# parallel and builds the spanning tree with Borůvka; sklearn's is serial
+try:
+    import hdbscan as hdbscan_pkg
+except ImportError:
+    hdbscan_pkg = None
+
+# HDBSCAN falls back to slow brute-force neighbor search in high dimensions;
+# with umap-learn installed, wider embeddings are reduced to REDUCED_DIM
+# first (only for finding labels; centroids use the original vectors)
+REDUCE_ABOVE_DIM = 64
+REDUCED_DIM = 15
+
+# Keyword tokens: ASCII words of 3+ letters, minus common words
+_WORD_RE = re.compile(r"\b[a-zA-Z]{3,}\b")
+_STOPWORDS = frozenset({
+    "the", "and", "for", "are", "but", "not", "you", "all", "can",
+    "her", "was", "one", "our", "out", "has", "have", "been", "this",
+    "that", "with", "will", "your", "from", "they", "more", "when",
+    "there", "what", "about", "which", "their", "than", "into", "also",
+})
+
+# Threads for the k sweep in _find_optimal_k (at most 14 fits per sweep)
+SWEEP_WORKERS = 8
+# Spacing of the coarse k sweep (k = 2, 5, 8, ...) before refining
+SWEEP_STEP = 3
+
 
 def cluster_statements(
     embeddings: np.ndarray,
@@ -24,13 +67,16 @@ def cluster_statements(
     Returns:
         ClusterResult with labels, centroids, and cluster count
     """
+    # KMeans, HDBSCAN and UMAP all run fastest on contiguous float32; cast
+    # once here (this also widens float16 storage) rather than per fit
+    embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
     n_samples = len(embeddings)
 
     if n_samples < 3:
         # Not enough samples to cluster
         return ClusterResult(
-            labels=[0] * n_samples,
-            centroids=[embeddings.mean(axis=0).tolist()],
+            labels=np.zeros(n_samples, dtype=np.int32),
+            centroids=embeddings.mean(axis=0, keepdims=True),
             n_clusters=1,
         )
 
@@ -59,16 +105,40 @@ def _cluster_kmeans(
     # Ensure k is reasonable
     n_clusters = max(2, min(n_clusters, n_samples // 2))
 
-    kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
-    labels = kmeans.fit_predict(embeddings)
+    labels, centroids = _kmeans(embeddings, n_clusters)
 
     return ClusterResult(
-        labels=labels.tolist(),
-        centroids=[c.tolist() for c in kmeans.cluster_centers_],
+        labels=labels,
+        centroids=centroids,
         n_clusters=n_clusters,
     )
 
 
+def _kmeans(
+    embeddings: np.ndarray,
+    n_clusters: int,
+    n_init: int = 10,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Fit k-means with FAISS if installed, else sklearn.
+
+    Returns:
+        Tuple of (labels, centroids)
+    """
+    if faiss is not None:
+        xb = np.ascontiguousarray(embeddings, dtype=np.float32)
+        kmeans = faiss.Kmeans(
+            xb.shape[1], n_clusters, niter=20, nredo=n_init, seed=42, verbose=False,
+            gpu=_FAISS_GPU,
+        )
+        kmeans.train(xb)
+        _, labels = kmeans.index.search(xb, 1)
+        return labels.ravel(), kmeans.centroids
+
+    kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=n_init)
+    labels = kmeans.fit_predict(embeddings)
+    return labels, kmeans.cluster_centers_
+
+
 def _cluster_hdbscan(
     embeddings: np.ndarray,
     min_cluster_size: int = 5,
@@ -78,63 +148,148 @@ def _cluster_hdbscan(
     n_samples = len(embeddings)
     min_size = max(2, min(min_cluster_size, n_samples // 10))
 
-    hdbscan = HDBSCAN(
-        min_cluster_size=min_size,
-        min_samples=1,
-        metric="euclidean",
-        copy=True,
+    points = _reduce_for_density(embeddings)
+    if hdbscan_pkg is not None:
+        # Parallel core distances and an approximate spanning tree. KD-tree
+        # Borůvka only pays off on narrow points (after UMAP); without it
+        # the raw embeddings go through Prim's instead
+        narrow = points.shape[1] <= REDUCE_ABOVE_DIM
+        hdbscan = hdbscan_pkg.HDBSCAN(
+            min_cluster_size=min_size,
+            min_samples=1,
+            metric="euclidean",
+            algorithm="boruvka_kdtree" if narrow else "prims_kdtree",
+            approx_min_span_tree=True,
+            core_dist_n_jobs=-1,
+        )
+    else:
+        hdbscan = HDBSCAN(
+            min_cluster_size=min_size,
+            min_samples=1,
+            metric="euclidean",
+            copy=True,
+        )
+    labels = hdbscan.fit_predict(points)
+
+    # Centroid per label in sorted label order (noise first, as the mean of
+    # all noise points). A sparse label-indicator product sums every
+    # cluster in one pass without gathering rows into a sorted copy.
+    unique_labels, inverse, counts = np.unique(labels, return_inverse=True, return_counts=True)
+    indicator = sparse.csr_matrix(
+        (np.ones(n_samples, dtype=embeddings.dtype), (inverse.ravel(), np.arange(n_samples))),
+        shape=(len(unique_labels), n_samples),
     )
-    labels = hdbscan.fit_predict(embeddings)
-
-    # Calculate centroids for each cluster
-    unique_labels = set(labels)
-    centroids: list[list[float]] = []
-
-    for label in sorted(unique_labels):
-        if label == -1:
-            # Noise points - use mean of all noise
-            mask = labels == label
-            if mask.any():
-                centroids.append(embeddings[mask].mean(axis=0).tolist())
-        else:
-            mask = labels == label
-            centroids.append(embeddings[mask].mean(axis=0).tolist())
+    centroids = indicator @ embeddings / counts[:, None]
 
     # Count actual clusters (excluding noise)
-    n_clusters = len([l for l in unique_labels if l >= 0])
+    n_clusters = int(np.count_nonzero(unique_labels >= 0))
 
     return ClusterResult(
-        labels=labels.tolist(),
+        labels=labels,
         centroids=centroids,
         n_clusters=n_clusters,
     )
 
 
+def _reduce_for_density(embeddings: np.ndarray) -> np.ndarray:
+    """Project embeddings to REDUCED_DIM with UMAP when that pays off.
+
+    Returns the embeddings unchanged if they are already narrow, too few to
+    embed, or umap-learn is not installed.
+    """
+    n_samples, dim = embeddings.shape
+    if dim <= REDUCE_ABOVE_DIM or n_samples <= REDUCED_DIM + 1:
+        return embeddings
+
+    try:
+        # Imported here: loading umap compiles numba kernels, which only
+        # this path needs
+        import umap
+    except ImportError:
+        return embeddings
+
+    reducer = umap.UMAP(
+        n_components=REDUCED_DIM,
+        n_neighbors=min(15, n_samples - 1),
+        metric="cosine",
+        random_state=42,
+    )
+    return reducer.fit_transform(embeddings)
+
+
 def _find_optimal_k(embeddings: np.ndarray, max_k: int = 15) -> int:
-    """Find optimal number of clusters using silhouette score."""
+    """Find optimal number of clusters using the simplified silhouette score.
+
+    The simplified silhouette measures distances to centroids rather than
+    to every point, so it is O(n·k) instead of O(n²). It is not the exact
+    silhouette_score and can rank close values of k differently on
+    overlapping clusters; on well-separated groups both pick the same k
+    (see tests/test_clusterer.py).
+    """
     n_samples = len(embeddings)
     max_k = min(max_k, n_samples - 1)
 
     if max_k < 2:
         return 2
 
-    best_k = 2
-    best_score = -1
-
-    for k in range(2, max_k + 1):
-        kmeans = KMeans(n_clusters=k, random_state=42, n_init=10)
-        labels = kmeans.fit_predict(embeddings)
-
-        # Calculate silhouette score
-        try:
-            score = silhouette_score(embeddings, labels)
-            if score > best_score:
-                best_score = score
-                best_k = k
-        except ValueError:
-            continue
-
-    return best_k
+    # The sweep only ranks k, so FAISS gets a single restart per k
+    n_init = 1 if faiss is not None else 10
+
+    def score_k(k: int) -> float:
+        _, centroids = _kmeans(embeddings, k, n_init)
+        return _simplified_silhouette(embeddings, centroids)
+
+    # Coarse pass every SWEEP_STEP values of k, then a fine pass around the
+    # best one; the silhouette curve is close to unimodal in practice.
+    # Fits are independent and release the GIL, so each pass runs on
+    # threads, each limited to one BLAS and one OpenMP thread so the
+    # workers don't oversubscribe the cores. The BLAS limit is
+    # process-wide; the OpenMP one only holds on the thread that sets it,
+    # so every worker sets its own.
+    scores: dict[int, float] = {}
+    with (
+        threadpool_limits(limits=1, user_api="blas"),
+        ThreadPoolExecutor(
+            max_workers=min(SWEEP_WORKERS, os.cpu_count() or 1),
+            initializer=_limit_openmp_threads,
+        ) as executor,
+    ):
+        def sweep(ks: list[int]) -> None:
+            ks = [k for k in ks if k not in scores]
+            scores.update(zip(ks, executor.map(score_k, ks)))
+
+        sweep(list(range(2, max_k + 1, SWEEP_STEP)))
+        coarse_best = max(scores, key=scores.get)
+        half = SWEEP_STEP - 1
+        sweep(list(range(max(2, coarse_best - half), min(max_k, coarse_best + half) + 1)))
+
+    # Smallest k with the best score, as the full serial sweep picked
+    return max(sorted(scores), key=scores.get)
+
+
+def _limit_openmp_threads() -> None:
+    """Run this thread's OpenMP regions (KMeans, FAISS) on one thread."""
+    threadpool_limits(limits=1, user_api="openmp")
+
+
+def _simplified_silhouette(embeddings: np.ndarray, centroids: np.ndarray) -> float:
+    """Mean silhouette with centroid distances in place of pairwise ones.
+
+    a is the distance to the nearest centroid and b to the second nearest,
+    so each k costs one (n, k) distance matrix instead of an (n, n) one.
+    """
+    centroids = np.asarray(centroids, dtype=np.float32)
+    # Squared distances via ||x||² - 2x·c + ||c||²; clip rounding below zero
+    d2 = (
+        np.einsum("ij,ij->i", embeddings, embeddings)[:, None]
+        - 2 * embeddings @ centroids.T
+        + np.einsum("ij,ij->i", centroids, centroids)
+    )
+    nearest = np.sqrt(np.maximum(np.partition(d2, 1, axis=1)[:, :2], 0))
+    a, b = nearest[:, 0], nearest[:, 1]
+    denom = np.maximum(a, b)
+    s = np.divide(b - a, denom, out=np.zeros_like(denom), where=denom > 0)
+    return float(s.mean())
 
 
 def get_cluster_samples(
@@ -158,28 +313,35 @@ def get_cluster_keywords(
 
     Simple approach: word frequency analysis.
     """
-    from collections import Counter
-    import re
-
     indices = cluster_result.get_cluster_indices(cluster_id)
     texts = [statements[i].text for i in indices]
 
-    # Tokenize and count
-    words: list[str] = []
+    # Tokenize, drop common words and count in a single pass
+    counter: Counter[str] = Counter()
     for text in texts:
-        # Simple tokenization
-        tokens = re.findall(r"\b[a-zA-Z]{3,}\b", text.lower())
-        words.extend(tokens)
-
-    # Filter common words
-    stopwords = {
-        "the", "and", "for", "are", "but", "not", "you", "all", "can",
-        "her", "was", "one", "our", "out", "has", "have", "been", "this",
-        "that", "with", "will", "your", "from", "they", "more", "when",
-        "there", "what", "about", "which", "their", "than", "into", "also",
-    }
-
-    filtered = [w for w in words if w not in stopwords]
-    counter = Counter(filtered)
+        counter.update(w for w in _WORD_RE.findall(text.lower()) if w not in _STOPWORDS)
 
     return [word for word, _ in counter.most_common(top_n)]
+
+
+def get_all_cluster_keywords(
+    statements: list[Statement],
+    cluster_result: ClusterResult,
+    top_n: int = 5,
+) -> dict[int, list[str]]:
+    """Extract top keywords for every cluster (noise included) in one pass.
+
+    Same counting as get_cluster_keywords, without rescanning the labels per
+    cluster.
+    """
+    counters: dict[int, Counter[str]] = {}
+    for stmt, label in zip(statements, cluster_result.labels.tolist()):
+        counter = counters.get(label)
+        if counter is None:
+            counter = counters[label] = Counter()
+        counter.update(w for w in _WORD_RE.findall(stmt.text.lower()) if w not in _STOPWORDS)
+
+    return {
+        label: [word for word, _ in counter.most_common(top_n)]
+        for label, counter in counters.items()
+    }
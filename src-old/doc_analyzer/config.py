@@ -2,13 +2,19 @@
 
 import os
 import sys
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields, is_dataclass, replace
 from pathlib import Path
-from typing import Any
+from typing import Any, get_args, get_origin
 
 import yaml
 from dotenv import load_dotenv
 
+# libyaml's C parser when PyYAML was built with it; same results, much faster
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 # Load .env file if present
 load_dotenv()
 
@@ -57,6 +63,7 @@ class OpenRouterConfig:
     api_key: str = ""
     embedding_model: str = "openai/text-embedding-3-small"
     base_url: str = "https://openrouter.ai/api/v1"
+    embedding_batch_size: int = 100  # Statements per embeddings request
 
 
 @dataclass
@@ -68,6 +75,7 @@ class AnomalyConfig:
     min_methods_agree: int = 2  # Minimum methods that must flag for ensemble
     lof_neighbors: int = 20  # Number of neighbors for LOF
     isolation_forest_estimators: int = 100  # Number of trees
+    isolation_forest_max_samples: int = 256  # Rows subsampled per tree
 
 
 @dataclass
@@ -78,6 +86,7 @@ class AnalysisConfig:
     skip_same_file: bool = True
     min_statement_length: int = 50
     anomaly_percentile: float = 95.0  # Legacy, kept for backward compatibility
+    embedding_dtype: str = "float32"  # float32 | float16 (halves the resident embedding matrix)
 
 
 @dataclass
@@ -103,6 +112,12 @@ class DocumentsConfig:
     extensions: list[str] = field(default_factory=lambda: [".md", ".txt", ".json"])
 
 
+@dataclass
+class CacheConfig:
+    """Embedding cache settings."""
+    quantize: bool = False  # Store int8 vectors (4x smaller on disk, slightly lossy)
+
+
 @dataclass
 class Config:
     """Main configuration container."""
@@ -112,6 +127,7 @@ class Config:
     anomaly: AnomalyConfig = field(default_factory=AnomalyConfig)
     claude: ClaudeConfig = field(default_factory=ClaudeConfig)
     output: OutputConfig = field(default_factory=OutputConfig)
+    cache: CacheConfig = field(default_factory=CacheConfig)
     prompt_template: str = DEFAULT_PROMPT_TEMPLATE
 
     @classmethod
@@ -188,93 +204,57 @@ def _get_config_file_path() -> Path | None:
     return None
 
 
+# Field types _merge_from_file casts YAML values to
+_SCALAR_TYPES = (int, float, bool)
+
+
 def _merge_from_file(config: Config, file_path: Path) -> Config:
-    """Merge config from YAML file."""
+    """Merge config from YAML file.
+
+    Sections and keys are taken from the dataclass fields, so a new setting
+    only needs declaring on its dataclass; unknown keys are ignored.
+    """
     with open(file_path) as f:
-        data = yaml.safe_load(f) or {}
-
-    # Documents
-    if "documents" in data:
-        doc_data = data["documents"]
-        if "path" in doc_data:
-            config.documents.path = doc_data["path"]
-        if "extensions" in doc_data:
-            config.documents.extensions = doc_data["extensions"]
-
-    # OpenRouter
-    if "openrouter" in data:
-        or_data = data["openrouter"]
-        if "api_key" in or_data:
-            # Handle ${VAR} syntax
-            key = or_data["api_key"]
-            if key.startswith("${") and key.endswith("}"):
-                var_name = key[2:-1]
-                key = os.getenv(var_name, "")
-            config.openrouter.api_key = key
-        if "embedding_model" in or_data:
-            config.openrouter.embedding_model = or_data["embedding_model"]
-        if "base_url" in or_data:
-            config.openrouter.base_url = or_data["base_url"]
-
-    # Analysis
-    if "analysis" in data:
-        an_data = data["analysis"]
-        if "similarity_threshold" in an_data:
-            config.analysis.similarity_threshold = float(an_data["similarity_threshold"])
-        if "max_pairs_to_analyze" in an_data:
-            config.analysis.max_pairs_to_analyze = int(an_data["max_pairs_to_analyze"])
-        if "skip_same_file" in an_data:
-            config.analysis.skip_same_file = bool(an_data["skip_same_file"])
-        if "min_statement_length" in an_data:
-            config.analysis.min_statement_length = int(an_data["min_statement_length"])
-        if "anomaly_percentile" in an_data:
-            config.analysis.anomaly_percentile = float(an_data["anomaly_percentile"])
-
-    # Anomaly detection
-    if "anomaly" in data:
-        anom_data = data["anomaly"]
-        if "method" in anom_data:
-            config.anomaly.method = anom_data["method"]
-        if "contamination" in anom_data:
-            config.anomaly.contamination = float(anom_data["contamination"])
-        if "ensemble_weights" in anom_data:
-            config.anomaly.ensemble_weights = [float(w) for w in anom_data["ensemble_weights"]]
-        if "min_methods_agree" in anom_data:
-            config.anomaly.min_methods_agree = int(anom_data["min_methods_agree"])
-        if "lof_neighbors" in anom_data:
-            config.anomaly.lof_neighbors = int(anom_data["lof_neighbors"])
-        if "isolation_forest_estimators" in anom_data:
-            config.anomaly.isolation_forest_estimators = int(anom_data["isolation_forest_estimators"])
-
-    # Claude
-    if "claude" in data:
-        cl_data = data["claude"]
-        if "command" in cl_data:
-            config.claude.command = cl_data["command"]
-        if "args" in cl_data:
-            config.claude.args = cl_data["args"]
-        if "timeout" in cl_data:
-            config.claude.timeout = int(cl_data["timeout"])
-
-    # Output
-    if "output" in data:
-        out_data = data["output"]
-        if "format" in out_data:
-            config.output.format = out_data["format"]
-        if "group_by" in out_data:
-            config.output.group_by = out_data["group_by"]
-        if "include_non_contradictions" in out_data:
-            config.output.include_non_contradictions = bool(
-                out_data["include_non_contradictions"]
-            )
-
-    # Prompt template
-    if "prompt_template" in data:
-        config.prompt_template = data["prompt_template"]
+        data = yaml.load(f, Loader=_YamlLoader) or {}
+
+    updates: dict[str, Any] = {}
+    for top in fields(config):
+        if top.name not in data:
+            continue
+        value = data[top.name]
+        if is_dataclass(top.type):
+            section = getattr(config, top.name)
+            updates[top.name] = replace(section, **{
+                sf.name: _coerce(sf.type, value[sf.name])
+                for sf in fields(section)
+                if sf.name in value
+            })
+        else:
+            updates[top.name] = _coerce(top.type, value)
+    config = replace(config, **updates)
+
+    # Handle ${VAR} syntax
+    key = config.openrouter.api_key
+    if key.startswith("${") and key.endswith("}"):
+        config.openrouter.api_key = os.getenv(key[2:-1], "")
 
     return config
 
 
+def _coerce(field_type: Any, value: Any) -> Any:
+    """Cast a YAML value to a numeric/bool field type (or list of them).
+
+    Strings and string lists are used as loaded.
+    """
+    if field_type in _SCALAR_TYPES:
+        return field_type(value)
+    if get_origin(field_type) is list:
+        (item_type,) = get_args(field_type)
+        if item_type in _SCALAR_TYPES:
+            return [item_type(v) for v in value]
+    return value
+
+
 def _merge_from_env(config: Config) -> Config:
     """Override config from environment variables."""
     api_key = os.getenv("OPENROUTER_API_KEY")
@@ -298,12 +278,14 @@ def _config_to_dict(config: Config) -> dict:
             "api_key": api_key,
             "embedding_model": config.openrouter.embedding_model,
             "base_url": config.openrouter.base_url,
+            "embedding_batch_size": config.openrouter.embedding_batch_size,
         },
         "analysis": {
             "similarity_threshold": config.analysis.similarity_threshold,
             "max_pairs_to_analyze": config.analysis.max_pairs_to_analyze,
             "skip_same_file": config.analysis.skip_same_file,
             "min_statement_length": config.analysis.min_statement_length,
+            "embedding_dtype": config.analysis.embedding_dtype,
         },
         "anomaly": {
             "method": config.anomaly.method,
@@ -312,6 +294,7 @@ def _config_to_dict(config: Config) -> dict:
             "min_methods_agree": config.anomaly.min_methods_agree,
             "lof_neighbors": config.anomaly.lof_neighbors,
             "isolation_forest_estimators": config.anomaly.isolation_forest_estimators,
+            "isolation_forest_max_samples": config.anomaly.isolation_forest_max_samples,
         },
         "claude": {
             "command": config.claude.command,
@@ -323,6 +306,9 @@ def _config_to_dict(config: Config) -> dict:
             "group_by": config.output.group_by,
             "include_non_contradictions": config.output.include_non_contradictions,
         },
+        "cache": {
+            "quantize": config.cache.quantize,
+        },
         "prompt_template": config.prompt_template,
     }
 
@@ -391,12 +377,14 @@ def show_config(config: Config) -> str:
         f"  api_key: {'***' if config.openrouter.api_key else '(not set)'}",
         f"  embedding_model: {config.openrouter.embedding_model}",
         f"  base_url: {config.openrouter.base_url}",
+        f"  embedding_batch_size: {config.openrouter.embedding_batch_size}",
         "",
         "## Analysis",
         f"  similarity_threshold: {config.analysis.similarity_threshold}",
         f"  max_pairs_to_analyze: {config.analysis.max_pairs_to_analyze}",
         f"  skip_same_file: {config.analysis.skip_same_file}",
         f"  min_statement_length: {config.analysis.min_statement_length}",
+        f"  embedding_dtype: {config.analysis.embedding_dtype}",
         "",
         "## Anomaly Detection",
         f"  method: {config.anomaly.method}",
@@ -405,6 +393,7 @@ def show_config(config: Config) -> str:
         f"  min_methods_agree: {config.anomaly.min_methods_agree}",
         f"  lof_neighbors: {config.anomaly.lof_neighbors}",
         f"  isolation_forest_estimators: {config.anomaly.isolation_forest_estimators}",
+        f"  isolation_forest_max_samples: {config.anomaly.isolation_forest_max_samples}",
         "",
         "## Claude CLI",
         f"  command: {config.claude.command}",
@@ -415,5 +404,8 @@ def show_config(config: Config) -> str:
         f"  format: {config.output.format}",
         f"  group_by: {config.output.group_by}",
         f"  include_non_contradictions: {config.output.include_non_contradictions}",
+        "",
+        "## Cache",
+        f"  quantize: {config.cache.quantize}",
     ]
     return "\n".join(lines)
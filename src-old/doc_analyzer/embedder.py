@@ -1,13 +1,47 @@
 """Embedder: Generate embeddings via OpenRouter API."""
 
 import asyncio
+import atexit
+import importlib.util
+import json
+from functools import lru_cache
+
 import numpy as np
 import httpx
 from rich.progress import Progress, TaskID
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from .config import Config
 from .models import Statement
 
+# httpx only speaks HTTP/2 with the h2 package installed (httpx[http2])
+_HAS_H2 = importlib.util.find_spec("h2") is not None
+
+# Responses carry thousands of floats per batch; orjson decodes them several
+# times faster than the stdlib (both accept the raw response bytes)
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _json_dumps(obj) -> bytes:
+    """Encode a request body; orjson is several times faster on long text lists."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode()
+
+
+@lru_cache(maxsize=8)
+def _request_headers(api_key: str) -> dict[str, str]:
+    """Request headers, built once per API key and shared by every batch."""
+    return {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json",
+        "HTTP-Referer": "https://github.com/doc-analyzer",
+    }
+
 
 class EmbeddingError(Exception):
     """Error during embedding generation."""
@@ -38,6 +72,9 @@ def _get_async_client() -> httpx.AsyncClient:
     global _async_http_client
     if _async_http_client is None:
         _async_http_client = httpx.AsyncClient(
+            # Multiplex concurrent batches over one connection (one TLS
+            # handshake per run) when the optional h2 package is installed
+            http2=_HAS_H2,
             timeout=60.0,
             limits=httpx.Limits(
                 max_keepalive_connections=10,
@@ -55,6 +92,11 @@ def close_client() -> None:
         _http_client = None
 
 
+# Sync callers rarely close the client themselves; release its pooled
+# connections at interpreter exit
+atexit.register(close_client)
+
+
 async def close_async_client() -> None:
     """Close the async HTTP client."""
     global _async_http_client
@@ -92,7 +134,7 @@ def embed_statements(
         )
 
     texts = [s.text for s in statements]
-    all_embeddings: list[list[float]] = []
+    all_embeddings: list[np.ndarray] = []
 
     # Get reusable client with connection pooling
     client = _get_client()
@@ -101,37 +143,34 @@ def embed_statements(
     for i in range(0, len(texts), batch_size):
         batch = texts[i : i + batch_size]
         batch_embeddings = _embed_batch_with_client(batch, config, client)
-        all_embeddings.extend(batch_embeddings)
+        all_embeddings.append(batch_embeddings)
 
         if progress and task_id is not None:
             progress.update(task_id, advance=len(batch))
 
-    return np.array(all_embeddings)
+    if not all_embeddings:
+        return np.array([])
+    return np.vstack(all_embeddings)
 
 
 def _embed_batch_with_client(
     texts: list[str],
     config: Config,
     client: httpx.Client,
-) -> list[list[float]]:
+) -> np.ndarray:
     """Embed a batch of texts using provided HTTP client (connection pooling)."""
     url = f"{config.openrouter.base_url}/embeddings"
 
-    headers = {
-        "Authorization": f"Bearer {config.openrouter.api_key}",
-        "Content-Type": "application/json",
-        "HTTP-Referer": "https://github.com/doc-analyzer",
-    }
-
-    payload = {
+    headers = _request_headers(config.openrouter.api_key)
+    content = _json_dumps({
         "model": config.openrouter.embedding_model,
         "input": texts,
-    }
+    })
 
     try:
-        response = client.post(url, headers=headers, json=payload)
+        response = client.post(url, headers=headers, content=content)
         response.raise_for_status()
-        data = response.json()
+        data = _json_loads(response.content)
     except httpx.HTTPStatusError as e:
         raise EmbeddingError(f"OpenRouter API error: {e.response.status_code} - {e.response.text}")
     except httpx.RequestError as e:
@@ -142,14 +181,19 @@ def _embed_batch_with_client(
     embeddings_data = data.get("data", [])
     if not embeddings_data:
         raise EmbeddingError(f"No embeddings returned: {data}")
+    if len(embeddings_data) != len(texts):
+        raise EmbeddingError(
+            f"Expected {len(texts)} embeddings, got {len(embeddings_data)}"
+        )
 
     # Sort by index to maintain order
     embeddings_data.sort(key=lambda x: x.get("index", 0))
 
-    return [item["embedding"] for item in embeddings_data]
+    # Convert straight to float32 rather than via a float64 array
+    return np.array([item["embedding"] for item in embeddings_data], dtype=np.float32)
 
 
-def _embed_batch(texts: list[str], config: Config) -> list[list[float]]:
+def _embed_batch(texts: list[str], config: Config) -> np.ndarray:
     """Embed a batch of texts using OpenRouter API (legacy, creates new connection)."""
     return _embed_batch_with_client(texts, config, _get_client())
 
@@ -188,7 +232,10 @@ async def embed_statements_async(
             "Set OPENROUTER_API_KEY env var or configure via 'doc-analyzer config'"
         )
 
-    texts = [s.text for s in statements]
+    # Batch texts of similar length together (longest first) so one long
+    # statement doesn't hold up a batch of short ones
+    order = sorted(range(len(statements)), key=lambda i: len(statements[i].text), reverse=True)
+    texts = [statements[i].text for i in order]
 
     # Split into batches
     batches = [
@@ -202,53 +249,49 @@ async def embed_statements_async(
     # Semaphore to limit concurrent requests
     semaphore = asyncio.Semaphore(max_concurrent)
 
-    async def process_batch(batch_idx: int, batch: list[str]) -> tuple[int, list[list[float]]]:
+    async def process_batch(start: int, batch: list[str]) -> tuple[int, np.ndarray]:
         """Process a single batch with semaphore."""
         async with semaphore:
             embeddings = await _embed_batch_async(batch, config)
             if progress and task_id is not None:
                 progress.update(task_id, advance=len(batch))
-            return batch_idx, embeddings
+            return start, embeddings
 
-    # Process all batches concurrently
+    # Process all batches concurrently, copying each into place (undoing
+    # the length sort) as soon as it arrives
     tasks = [
-        process_batch(idx, batch)
-        for idx, batch in enumerate(batches)
+        process_batch(i * batch_size, batch)
+        for i, batch in enumerate(batches)
     ]
-    results = await asyncio.gather(*tasks)
+    out: np.ndarray | None = None
+    for next_done in asyncio.as_completed(tasks):
+        start, embeddings = await next_done
+        if out is None:
+            # The first response tells us the model's dimension
+            out = np.empty((len(texts), embeddings.shape[1]), dtype=np.float32)
+        out[order[start : start + len(embeddings)]] = embeddings
 
-    # Sort by batch index and flatten
-    results.sort(key=lambda x: x[0])
-    all_embeddings = []
-    for _, embeddings in results:
-        all_embeddings.extend(embeddings)
-
-    return np.array(all_embeddings)
+    return out
 
 
 async def _embed_batch_async(
     texts: list[str],
     config: Config,
-) -> list[list[float]]:
+) -> np.ndarray:
     """Embed a batch of texts using async HTTP client."""
     client = _get_async_client()
     url = f"{config.openrouter.base_url}/embeddings"
 
-    headers = {
-        "Authorization": f"Bearer {config.openrouter.api_key}",
-        "Content-Type": "application/json",
-        "HTTP-Referer": "https://github.com/doc-analyzer",
-    }
-
-    payload = {
+    headers = _request_headers(config.openrouter.api_key)
+    content = _json_dumps({
         "model": config.openrouter.embedding_model,
         "input": texts,
-    }
+    })
 
     try:
-        response = await client.post(url, headers=headers, json=payload)
+        response = await client.post(url, headers=headers, content=content)
         response.raise_for_status()
-        data = response.json()
+        data = _json_loads(response.content)
     except httpx.HTTPStatusError as e:
         raise EmbeddingError(f"OpenRouter API error: {e.response.status_code} - {e.response.text}")
     except httpx.RequestError as e:
@@ -258,11 +301,16 @@ async def _embed_batch_async(
     embeddings_data = data.get("data", [])
     if not embeddings_data:
         raise EmbeddingError(f"No embeddings returned: {data}")
+    if len(embeddings_data) != len(texts):
+        raise EmbeddingError(
+            f"Expected {len(texts)} embeddings, got {len(embeddings_data)}"
+        )
 
     # Sort by index to maintain order
     embeddings_data.sort(key=lambda x: x.get("index", 0))
 
-    return [item["embedding"] for item in embeddings_data]
+    # Convert straight to float32 rather than via a float64 array
+    return np.array([item["embedding"] for item in embeddings_data], dtype=np.float32)
 
 
 def embed_statements_sync_wrapper(
@@ -277,11 +325,17 @@ def embed_statements_sync_wrapper(
 
     Use this when you want async performance but are in a sync context.
     """
-    return asyncio.run(
-        embed_statements_async(
-            statements, config, batch_size, max_concurrent, progress, task_id
-        )
-    )
+    async def embed_and_close() -> np.ndarray:
+        # The pooled async client is bound to this event loop, so close it
+        # before asyncio.run tears the loop down
+        try:
+            return await embed_statements_async(
+                statements, config, batch_size, max_concurrent, progress, task_id
+            )
+        finally:
+            await close_async_client()
+
+    return asyncio.run(embed_and_close())
 
 
 def get_embedding_dim(config: Config) -> int:
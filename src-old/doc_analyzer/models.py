@@ -2,8 +2,11 @@
 
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import cached_property
 from pathlib import Path
 
+import numpy as np
+
 
 class ContradictionType(Enum):
     """Types of contradictions."""
@@ -73,21 +76,27 @@ class ContradictionResult:
 @dataclass
 class ClusterResult:
     """Result of clustering statements."""
-    labels: list[int]  # Cluster ID for each statement (-1 = noise)
-    centroids: list[list[float]]  # Centroid vectors
+    labels: np.ndarray  # int32 cluster ID for each statement (-1 = noise)
+    centroids: np.ndarray  # float32 centroid vectors, one row per cluster
     n_clusters: int
     cluster_names: dict[int, str] = field(default_factory=dict)  # Optional names
+    _sizes: dict[int, int] | None = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Accept plain lists too; no-op when the clusterer already hands us arrays
+        self.labels = np.asarray(self.labels, dtype=np.int32)
+        self.centroids = np.asarray(self.centroids, dtype=np.float32)
 
-    def get_cluster_indices(self, cluster_id: int) -> list[int]:
+    def get_cluster_indices(self, cluster_id: int) -> np.ndarray:
         """Get indices of statements in a cluster."""
-        return [i for i, label in enumerate(self.labels) if label == cluster_id]
+        return np.flatnonzero(self.labels == cluster_id)
 
     def get_cluster_sizes(self) -> dict[int, int]:
-        """Get size of each cluster."""
-        sizes: dict[int, int] = {}
-        for label in self.labels:
-            sizes[label] = sizes.get(label, 0) + 1
-        return sizes
+        """Get size of each cluster (computed once, then cached)."""
+        if self._sizes is None:
+            unique, counts = np.unique(self.labels, return_counts=True)
+            self._sizes = dict(zip(unique.tolist(), counts.tolist()))
+        return self._sizes
 
 
 @dataclass
@@ -142,9 +151,9 @@ class AnalysisReport:
     anomalies: list[Anomaly]
     statistics: Statistics
 
-    @property
+    @cached_property
     def summary(self) -> dict:
-        """Return summary counts."""
+        """Return summary counts (computed on first access)."""
         return {
             "total_statements": len(self.statements),
             "total_clusters": self.clusters.n_clusters,
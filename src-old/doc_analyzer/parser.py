@@ -1,11 +1,55 @@
 """Document parser: extracts statements from markdown, text, and JSON files."""
 
+import hashlib
 import json
+import mmap
+import multiprocessing
+import os
+import pickle
 import re
+import sys
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import chain, repeat
 from pathlib import Path
 
+from ._cache_fs import CACHE_ROOT
 from .models import Statement
 
+# Use a process pool only once the files add up to enough text to amortize
+# worker startup: spawned workers re-import the package (~0.25 s each)
+PARALLEL_MIN_BYTES = 16 * 1024 * 1024
+
+# Chunks queued per worker, so one slow chunk doesn't leave the rest idle
+CHUNKS_PER_WORKER = 4
+
+# Parsed statements, one pickle per (path, settings), holding the signature
+# of the file set (mtimes, sizes) it was built from; a changed signature
+# overwrites the same file. Bump PARSE_CACHE_VERSION whenever parsing output
+# changes.
+PARSE_CACHE_DIR = CACHE_ROOT / "parsed"
+PARSE_CACHE_VERSION = "2"
+
+# Markdown cleanup passes as (trigger char, pattern, replacement), applied in order
+_CLEAN_PATTERNS = (
+    ("*", re.compile(r"\*\*([^*]+)\*\*"), r"\1"),  # Bold
+    ("*", re.compile(r"\*([^*]+)\*"), r"\1"),  # Italic
+    ("_", re.compile(r"__([^_]+)__"), r"\1"),  # Bold
+    ("_", re.compile(r"_([^_]+)_"), r"\1"),  # Italic
+    ("[", re.compile(r"\[([^\]]+)\]\([^)]+\)"), r"\1"),  # Links (keep text)
+    ("[", re.compile(r"!\[([^\]]*)\]\([^)]+\)"), ""),  # Images
+    ("<", re.compile(r"<[^>]+>"), ""),  # HTML tags
+)
+
+_HEADER_RE = re.compile(r"^#{1,6}\s+.+$")
+
+# Universal newlines for the mmap line reader (CRLF first so it counts once)
+_NEWLINE_RE = re.compile(rb"\r\n?|\n")
+
+# Preformatted path components for list indices
+_INDEX_KEYS = tuple(str(i) for i in range(256))
+
 
 def parse_documents(
     path: str | Path,
@@ -22,23 +66,164 @@ def parse_documents(
     Returns:
         List of Statement objects
     """
+    return list(chain.from_iterable(iter_documents(path, min_length, extensions)))
+
+
+def parse_documents_cached(
+    path: str | Path,
+    min_length: int = 50,
+    extensions: tuple[str, ...] = (".md", ".txt", ".json"),
+    use_cache: bool = True,
+) -> list[Statement]:
+    """Parse documents, reusing the previous result if no file has changed.
+
+    Files are only stat'ed on a warm run; see :func:`parse_documents` for
+    the arguments. ``use_cache=False`` bypasses the cache entirely.
+    """
+    if not use_cache:
+        return parse_documents(path, min_length, extensions)
+
     path = Path(path)
-    statements: list[Statement] = []
+    files, signature = _parse_signature(_find_files(path, extensions), min_length, extensions)
+    cache_file = PARSE_CACHE_DIR / f"{_parse_cache_key(path, min_length, extensions)}.pkl"
+
+    try:
+        with open(cache_file, "rb") as f:
+            cached_signature, statements = pickle.load(f)
+        if cached_signature == signature:
+            return statements
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError, TypeError):
+        pass
+
+    statements = list(chain.from_iterable(_parse_files(files, min_length)))
+
+    # Write to a temporary name first so a concurrent run never reads a
+    # partial pickle
+    try:
+        PARSE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_file, "wb") as f:
+            pickle.dump((signature, statements), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        pass
+
+    return statements
+
+
+def _parse_cache_key(path: Path, min_length: int, extensions: tuple[str, ...]) -> str:
+    """Name the cache file after the parsed path and settings only.
+
+    The path is keyed both resolved and as given: cached statements keep
+    the spelling of the run that parsed them (``docs/a.md`` vs
+    ``/abs/docs/a.md``), so each spelling gets its own entry.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(
+        f"{PARSE_CACHE_VERSION}\0{path.resolve()}\0{path}\0{min_length}\0{','.join(extensions)}".encode()
+    )
+    return h.hexdigest()
+
+
+def _parse_signature(
+    files: list[Path], min_length: int, extensions: tuple[str, ...],
+) -> tuple[list[Path], str]:
+    """Hash the parse settings and each file's (path, mtime, size).
+
+    Files that vanished since they were listed are skipped; returns the
+    remaining files along with the signature.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{PARSE_CACHE_VERSION}\0{min_length}\0{','.join(extensions)}".encode())
+    present = []
+    for file_path in files:
+        try:
+            st = file_path.stat()
+        except FileNotFoundError:
+            continue
+        present.append(file_path)
+        h.update(f"\0{file_path.resolve()}\0{st.st_mtime_ns}\0{st.st_size}".encode())
+    return present, h.hexdigest()
+
+
+def iter_documents(
+    path: str | Path,
+    min_length: int = 50,
+    extensions: tuple[str, ...] = (".md", ".txt", ".json"),
+) -> Iterator[list[Statement]]:
+    """Yield each file's statements in turn, in sorted file order.
 
+    Lets callers start on the first files while later ones are still being
+    parsed; see :func:`parse_documents` for the arguments.
+    """
+    return _parse_files(_find_files(Path(path), extensions), min_length)
+
+
+def _find_files(path: Path, extensions: tuple[str, ...]) -> list[Path]:
+    """List the files to parse under ``path``, sorted."""
     if path.is_file():
-        files = [path]
-    else:
-        files = [f for f in path.rglob("*") if f.suffix in extensions]
+        return [path]
+    return sorted(f for f in path.rglob("*") if f.suffix in extensions)
+
+
+def _parse_files(files: list[Path], min_length: int) -> Iterator[list[Statement]]:
+    """Yield each file's statements, in the order given."""
+    done = 0
+    if _use_process_pool(files):
+        workers = os.cpu_count() or 1
+        chunksize = -(-len(files) // (workers * CHUNKS_PER_WORKER))
+        n_chunks = -(-len(files) // chunksize)
+        # Files are independent and CPU-bound; map preserves sorted order.
+        # Workers are spawned, not forked: this generator runs on the
+        # pipeline's parser thread, and forking a threaded process can
+        # copy locks held by other threads and deadlock the child.
+        try:
+            with ProcessPoolExecutor(
+                max_workers=min(workers, n_chunks),
+                mp_context=multiprocessing.get_context("spawn"),
+            ) as executor:
+                for statements in executor.map(
+                    _parse_file, files, repeat(min_length), chunksize=chunksize,
+                ):
+                    yield statements
+                    done += 1
+        except (BrokenProcessPool, OSError):
+            # Workers failed to start or died; parse the rest serially
+            pass
+
+    for file_path in files[done:]:
+        yield _parse_file(file_path, min_length)
+
+
+def _use_process_pool(files: list[Path]) -> bool:
+    """Whether the files are worth a process pool and one can be spawned."""
+    if len(files) < 2:
+        return False
+    # Spawned workers re-run __main__ from its path, which code read from
+    # stdin (python -) doesn't have
+    main_file = getattr(sys.modules["__main__"], "__file__", None)
+    if main_file is not None and not os.path.exists(main_file):
+        return False
+    total = 0
+    for file_path in files:
+        try:
+            total += file_path.stat().st_size
+        except OSError:
+            continue
+        if total >= PARALLEL_MIN_BYTES:
+            return True
+    return False
 
-    for file_path in sorted(files):
-        if file_path.suffix == ".md":
-            statements.extend(_parse_markdown(file_path, min_length))
-        elif file_path.suffix == ".txt":
-            statements.extend(_parse_text(file_path, min_length))
-        elif file_path.suffix == ".json":
-            statements.extend(_parse_json(file_path, min_length))
 
-    return statements
+def _parse_file(file_path: Path, min_length: int) -> list[Statement]:
+    """Parse a single file, dispatching on its extension."""
+    if file_path.suffix == ".md":
+        return _parse_markdown(file_path, min_length)
+    elif file_path.suffix == ".txt":
+        return _parse_text(file_path, min_length)
+    elif file_path.suffix == ".json":
+        return _parse_json(file_path, min_length)
+    return []
 
 
 def _parse_text(file_path: Path, min_length: int) -> list[Statement]:
@@ -50,14 +235,8 @@ def _parse_text(file_path: Path, min_length: int) -> list[Statement]:
     """
     statements: list[Statement] = []
 
-    with open(file_path, encoding="utf-8") as f:
-        content = f.read()
-
-    # Split into lines with line numbers
-    lines = content.split("\n")
-
-    # Group into paragraphs
-    paragraphs = _group_into_paragraphs(lines)
+    # Stream lines from the file; only one paragraph is held at a time
+    paragraphs = _group_into_paragraphs(_iter_file_lines(file_path))
 
     for para_text, start_line in paragraphs:
         # Clean up whitespace
@@ -141,7 +320,7 @@ def _parse_json(file_path: Path, min_length: int) -> list[Statement]:
             return statements
 
     # Extract strings recursively
-    strings = _extract_json_strings(data, [])
+    strings = _extract_json_strings(data)
 
     for text, json_path in strings:
         if len(text) < min_length:
@@ -168,7 +347,26 @@ def _remove_code_blocks(content: str) -> str:
     return content
 
 
-def _group_into_paragraphs(lines: list[str]) -> list[tuple[str, int]]:
+def _iter_file_lines(file_path: Path) -> Iterator[str]:
+    """Yield decoded lines of a UTF-8 file without materializing a line list.
+
+    The file is memory-mapped and scanned for line endings, which are
+    normalised like text-mode reading: ``\\r\\n``, ``\\r`` and ``\\n`` all end a
+    line. Decoding per line is safe because neither byte occurs inside a
+    multi-byte UTF-8 sequence.
+    """
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            offset = 0
+            for match in _NEWLINE_RE.finditer(mm):
+                yield mm[offset:match.start()].decode("utf-8")
+                offset = match.end()
+            yield mm[offset:].decode("utf-8")
+
+
+def _group_into_paragraphs(lines: Iterable[str]) -> list[tuple[str, int]]:
     """Group lines into paragraphs with start line numbers.
 
     Returns list of (paragraph_text, start_line_number)
@@ -201,20 +399,11 @@ def _group_into_paragraphs(lines: list[str]) -> list[tuple[str, int]]:
 
 def _clean_paragraph(text: str) -> str:
     """Clean up paragraph text."""
-    # Remove markdown formatting
-    text = re.sub(r"\*\*([^*]+)\*\*", r"\1", text)  # Bold
-    text = re.sub(r"\*([^*]+)\*", r"\1", text)  # Italic
-    text = re.sub(r"__([^_]+)__", r"\1", text)  # Bold
-    text = re.sub(r"_([^_]+)_", r"\1", text)  # Italic
-
-    # Remove links but keep text
-    text = re.sub(r"\[([^\]]+)\]\([^)]+\)", r"\1", text)
-
-    # Remove images
-    text = re.sub(r"!\[([^\]]*)\]\([^)]+\)", "", text)
-
-    # Remove HTML tags
-    text = re.sub(r"<[^>]+>", "", text)
+    # Remove markdown formatting, links, images and HTML tags.
+    # Each pass only runs if its trigger character is present.
+    for trigger, pattern, repl in _CLEAN_PATTERNS:
+        if trigger in text:
+            text = pattern.sub(repl, text)
 
     # Normalize whitespace
     text = " ".join(text.split())
@@ -225,24 +414,36 @@ def _clean_paragraph(text: str) -> str:
 def _is_header_only(text: str) -> bool:
     """Check if text is just a header."""
     # Check for markdown headers
-    if re.match(r"^#{1,6}\s+.+$", text):
-        return True
-    return False
+    return _HEADER_RE.match(text) is not None
 
 
 def _is_table_or_list_structure(text: str) -> bool:
     """Check if text is primarily table or list structure."""
+    if "\n" not in text:
+        # Single line (always the case after _clean_paragraph): no split needed
+        stripped = text.lstrip()
+        return "|" in text or (
+            len(stripped) > 1 and stripped[0] in "-*+" and stripped[1].isspace()
+        )
+
     lines = text.split("\n")
-    if not lines:
-        return False
+
+    # Count table and list lines in one pass; a list line is optional
+    # whitespace, a -/*/+ marker, then whitespace (no regex per line)
+    table_lines = 0
+    list_lines = 0
+    for line in lines:
+        if "|" in line:
+            table_lines += 1
+        stripped = line.lstrip()
+        if len(stripped) > 1 and stripped[0] in "-*+" and stripped[1].isspace():
+            list_lines += 1
 
     # Check for table indicators
-    table_lines = sum(1 for line in lines if "|" in line)
     if table_lines / len(lines) > 0.5:
         return True
 
     # Check for list-only content
-    list_lines = sum(1 for line in lines if re.match(r"^\s*[-*+]\s+", line))
     if list_lines / len(lines) > 0.8:
         return True
 
@@ -251,29 +452,46 @@ def _is_table_or_list_structure(text: str) -> bool:
 
 def _extract_json_strings(
     obj: object,
-    path: list[str],
-) -> list[tuple[str, list[str]]]:
-    """Recursively extract strings from JSON object.
+    path: tuple[str, ...] = (),
+) -> list[tuple[str, tuple[str, ...]]]:
+    """Extract strings from JSON object in document order.
+
+    Walks the tree with an explicit stack, so deeply nested files don't
+    hit the recursion limit.
 
     Returns list of (string_value, json_path)
     """
-    results: list[tuple[str, list[str]]] = []
+    results: list[tuple[str, tuple[str, ...]]] = []
+    stack: list[tuple[object, tuple[str, ...]]] = [(obj, path)]
+
+    while stack:
+        node, node_path = stack.pop()
+
+        if isinstance(node, str):
+            # Clean up the string
+            clean = node.strip()
+            if clean:
+                results.append((clean, node_path))
+
+        elif isinstance(node, dict):
+            # Push in reverse so children pop in original order
+            stack.extend(
+                (value, node_path + (sys.intern(key),))
+                for key, value in reversed(node.items())
+            )
 
-    if isinstance(obj, str):
-        # Clean up the string
-        clean = obj.strip()
-        if clean:
-            results.append((clean, path.copy()))
+        elif isinstance(node, list):
+            stack.extend(
+                (node[i], node_path + (_index_key(i),))
+                for i in range(len(node) - 1, -1, -1)
+            )
 
-    elif isinstance(obj, dict):
-        for key, value in obj.items():
-            results.extend(_extract_json_strings(value, path + [key]))
+    return results
 
-    elif isinstance(obj, list):
-        for i, item in enumerate(obj):
-            results.extend(_extract_json_strings(item, path + [str(i)]))
 
-    return results
+def _index_key(i: int) -> str:
+    """Path component for a list index (small indices are precomputed)."""
+    return _INDEX_KEYS[i] if i < len(_INDEX_KEYS) else str(i)
 
 
 def get_file_stats(path: str | Path) -> dict:
@@ -1,8 +1,21 @@
 """Reporter: Generate analysis reports in various formats."""
 
+import io
 import json
+import os
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
 from datetime import datetime
+from operator import attrgetter
 from pathlib import Path
+from typing import TextIO
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from .models import (
     AnalysisReport,
@@ -17,6 +30,7 @@ def generate_report(
     report: AnalysisReport,
     output_format: str = "markdown",
     group_by: str = "severity",
+    pretty: bool = False,
 ) -> str:
     """Generate formatted report.
 
@@ -24,231 +38,316 @@ def generate_report(
         report: AnalysisReport object
         output_format: "markdown" or "json"
         group_by: "severity", "file", or "type"
+        pretty: Indent JSON output (compact by default)
 
     Returns:
         Formatted report string
     """
     if output_format == "json":
-        return _generate_json_report(report)
+        return _generate_json_report(report, pretty)
     else:
         return _generate_markdown_report(report, group_by)
 
 
+def iter_report(
+    report: AnalysisReport,
+    output_format: str = "markdown",
+    group_by: str = "severity",
+    pretty: bool = False,
+) -> Iterator[str]:
+    """Yield the formatted report in chunks instead of one string.
+
+    Same arguments as generate_report; pass the result to save_report to
+    write a large report without holding a second full copy in memory.
+    """
+    if output_format == "json":
+        return _generate_json_report_stream(report, pretty)
+    else:
+        return _markdown_sections(report, group_by)
+
+
 def _generate_markdown_report(report: AnalysisReport, group_by: str) -> str:
     """Generate markdown report."""
-    lines: list[str] = []
+    return "".join(_markdown_sections(report, group_by))
+
+
+def _markdown_sections(report: AnalysisReport, group_by: str) -> Iterator[str]:
+    """Yield the markdown report one section at a time.
+
+    Formatters write straight into a shared StringIO, which is drained after
+    each section.
+    """
+    buf = io.StringIO()
 
     # Header
-    lines.append("# Document Analysis Report")
-    lines.append("")
-    lines.append(f"**Scanned:** {report.statistics.total_files} files, {report.statistics.total_statements} statements")
-    lines.append(f"**Topics detected:** {report.clusters.n_clusters} clusters")
-    lines.append(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-    lines.append("")
-    lines.append("---")
-    lines.append("")
+    buf.write("# Document Analysis Report\n\n")
+    buf.write(f"**Scanned:** {report.statistics.total_files} files, {report.statistics.total_statements} statements\n")
+    buf.write(f"**Topics detected:** {report.clusters.n_clusters} clusters\n")
+    buf.write(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M')}\n")
+    buf.write("\n---\n\n")
 
     # Statistics section
-    lines.extend(_format_statistics_section(report.statistics))
-    lines.append("")
+    _format_statistics_section(buf, report.statistics)
+    buf.write("\n")
+    yield _drain(buf)
 
     # Anomalies section
     if report.anomalies:
-        lines.extend(_format_anomalies_section(report.anomalies))
-        lines.append("")
+        _format_anomalies_section(buf, report.anomalies)
+        buf.write("\n")
+        yield _drain(buf)
 
     # Contradictions section
     if report.contradictions:
-        lines.extend(_format_contradictions_section(report.contradictions, group_by))
-        lines.append("")
+        _format_contradictions_section(buf, report.contradictions, group_by)
+        buf.write("\n")
+        yield _drain(buf)
 
     # Summary
-    lines.extend(_format_summary(report))
+    _format_summary(buf, report)
+    yield _drain(buf)
+
 
-    return "\n".join(lines)
+def _drain(buf: io.StringIO) -> str:
+    """Return the buffered text and reset the buffer for reuse."""
+    text = buf.getvalue()
+    buf.seek(0)
+    buf.truncate()
+    return text
 
 
-def _format_statistics_section(stats: Statistics) -> list[str]:
+def _format_statistics_section(buf: io.StringIO, stats: Statistics) -> None:
     """Format statistics section."""
-    lines = [
-        "## Statistics",
-        "",
-        "### Topic Distribution",
-        "",
-        "| Cluster | Topic | Statements | Files | Density |",
-        "|---------|-------|------------|-------|---------|",
-    ]
-
-    for cluster_id in sorted(stats.per_cluster.keys()):
-        if cluster_id == -1:
-            continue
-        cs = stats.per_cluster[cluster_id]
-        lines.append(f"| {cluster_id} | {cs.name} | {cs.count} | {len(cs.files)} | {cs.density:.2f} |")
+    buf.write(
+        "## Statistics\n"
+        "\n"
+        "### Topic Distribution\n"
+        "\n"
+        "| Cluster | Topic | Statements | Files | Density |\n"
+        "|---------|-------|------------|-------|---------|\n"
+    )
+
+    per_cluster = stats.per_cluster
+    write = buf.write
+
+    # All cluster IDs, excluding noise
+    all_clusters = sorted([c for c in per_cluster if c >= 0])
+
+    for cluster_id in all_clusters:
+        cs = per_cluster[cluster_id]
+        write(f"| {cluster_id} | {cs.name} | {cs.count} | {len(cs.files)} | {cs.density:.2f} |\n")
 
     # File coverage matrix
-    lines.append("")
-    lines.append("### File Coverage Matrix")
-    lines.append("")
+    write("\n### File Coverage Matrix\n\n")
 
-    # Get all cluster IDs (excluding noise)
-    all_clusters = sorted([c for c in stats.per_cluster.keys() if c >= 0])
     if all_clusters:
         # Header row
-        cluster_names = [stats.per_cluster[c].name[:12] for c in all_clusters]
-        lines.append("| File | " + " | ".join(cluster_names) + " |")
-        lines.append("|" + "------|" * (len(all_clusters) + 1))
+        cluster_names = [per_cluster[c].name[:12] for c in all_clusters]
+        write("| File | " + " | ".join(cluster_names) + " |\n")
+        write("|" + "------|" * (len(all_clusters) + 1) + "\n")
+
+        # Fill a files × clusters bool grid once, then render each row from it
+        files = sorted(stats.coverage_matrix.items())
+        column = {c: i for i, c in enumerate(all_clusters)}
+        covered = np.zeros((len(files), len(all_clusters)), dtype=bool)
+        for row, (_, clusters) in enumerate(files):
+            covered[row, [column[c] for c in clusters if c in column]] = True
+        cells = np.where(covered, "\u2713", "-")
 
         # Data rows
-        for file_path, clusters in sorted(stats.coverage_matrix.items()):
-            file_name = Path(file_path).name[:30]
-            coverage = ["\u2713" if c in clusters else "-" for c in all_clusters]
-            lines.append(f"| {file_name} | " + " | ".join(coverage) + " |")
+        basename = os.path.basename
+        for (file_path, _), row_cells in zip(files, cells.tolist()):
+            write(f"| {basename(file_path)[:30]} | " + " | ".join(row_cells) + " |\n")
 
-    return lines
 
-
-def _format_anomalies_section(anomalies: list[Anomaly]) -> list[str]:
+def _format_anomalies_section(buf: io.StringIO, anomalies: list[Anomaly]) -> None:
     """Format anomalies section."""
-    lines = [
-        "---",
-        "",
-        f"## Anomalies ({len(anomalies)})",
-        "",
-    ]
+    buf.write(f"---\n\n## Anomalies ({len(anomalies)})\n\n")
 
     for i, anomaly in enumerate(anomalies, 1):
-        lines.append(f"### {i}. Anomalous statement")
-        lines.append(f"- **File:** {anomaly.statement.source_file.name}:{anomaly.statement.line_number}")
-        lines.append(f"  > \"{anomaly.statement.text[:100]}{'...' if len(anomaly.statement.text) > 100 else ''}\"")
-        lines.append(f"- **Score:** {anomaly.score:.3f}")
-        lines.append(f"- **Cluster:** {anomaly.cluster_id}")
-        lines.append(f"- **Reason:** {anomaly.reason}")
-        lines.append("")
-
-    return lines
+        stmt = anomaly.statement
+        buf.write(f"### {i}. Anomalous statement\n")
+        buf.write(f"- **File:** {stmt.source_file.name}:{stmt.line_number}\n")
+        buf.write(f"  > \"{_truncate(stmt.text)}\"\n")
+        buf.write(f"- **Score:** {anomaly.score:.3f}\n")
+        buf.write(f"- **Cluster:** {anomaly.cluster_id}\n")
+        buf.write(f"- **Reason:** {anomaly.reason}\n")
+        buf.write("\n")
 
 
 def _format_contradictions_section(
+    buf: io.StringIO,
     contradictions: list[ContradictionResult],
     group_by: str,
-) -> list[str]:
+) -> None:
     """Format contradictions section."""
-    lines = [
-        "---",
-        "",
-        f"## Contradictions ({len(contradictions)})",
-        "",
-    ]
+    buf.write(f"---\n\n## Contradictions ({len(contradictions)})\n\n")
 
     if group_by == "severity":
-        lines.extend(_group_by_severity(contradictions))
+        _group_by_severity(buf, contradictions)
     elif group_by == "file":
-        lines.extend(_group_by_file(contradictions))
+        _group_by_file(buf, contradictions)
     else:
-        lines.extend(_group_by_type(contradictions))
+        _group_by_type(buf, contradictions)
 
-    return lines
 
-
-def _group_by_severity(contradictions: list[ContradictionResult]) -> list[str]:
+def _group_by_severity(buf: io.StringIO, contradictions: list[ContradictionResult]) -> None:
     """Group contradictions by severity."""
-    lines: list[str] = []
-
     severity_order = [Severity.CRITICAL, Severity.HIGH, Severity.MEDIUM, Severity.LOW]
 
+    # Bucket in one pass instead of filtering the list once per severity
+    buckets: dict[Severity, list[ContradictionResult]] = {s: [] for s in severity_order}
+    for c in contradictions:
+        group = buckets.get(c.severity)
+        if group is not None:
+            group.append(c)
+
     for severity in severity_order:
-        group = [c for c in contradictions if c.severity == severity]
+        group = buckets[severity]
         if not group:
             continue
 
-        lines.append(f"### {severity.value.title()} ({len(group)})")
-        lines.append("")
+        buf.write(f"### {severity.value.title()} ({len(group)})\n\n")
 
         for i, c in enumerate(group, 1):
-            lines.extend(_format_contradiction(c, i))
+            _format_contradiction(buf, c, i)
 
-    return lines
 
-
-def _group_by_file(contradictions: list[ContradictionResult]) -> list[str]:
+def _group_by_file(buf: io.StringIO, contradictions: list[ContradictionResult]) -> None:
     """Group contradictions by file."""
-    lines: list[str] = []
-
     # Group by file pairs
-    by_files: dict[str, list[ContradictionResult]] = {}
+    by_files: dict[str, list[ContradictionResult]] = defaultdict(list)
     for c in contradictions:
         key = f"{c.statement_a.source_file.name} <-> {c.statement_b.source_file.name}"
-        if key not in by_files:
-            by_files[key] = []
         by_files[key].append(c)
 
     for files, group in sorted(by_files.items()):
-        lines.append(f"### {files} ({len(group)})")
-        lines.append("")
+        buf.write(f"### {files} ({len(group)})\n\n")
 
         for i, c in enumerate(group, 1):
-            lines.extend(_format_contradiction(c, i))
+            _format_contradiction(buf, c, i)
 
-    return lines
 
-
-def _group_by_type(contradictions: list[ContradictionResult]) -> list[str]:
+def _group_by_type(buf: io.StringIO, contradictions: list[ContradictionResult]) -> None:
     """Group contradictions by type."""
-    lines: list[str] = []
-
-    by_type: dict[str, list[ContradictionResult]] = {}
+    by_type: dict[str, list[ContradictionResult]] = defaultdict(list)
     for c in contradictions:
-        key = c.contradiction_type.value
-        if key not in by_type:
-            by_type[key] = []
-        by_type[key].append(c)
+        by_type[c.contradiction_type.value].append(c)
 
     for type_name, group in sorted(by_type.items()):
-        lines.append(f"### {type_name.title()} ({len(group)})")
-        lines.append("")
+        buf.write(f"### {type_name.title()} ({len(group)})\n\n")
 
         for i, c in enumerate(group, 1):
-            lines.extend(_format_contradiction(c, i))
-
-    return lines
+            _format_contradiction(buf, c, i)
+
+
+# One format call per contradiction instead of a string per line
+_CONTRADICTION_TEMPLATE = (
+    "#### {num}. {type} contradiction\n"
+    "- **File A:** {file_a}:{line_a}\n"
+    "  > \"{text_a}\"\n"
+    "- **File B:** {file_b}:{line_b}\n"
+    "  > \"{text_b}\"\n"
+    "- **Similarity:** {similarity:.2f}\n"
+    "- **Confidence:** {confidence:.2f}\n"
+    "- **Explanation:** {explanation}\n"
+    "\n"
+)
 
 
-def _format_contradiction(c: ContradictionResult, num: int) -> list[str]:
+def _format_contradiction(buf: io.StringIO, c: ContradictionResult, num: int) -> None:
     """Format a single contradiction."""
-    return [
-        f"#### {num}. {c.contradiction_type.value.title()} contradiction",
-        f"- **File A:** {c.statement_a.source_file.name}:{c.statement_a.line_number}",
-        f"  > \"{c.statement_a.text[:100]}{'...' if len(c.statement_a.text) > 100 else ''}\"",
-        f"- **File B:** {c.statement_b.source_file.name}:{c.statement_b.line_number}",
-        f"  > \"{c.statement_b.text[:100]}{'...' if len(c.statement_b.text) > 100 else ''}\"",
-        f"- **Similarity:** {c.similarity:.2f}",
-        f"- **Confidence:** {c.confidence:.2f}",
-        f"- **Explanation:** {c.explanation}",
-        "",
-    ]
-
-
-def _format_summary(report: AnalysisReport) -> list[str]:
+    a = c.statement_a
+    b = c.statement_b
+    buf.write(_CONTRADICTION_TEMPLATE.format(
+        num=num,
+        type=c.contradiction_type.value.title(),
+        file_a=a.source_file.name,
+        line_a=a.line_number,
+        text_a=_truncate(a.text),
+        file_b=b.source_file.name,
+        line_b=b.line_number,
+        text_b=_truncate(b.text),
+        similarity=c.similarity,
+        confidence=c.confidence,
+        explanation=c.explanation,
+    ))
+
+
+def _truncate(text: str, limit: int = 100) -> str:
+    """Cut text to limit characters, marking the cut with an ellipsis."""
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+def _format_summary(buf: io.StringIO, report: AnalysisReport) -> None:
     """Format summary section."""
     summary = report.summary
 
-    return [
-        "---",
-        "",
-        "## Summary",
-        "",
-        "| Category | Count | Action |",
-        "|----------|-------|--------|",
-        f"| Contradictions | {summary['total_contradictions']} | Review & resolve |",
-        f"| Critical | {summary['critical_contradictions']} | Immediate attention |",
-        f"| Anomalies | {summary['total_anomalies']} | Check if intentional |",
-        f"| Topics | {summary['total_clusters']} | - |",
-        "",
-    ]
-
-
-def _generate_json_report(report: AnalysisReport) -> str:
+    buf.write(
+        "---\n"
+        "\n"
+        "## Summary\n"
+        "\n"
+        "| Category | Count | Action |\n"
+        "|----------|-------|--------|\n"
+        f"| Contradictions | {summary['total_contradictions']} | Review & resolve |\n"
+        f"| Critical | {summary['critical_contradictions']} | Immediate attention |\n"
+        f"| Anomalies | {summary['total_anomalies']} | Check if intentional |\n"
+        f"| Topics | {summary['total_clusters']} | - |\n"
+        "\n"
+    )
+
+
+# orjson needs to be told about the int cluster keys in "sizes" and any
+# NumPy scalars that stats hand over
+_ORJSON_OPTIONS = (
+    orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY if orjson is not None else 0
+)
+
+
+def _json_encoder(pretty: bool) -> json.JSONEncoder:
+    """Stdlib encoder matching the orjson output layout."""
+    if pretty:
+        return json.JSONEncoder(indent=2, ensure_ascii=False, default=str)
+    return json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def _generate_json_report(report: AnalysisReport, pretty: bool = False) -> str:
     """Generate JSON report."""
+    if orjson is not None:
+        return _orjson_report(report, pretty).decode()
+    return _json_encoder(pretty).encode(_json_report_data(report))
+
+
+def _orjson_report(report: AnalysisReport, pretty: bool = False) -> bytes:
+    """Dump the JSON report to UTF-8 bytes with orjson (must be installed)."""
+    options = _ORJSON_OPTIONS | (orjson.OPT_INDENT_2 if pretty else 0)
+    return orjson.dumps(_json_report_data(report), default=str, option=options)
+
+
+def _generate_json_report_stream(report: AnalysisReport, pretty: bool = False) -> Iterator[str]:
+    """Yield the JSON report in encoder-sized chunks."""
+    if orjson is not None:
+        # orjson has no incremental mode, but one native dump still beats iterencode
+        return iter((_generate_json_report(report, pretty),))
+    return _json_encoder(pretty).iterencode(_json_report_data(report))
+
+
+# Field extractors for the JSON rows; attrgetter resolves the dotted paths in C
+_anomaly_fields = attrgetter(
+    "statement.source_file", "statement.line_number", "statement.text",
+    "score", "cluster_id", "reason",
+)
+_contradiction_fields = attrgetter(
+    "statement_a.source_file", "statement_a.line_number", "statement_a.text",
+    "statement_b.source_file", "statement_b.line_number", "statement_b.text",
+    "similarity", "is_contradiction", "confidence",
+    "contradiction_type.value", "severity.value", "explanation",
+)
+
+
+def _json_report_data(report: AnalysisReport) -> dict:
+    """Collect the JSON-serializable report payload."""
     data = {
         "generated": datetime.now().isoformat(),
         "summary": report.summary,
@@ -264,44 +363,69 @@ def _generate_json_report(report: AnalysisReport) -> str:
             "sizes": report.clusters.get_cluster_sizes(),
         },
         "anomalies": [
-            {
-                "file": str(a.statement.source_file),
-                "line": a.statement.line_number,
-                "text": a.statement.text,
-                "score": a.score,
-                "cluster_id": a.cluster_id,
-                "reason": a.reason,
-            }
-            for a in report.anomalies
+            {"file": str(f), "line": line, "text": text, "score": score, "cluster_id": cid, "reason": reason}
+            for f, line, text, score, cid, reason in map(_anomaly_fields, report.anomalies)
         ],
         "contradictions": [
             {
-                "statement_a": {
-                    "file": str(c.statement_a.source_file),
-                    "line": c.statement_a.line_number,
-                    "text": c.statement_a.text,
-                },
-                "statement_b": {
-                    "file": str(c.statement_b.source_file),
-                    "line": c.statement_b.line_number,
-                    "text": c.statement_b.text,
-                },
-                "similarity": c.similarity,
-                "is_contradiction": c.is_contradiction,
-                "confidence": c.confidence,
-                "type": c.contradiction_type.value,
-                "severity": c.severity.value,
-                "explanation": c.explanation,
+                "statement_a": {"file": str(fa), "line": la, "text": ta},
+                "statement_b": {"file": str(fb), "line": lb, "text": tb},
+                "similarity": sim,
+                "is_contradiction": is_contra,
+                "confidence": conf,
+                "type": ctype,
+                "severity": severity,
+                "explanation": explanation,
             }
-            for c in report.contradictions
+            for fa, la, ta, fb, lb, tb, sim, is_contra, conf, ctype, severity, explanation
+            in map(_contradiction_fields, report.contradictions)
         ],
     }
 
-    return json.dumps(data, indent=2, ensure_ascii=False)
+    return data
+
+
+def write_json_report(report: AnalysisReport, fp: TextIO, pretty: bool = False) -> None:
+    """Write the JSON report to an open text file chunk by chunk."""
+    fp.writelines(_generate_json_report_stream(report, pretty))
+
+
+# Write buffer for save_report; streamed chunks are small, so batch the syscalls
+SAVE_BUFFER_SIZE = 1 << 20
+
 
+def save_report(content: str | bytes | Iterable[str], output_path: Path) -> None:
+    """Save report to file.
 
-def save_report(content: str, output_path: Path) -> None:
-    """Save report to file."""
+    content may be a full string, already-encoded UTF-8 bytes, or an
+    iterable of chunks (see iter_report).
+    """
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(content)
+    if isinstance(content, bytes):
+        output_path.write_bytes(content)
+        return
+    # The text layer gathers the many tiny iterencode chunks before encoding
+    # them, so UTF-8 conversion runs on large blocks rather than per chunk
+    with open(output_path, "w", encoding="utf-8", buffering=SAVE_BUFFER_SIZE) as f:
+        if isinstance(content, str):
+            f.write(content)
+        else:
+            f.writelines(content)
+
+
+def write_report(
+    report: AnalysisReport,
+    output_path: Path,
+    output_format: str = "markdown",
+    group_by: str = "severity",
+    pretty: bool = False,
+) -> None:
+    """Generate a report straight into output_path.
+
+    JSON goes out as orjson bytes when available, skipping the str round
+    trip; everything else is streamed through save_report.
+    """
+    if output_format == "json" and orjson is not None:
+        save_report(_orjson_report(report, pretty), output_path)
+    else:
+        save_report(iter_report(report, output_format, group_by, pretty), output_path)
@@ -1,10 +1,52 @@
 """Similarity: Find semantically similar statement pairs."""
 
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
 import numpy as np
 from sklearn.metrics.pairwise import cosine_similarity
 
 from .models import Statement, SimilarPair
 
+# Optional: FAISS provides SIMD inner-product search for nearest neighbors
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+# Rows per similarity tile: 512×512 float32 = 1 MB, fits in L2
+TILE_SIZE = 512
+
+# Largest n for which precompute_similarity keeps the dense n×n matrix (64 MB)
+DENSE_MATRIX_LIMIT = 4096
+
+
+@dataclass
+class PrecomputedSimilarity:
+    """Normalized embeddings shared across similarity consumers."""
+    normed: np.ndarray  # L2-normalized float32 embeddings
+    matrix: np.ndarray | None = None  # Full cosine matrix (small inputs only)
+
+    def iter_tiles(self, block_size: int = TILE_SIZE) -> Iterator[tuple[int, int, np.ndarray]]:
+        """Yield upper-triangle tiles, reusing the dense matrix if present."""
+        if self.matrix is not None:
+            yield 0, 0, self.matrix
+        else:
+            yield from _iter_normalized_tiles(self.normed, block_size)
+
+
+def precompute_similarity(
+    embeddings: np.ndarray,
+    max_dense: int = DENSE_MATRIX_LIMIT,
+) -> PrecomputedSimilarity:
+    """Normalize embeddings once and, for small inputs, compute the full
+    cosine matrix so pair search, LOF and statistics share a single GEMM.
+    """
+    normed = normalize_rows(embeddings)
+    matrix = normed @ normed.T if len(normed) <= max_dense else None
+    return PrecomputedSimilarity(normed=normed, matrix=matrix)
+
 
 def find_similar_pairs(
     embeddings: np.ndarray,
@@ -12,6 +54,7 @@ def find_similar_pairs(
     threshold: float = 0.75,
     skip_same_file: bool = True,
     max_pairs: int | None = None,
+    precomputed: PrecomputedSimilarity | None = None,
 ) -> list[SimilarPair]:
     """Find pairs of similar statements above threshold.
 
@@ -21,53 +64,164 @@ def find_similar_pairs(
         threshold: Minimum similarity score
         skip_same_file: Skip pairs from same file
         max_pairs: Maximum pairs to return
+        precomputed: Optional shared result of precompute_similarity
 
     Returns:
         List of SimilarPair sorted by similarity (descending)
     """
     n = len(embeddings)
-    if n < 2:
+    if n < 2 or max_pairs == 0:
         return []
 
-    # Calculate full similarity matrix
-    sim_matrix = cosine_similarity(embeddings)
-
-    # Find pairs above threshold
-    pairs: list[SimilarPair] = []
-
-    for i in range(n):
-        for j in range(i + 1, n):
-            sim = sim_matrix[i, j]
-
-            if sim < threshold:
-                continue
+    file_ids = _file_ids(statements) if skip_same_file else None
+
+    if precomputed is None:
+        precomputed = PrecomputedSimilarity(normed=normalize_rows(embeddings))
+
+    if file_ids is not None and precomputed.matrix is None:
+        # Group rows by file: same-file pairs then fall into diagonal blocks,
+        # and tiles lying entirely inside one file are never computed
+        perm = np.argsort(file_ids, kind="stable")
+        tile_file_ids = file_ids[perm]
+        tiles = _iter_normalized_tiles(precomputed.normed[perm], TILE_SIZE, groups=tile_file_ids)
+    else:
+        perm = None
+        tile_file_ids = file_ids
+        tiles = precomputed.iter_tiles()
+
+    # Stream the upper triangle tile by tile; the full matrix is never built
+    row_parts: list[np.ndarray] = []
+    col_parts: list[np.ndarray] = []
+    sim_parts: list[np.ndarray] = []
+
+    for i0, j0, tile in tiles:
+        keep = tile >= threshold
+        if i0 == j0:
+            # Diagonal tile: upper triangle only, excluding self-pairs
+            keep &= np.triu(np.ones(tile.shape, dtype=bool), k=1)
+
+        ti, tj = np.nonzero(keep)
+        ti += i0
+        tj += j0
+
+        # Skip same file if requested (only tiles straddling a file boundary)
+        if tile_file_ids is not None:
+            diff = tile_file_ids[ti] != tile_file_ids[tj]
+            ti, tj = ti[diff], tj[diff]
+
+        row_parts.append(ti)
+        col_parts.append(tj)
+        sim_parts.append(tile[ti - i0, tj - j0])
+
+    if not row_parts:
+        # Every tile was skipped (e.g. all statements come from one file)
+        return []
 
-            # Skip same file if requested
-            if skip_same_file:
-                if statements[i].source_file == statements[j].source_file:
-                    continue
+    rows = np.concatenate(row_parts)
+    cols = np.concatenate(col_parts)
+    sims = np.concatenate(sim_parts)
 
-            pairs.append(SimilarPair(idx_a=i, idx_b=j, similarity=float(sim)))
+    if perm is not None:
+        # Back to statement indices, smaller index first
+        rows, cols = perm[rows], perm[cols]
+        rows, cols = np.minimum(rows, cols), np.maximum(rows, cols)
 
-    # Sort by similarity descending
-    pairs.sort(key=lambda p: p.similarity, reverse=True)
+    # Sort by similarity descending; ties keep (row, col) order
+    order = np.lexsort((cols, rows, -sims))
 
     # Limit if requested
     if max_pairs is not None:
-        pairs = pairs[:max_pairs]
+        order = order[:max_pairs]
+
+    pairs = [
+        SimilarPair(idx_a=int(rows[k]), idx_b=int(cols[k]), similarity=float(sims[k]))
+        for k in order
+    ]
 
     return pairs
 
 
+def _file_ids(statements: list[Statement]) -> np.ndarray:
+    """Map each statement's source file to a small integer ID."""
+    ids: dict[Path, int] = {}
+    return np.fromiter(
+        (ids.setdefault(s.source_file, len(ids)) for s in statements),
+        dtype=np.int64,
+        count=len(statements),
+    )
+
+
+def normalize_rows(embeddings: np.ndarray) -> np.ndarray:
+    """L2-normalize rows as contiguous float32 (zero rows stay zero)."""
+    normed = np.array(embeddings, dtype=np.float32, order="C")
+    norms = np.linalg.norm(normed, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    normed /= norms
+    return normed
+
+
+def iter_similarity_tiles(
+    embeddings: np.ndarray,
+    block_size: int = TILE_SIZE,
+) -> Iterator[tuple[int, int, np.ndarray]]:
+    """Yield upper-triangle tiles of the cosine similarity matrix.
+
+    Each item is (row_offset, col_offset, tile) where tile covers
+    rows [row_offset, row_offset + block_size) and the same span of columns
+    starting at col_offset. Only tiles with col_offset >= row_offset are
+    produced, so memory stays at O(block_size²) instead of O(n²).
+    """
+    yield from _iter_normalized_tiles(normalize_rows(embeddings), block_size)
+
+
+def _iter_normalized_tiles(
+    normed: np.ndarray,
+    block_size: int,
+    groups: np.ndarray | None = None,
+) -> Iterator[tuple[int, int, np.ndarray]]:
+    """Tile generator over already-normalized rows.
+
+    If sorted group IDs are given, tiles whose rows and columns all belong
+    to the same group are skipped.
+    """
+    n = len(normed)
+
+    for i0 in range(0, n, block_size):
+        block = normed[i0 : i0 + block_size]
+        for j0 in range(i0, n, block_size):
+            j1 = min(j0 + block_size, n)
+            if groups is not None and groups[i0] == groups[j1 - 1]:
+                continue
+            yield i0, j0, block @ normed[j0:j1].T
+
+
 def get_similarity_matrix(embeddings: np.ndarray) -> np.ndarray:
-    """Calculate full cosine similarity matrix."""
+    """Calculate full cosine similarity matrix.
+
+    Materializes n×n values; prefer iter_similarity_tiles for large inputs.
+    """
     return cosine_similarity(embeddings)
 
 
+def build_index(embeddings: np.ndarray):
+    """Build a FAISS inner-product index over L2-normalized embeddings.
+
+    Returns None when FAISS is not installed; callers fall back to NumPy.
+    """
+    if faiss is None:
+        return None
+
+    normed = normalize_rows(embeddings)
+    index = faiss.IndexFlatIP(normed.shape[1])
+    index.add(normed)
+    return index
+
+
 def get_nearest_neighbors(
     embeddings: np.ndarray,
     query_idx: int,
     k: int = 5,
+    index=None,
 ) -> list[tuple[int, float]]:
     """Get k nearest neighbors for a statement.
 
@@ -75,6 +229,7 @@ def get_nearest_neighbors(
         embeddings: Embedding vectors
         query_idx: Index of query statement
         k: Number of neighbors
+        index: Optional prebuilt index from build_index (reuse across queries)
 
     Returns:
         List of (index, similarity) tuples
@@ -83,27 +238,36 @@ def get_nearest_neighbors(
     if n < 2:
         return []
 
+    if index is None:
+        index = build_index(embeddings)
+
+    if index is not None:
+        query = normalize_rows(embeddings[query_idx : query_idx + 1])
+        sims, ids = index.search(query, min(k + 1, n))
+        neighbors = [
+            (int(idx), float(sim))
+            for idx, sim in zip(ids[0], sims[0])
+            if idx != query_idx and idx >= 0
+        ]
+        return neighbors[:k]
+
     # Calculate similarities to query
     query = embeddings[query_idx].reshape(1, -1)
     similarities = cosine_similarity(query, embeddings)[0]
 
-    # Get top k (excluding self)
-    indices = np.argsort(similarities)[::-1]
-    neighbors: list[tuple[int, float]] = []
-
-    for idx in indices:
-        if idx == query_idx:
-            continue
-        neighbors.append((int(idx), float(similarities[idx])))
-        if len(neighbors) >= k:
-            break
+    # Partial top k+1 (self may be among them), then sort only those
+    m = min(k + 1, n)
+    top = np.argpartition(-similarities, m - 1)[:m] if m < n else np.arange(n)
+    top = top[np.argsort(-similarities[top], kind="stable")]
+    top = top[top != query_idx][:k]
 
-    return neighbors
+    return [(int(idx), float(similarities[idx])) for idx in top]
 
 
 def get_similarity_distribution(
     embeddings: np.ndarray,
     bins: int = 10,
+    precomputed: PrecomputedSimilarity | None = None,
 ) -> dict[str, int]:
     """Get histogram of pairwise similarities.
 
@@ -114,16 +278,17 @@ def get_similarity_distribution(
     if n < 2:
         return {}
 
-    sim_matrix = cosine_similarity(embeddings)
+    if precomputed is None:
+        precomputed = PrecomputedSimilarity(normed=normalize_rows(embeddings))
 
-    # Extract upper triangle (excluding diagonal)
-    similarities: list[float] = []
-    for i in range(n):
-        for j in range(i + 1, n):
-            similarities.append(sim_matrix[i, j])
+    # Accumulate histogram over upper triangle (excluding diagonal) tile by tile
+    counts = np.zeros(bins, dtype=np.int64)
+    edges = np.linspace(0, 1, bins + 1)
 
-    # Create histogram
-    counts, edges = np.histogram(similarities, bins=bins, range=(0, 1))
+    for i0, j0, tile in precomputed.iter_tiles():
+        if i0 == j0:
+            tile = tile[np.triu_indices(len(tile), k=1)]
+        counts += np.histogram(tile, bins=bins, range=(0, 1))[0]
 
     distribution: dict[str, int] = {}
     for i, count in enumerate(counts):
@@ -139,14 +304,14 @@ def average_similarity(embeddings: np.ndarray) -> float:
     if n < 2:
         return 1.0
 
-    sim_matrix = cosine_similarity(embeddings)
-
-    # Average of upper triangle
-    total = 0.0
-    count = 0
-    for i in range(n):
-        for j in range(i + 1, n):
-            total += sim_matrix[i, j]
-            count += 1
-
-    return total / count if count > 0 else 0.0
+    # Sum over all pairs of u_i·u_j is ‖Σu‖², so the upper triangle is
+    # (‖Σu‖² − Σ‖u_i‖²) / 2 without ever forming the n×n matrix. The unit
+    # rows are folded into the weights, so float16 input is read as-is and
+    # only the accumulators are widened.
+    sq_norms = np.einsum("ij,ij->i", embeddings, embeddings, dtype=np.float64)
+    nonzero = sq_norms > 0  # Zero rows stay zero, as in normalize_rows
+    inv_norms = np.zeros(n)
+    inv_norms[nonzero] = 1.0 / np.sqrt(sq_norms[nonzero])
+    total = np.einsum("ij,i->j", embeddings, inv_norms, dtype=np.float64)
+
+    return float((total @ total - np.count_nonzero(nonzero)) / (n * (n - 1)))
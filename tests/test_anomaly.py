@@ -10,10 +10,15 @@ from doc_analyzer.anomaly import (
     _isolation_forest_scores,
     _lof_scores,
     _hdbscan_scores,
+    _centroid_distance_scores,
+    _combine_scores,
+    _combine_scores_fast,
     _normalize_scores,
     classify_anomaly_severity,
+    get_anomaly_summary,
 )
 from doc_analyzer.config import AnomalyConfig
+from doc_analyzer.similarity import precompute_similarity
 from doc_analyzer.models import Statement, ClusterResult, Anomaly, AnomalyScores
 
 
@@ -56,6 +61,10 @@ class TestNormalizeScores:
         assert normalized.min() >= 0.0
         assert normalized.max() <= 1.0
 
+    def test_constant_scores_map_to_zero(self):
+        normalized = _normalize_scores(np.full(5, 3.0))
+        np.testing.assert_array_equal(normalized, np.zeros(5))
+
     def test_handles_empty_array(self):
         scores = np.array([])
         normalized = _normalize_scores(scores)
@@ -91,6 +100,16 @@ class TestLofScores:
         scores = _lof_scores(sample_embeddings, config)
         assert all(0 <= s <= 1 for s in scores)
 
+    @pytest.mark.parametrize("max_dense", [0, 1000])
+    def test_precomputed_matches_direct(self, sample_embeddings, max_dense):
+        config = AnomalyConfig(lof_neighbors=10)
+        precomputed = precompute_similarity(sample_embeddings, max_dense=max_dense)
+        np.testing.assert_allclose(
+            _lof_scores(sample_embeddings, config, precomputed),
+            _lof_scores(sample_embeddings, config),
+            atol=1e-4,
+        )
+
 
 class TestHdbscanScores:
     def test_noise_points_get_high_score(self, sample_cluster_result):
@@ -104,6 +123,38 @@ class TestHdbscanScores:
         assert all(scores[i] == 0.0 for i in range(90))
 
 
+class TestCentroidDistanceScores:
+    def test_matches_per_point_distances(self):
+        embeddings = np.array([[0.0, 0.0], [3.0, 4.0], [10.0, 0.0], [1.0, 0.0]])
+        cluster_result = ClusterResult(
+            labels=[0, 0, 1, -1],
+            centroids=[[0.0, 0.0], [10.0, 1.0]],
+            n_clusters=2,
+        )
+        scores = _centroid_distance_scores(embeddings, cluster_result)
+        # Raw distances: 0, 5, 1, 1 (noise -> nearest centroid)
+        np.testing.assert_allclose(scores, [0.0, 1.0, 0.2, 0.2], atol=1e-6)
+
+    def test_no_centroids_returns_zeros(self, sample_embeddings):
+        cluster_result = ClusterResult(labels=[0] * 100, centroids=[], n_clusters=0)
+        scores = _centroid_distance_scores(sample_embeddings, cluster_result)
+        assert not scores.any()
+
+
+class TestCombineScores:
+    def test_fast_path_matches_numpy(self):
+        rng = np.random.default_rng(0)
+        if_s, lof_s = rng.random(200), rng.random(200)
+        hd_s = (rng.random(200) > 0.9).astype(float)
+        args = (if_s, lof_s, hd_s, 0.4, 0.4, 0.2, 0.9, 0.9, 0.5, 2)
+        np.testing.assert_allclose(_combine_scores_fast(*args), _combine_scores(*args))
+
+    def test_clipped_to_unit_range(self):
+        ones = np.ones(10)
+        combined = _combine_scores(ones, ones, ones, 0.4, 0.4, 0.2, 0.5, 0.5, 0.5, 2)
+        assert combined.max() == 1.0
+
+
 class TestDetectAnomalies:
     def test_returns_anomaly_list(
         self, sample_statements, sample_embeddings, sample_cluster_result
@@ -126,6 +177,16 @@ class TestDetectAnomalies:
             scores = [a.score for a in anomalies]
             assert scores == sorted(scores, reverse=True)
 
+    def test_accepts_float16_memmap(
+        self, sample_statements, sample_embeddings, sample_cluster_result, tmp_path
+    ):
+        mm = np.memmap(tmp_path / "emb.f16", dtype=np.float16, mode="w+", shape=sample_embeddings.shape)
+        mm[:] = sample_embeddings
+        config = AnomalyConfig(method="ensemble", contamination=0.1)
+        from_fp16 = detect_anomalies(mm, sample_statements, sample_cluster_result, config)
+        assert from_fp16
+        assert all(isinstance(a, Anomaly) for a in from_fp16)
+
     def test_different_methods(
         self, sample_statements, sample_embeddings, sample_cluster_result
     ):
@@ -170,3 +231,23 @@ class TestClassifyAnomalySeverity:
             methods_flagged=["if"],
         )
         assert classify_anomaly_severity(anomaly) == "low"
+
+
+class TestGetAnomalySummary:
+    def test_empty(self):
+        assert get_anomaly_summary([])["total"] == 0
+
+    def test_aggregates(self):
+        stmt = Statement(text="test", source_file=Path("t.md"), line_number=1)
+        anomalies = [
+            Anomaly(statement=stmt, statement_idx=0, score=0.9, cluster_id=0, reason="",
+                    methods_flagged=["lof", "hdbscan"]),
+            Anomaly(statement=stmt, statement_idx=1, score=0.5, cluster_id=0, reason="",
+                    methods_flagged=["lof"]),
+        ]
+        summary = get_anomaly_summary(anomalies)
+        assert summary["total"] == 2
+        assert summary["by_method"] == {"lof": 2, "hdbscan": 1}
+        assert summary["avg_score"] == pytest.approx(0.7)
+        assert summary["max_score"] == pytest.approx(0.9)
+        assert summary["multi_method_count"] == 1
@@ -1,6 +1,7 @@
 """Tests for embedding cache."""
 
 import tempfile
+from collections import OrderedDict
 from pathlib import Path
 
 import numpy as np
@@ -86,6 +87,52 @@ class TestSaveAndGetCachedEmbeddings:
         cached, missing = get_cached_embeddings(sample_statements, model)
         assert missing == [2]  # Third one is missing
 
+    def test_lookup_spans_batches(self, sample_statements, sample_embeddings, monkeypatch):
+        from doc_analyzer import cache
+
+        model = "test-model"
+        clear_cache()
+        save_embeddings(sample_statements, sample_embeddings, model)
+
+        monkeypatch.setattr(cache, "SELECT_BATCH", 2)
+        cache._hot.clear()  # force the SQLite path
+        cached, missing = get_cached_embeddings(sample_statements, model)
+        assert missing == []
+        assert cached.dtype == np.float32
+        np.testing.assert_array_almost_equal(cached, sample_embeddings)
+
+    def test_quantized_roundtrip(self, sample_statements, sample_embeddings):
+        model = "test-model"
+        clear_cache()
+
+        save_embeddings(sample_statements, sample_embeddings, model, quantize=True)
+
+        from doc_analyzer import cache
+        cache._hot.clear()
+        cached, missing = get_cached_embeddings(sample_statements, model)
+        assert missing == []
+        assert cached.dtype == np.float32
+        # int8 with a per-vector scale is accurate to half a quantization step
+        step = np.abs(sample_embeddings).max(axis=1, keepdims=True) / 127
+        assert np.all(np.abs(cached - sample_embeddings) <= step / 2 + 1e-6)
+
+    def test_hot_tier_serves_repeat_lookups(self, sample_statements, sample_embeddings, tmp_path, monkeypatch):
+        from doc_analyzer import cache
+
+        # Private database, so deleting it below leaves the real cache alone
+        monkeypatch.setattr(cache, "CACHE_DIR", tmp_path)
+        monkeypatch.setattr(cache, "CACHE_DB", tmp_path / "embeddings.sqlite")
+        monkeypatch.setattr(cache, "_hot", OrderedDict())
+
+        model = "test-model"
+        save_embeddings(sample_statements, sample_embeddings, model)
+
+        # Lookups after a save never need the database
+        cache.CACHE_DB.unlink()
+        cached, missing = get_cached_embeddings(sample_statements, model)
+        assert missing == []
+        np.testing.assert_array_almost_equal(cached, sample_embeddings)
+
 
 class TestClearCache:
     def test_clears_all_entries(self, sample_statements, sample_embeddings):
@@ -131,3 +178,39 @@ class TestEmbedWithCache:
         assert len(embed_calls) == 1  # No additional calls
 
         np.testing.assert_array_almost_equal(result1, result2)
+
+    def test_fills_partial_hit(self, sample_statements, sample_embeddings):
+        model = "test-model"
+        clear_cache()
+        save_embeddings(sample_statements[:2], sample_embeddings[:2], model)
+
+        embed_calls = []
+
+        def mock_embed(stmts):
+            embed_calls.append(stmts)
+            return sample_embeddings[2:]
+
+        result = embed_with_cache(sample_statements, mock_embed, model)
+        assert embed_calls == [sample_statements[2:]]
+        assert result.dtype == np.float32
+        np.testing.assert_array_almost_equal(result, sample_embeddings)
+
+    def test_embeds_duplicate_texts_once(self, sample_statements, sample_embeddings):
+        model = "test-model"
+        clear_cache()
+
+        duplicate = Statement(
+            text=sample_statements[0].text, source_file=Path("d.md"), line_number=9,
+        )
+        statements = sample_statements + [duplicate]
+
+        embed_calls = []
+
+        def mock_embed(stmts):
+            embed_calls.append(stmts)
+            return sample_embeddings[:len(stmts)]
+
+        result = embed_with_cache(statements, mock_embed, model)
+        assert [len(stmts) for stmts in embed_calls] == [3]
+        assert result.shape == (4, 3)
+        np.testing.assert_array_almost_equal(result[3], result[0])
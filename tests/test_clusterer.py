@@ -0,0 +1,32 @@
+"""Tests for clustering."""
+
+import numpy as np
+import pytest
+from sklearn.cluster import KMeans
+from sklearn.metrics import silhouette_score
+
+from doc_analyzer.clusterer import _find_optimal_k
+
+
+@pytest.fixture
+def blob_embeddings():
+    """Four well-separated Gaussian blobs in 16 dimensions."""
+    rng = np.random.default_rng(42)
+    centers = rng.standard_normal((4, 16)) * 10
+    return np.vstack([c + rng.standard_normal((25, 16)) * 0.5 for c in centers]).astype(np.float32)
+
+
+class TestFindOptimalK:
+    def test_matches_exact_silhouette_on_blobs(self, blob_embeddings):
+        # Reference: the exhaustive sweep with the exact silhouette score
+        scores = {
+            k: silhouette_score(
+                blob_embeddings,
+                KMeans(n_clusters=k, n_init=10, random_state=42).fit_predict(blob_embeddings),
+            )
+            for k in range(2, 16)
+        }
+        expected = max(sorted(scores), key=scores.get)
+
+        assert expected == 4
+        assert _find_optimal_k(blob_embeddings) == expected
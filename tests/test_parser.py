@@ -1,46 +1,43 @@
 """Tests for document parser."""
 
-import tempfile
-from pathlib import Path
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Final, NamedTuple
 
 import pytest
 
-from doc_analyzer.parser import parse_documents, get_file_stats
+from doc_analyzer import parser
+from doc_analyzer.parser import (
+    iter_documents,
+    parse_documents,
+    parse_documents_cached,
+    get_file_stats,
+    _extract_json_strings,
+)
 from doc_analyzer.models import Statement
 
+# Under pytest-xdist --dist loadgroup, keep this module on one worker so the
+# module-scoped corpus is built once instead of once per worker
+pytestmark = pytest.mark.xdist_group("parser_corpus")
 
-class TestParseDocuments:
-    def test_parses_markdown_paragraphs(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            md_file = Path(tmpdir) / "test.md"
-            md_file.write_text("""# Header
+EXT_MD: tuple[str, ...] = (".md",)
+EXT_TXT: tuple[str, ...] = (".txt",)
+EXT_JSON: tuple[str, ...] = (".json",)
+
+_MD_TWO_PARA: Final[str] = """# Header
 
 This is the first paragraph with enough content to meet the minimum length requirement for testing purposes.
 
 This is the second paragraph also with enough content to pass the filter and be included in results.
-""")
-            statements = parse_documents(Path(tmpdir), min_length=20, extensions=('.md',))
-            assert len(statements) == 2
-            assert "first paragraph" in statements[0].text
-            assert "second paragraph" in statements[1].text
+"""
 
-    def test_skips_short_paragraphs(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            md_file = Path(tmpdir) / "test.md"
-            md_file.write_text("""# Header
+_MD_SHORT_MIXED: Final[str] = """# Header
 
 Short.
 
 This paragraph has enough content to meet the minimum length requirement for testing purposes and filtering.
-""")
-            statements = parse_documents(Path(tmpdir), min_length=50, extensions=('.md',))
-            assert len(statements) == 1
-            assert "enough content" in statements[0].text
+"""
 
-    def test_skips_code_blocks(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            md_file = Path(tmpdir) / "test.md"
-            md_file.write_text("""# Header
+_MD_CODEBLOCK: Final[str] = """# Header
 
 This is a normal paragraph with content that should be included in results.
 
@@ -50,61 +47,219 @@ def hello():
 ```
 
 Another normal paragraph here with enough content for testing.
-""")
-            statements = parse_documents(Path(tmpdir), min_length=20, extensions=('.md',))
-            # Should not include the code block
-            for stmt in statements:
-                assert "def hello" not in stmt.text
-                assert "print" not in stmt.text
-
-    def test_statement_has_metadata(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            md_file = Path(tmpdir) / "test.md"
-            md_file.write_text("First paragraph with enough content for testing purposes and assertions.")
-            statements = parse_documents(Path(tmpdir), min_length=20, extensions=('.md',))
-            assert len(statements) == 1
-            assert statements[0].source_file.name == "test.md"
-            assert statements[0].line_number >= 1
-
-    def test_parses_json_strings(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            json_file = Path(tmpdir) / "test.json"
-            json_file.write_text('{"key": "This is a value with enough content to pass the filter for testing"}')
-            statements = parse_documents(Path(tmpdir), min_length=20, extensions=('.json',))
-            assert len(statements) >= 1
-            assert any("enough content" in s.text for s in statements)
-
-    def test_parses_nested_json(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            json_file = Path(tmpdir) / "test.json"
-            json_file.write_text('{"outer": {"inner": "Nested value with sufficient content for testing purposes"}}')
-            statements = parse_documents(Path(tmpdir), min_length=20, extensions=('.json',))
-            assert any("Nested value" in s.text for s in statements)
-
-    def test_filters_by_extension(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            md_file = Path(tmpdir) / "test.md"
-            md_file.write_text("Markdown content with enough length for testing purposes and filtering.")
-
-            txt_file = Path(tmpdir) / "test.txt"
-            txt_file.write_text("Text content with enough length for testing purposes here and more.")
-
-            # Only parse .md files
-            statements = parse_documents(Path(tmpdir), min_length=20, extensions=('.md',))
-            assert all(s.source_file.suffix == '.md' for s in statements)
-
-    def test_handles_empty_directory(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            statements = parse_documents(Path(tmpdir), min_length=20, extensions=('.md',))
-            assert statements == []
+"""
+
+_MD_ONE_PARA: Final[str] = "First paragraph with enough content for testing purposes and assertions."
+
+_TXT_TWO_PARA: Final[str] = (
+    "First text paragraph with enough content for testing purposes.\n"
+    "It continues on a second line.\n"
+    "\n"
+    "\n"
+    "Second text paragraph with enough content for testing purposes.\n"
+)
+
+_JSON_FLAT: Final[str] = '{"key": "This is a value with enough content to pass the filter for testing"}'
+
+_JSON_NESTED: Final[str] = '{"outer": {"inner": "Nested value with sufficient content for testing purposes"}}'
+
+_MD_FILTER: Final[str] = "Markdown content with enough length for testing purposes and filtering."
+
+_TXT_FILTER: Final[str] = "Text content with enough length for testing purposes here and more."
+
+
+def _check_markdown_paragraphs(statements):
+    assert len(statements) == 2
+    assert "first paragraph" in statements[0].text
+    assert "second paragraph" in statements[1].text
+
+
+def _check_short_paragraphs(statements):
+    assert len(statements) == 1
+    assert "enough content" in statements[0].text
+
+
+def _check_code_blocks(statements):
+    # Should not include the code block
+    for stmt in statements:
+        assert "def hello" not in stmt.text
+        assert "print" not in stmt.text
+
+
+def _check_metadata(statements):
+    assert len(statements) == 1
+    assert statements[0].source_file.name == "test.md"
+    assert statements[0].line_number >= 1
+
+
+def _check_text_paragraphs(statements):
+    assert len(statements) == 2
+    assert "second line" in statements[0].text
+    assert statements[0].line_number == 1
+    assert statements[1].line_number == 5
+
+
+def _check_json_strings(statements):
+    assert len(statements) >= 1
+    assert any("enough content" in s.text for s in statements)
+
+
+def _check_nested_json(statements):
+    assert any("Nested value" in s.text for s in statements)
+
+
+class ParseCase(NamedTuple):
+    """One single-file parse scenario, laid out in its own corpus subdirectory."""
+    name: str
+    filename: str
+    body: bytes  # UTF-8, encoded once at import
+    kwargs: dict
+    check: Callable[[list[Statement]], None]
+
+
+PARSE_CASES = [
+    ParseCase("markdown_paragraphs", "test.md", _MD_TWO_PARA.encode(), {"min_length": 20, "extensions": EXT_MD},
+              _check_markdown_paragraphs),
+    ParseCase("skips_short_paragraphs", "test.md", _MD_SHORT_MIXED.encode(), {"min_length": 50, "extensions": EXT_MD},
+              _check_short_paragraphs),
+    ParseCase("skips_code_blocks", "test.md", _MD_CODEBLOCK.encode(), {"min_length": 20, "extensions": EXT_MD},
+              _check_code_blocks),
+    ParseCase("statement_metadata", "test.md", _MD_ONE_PARA.encode(), {"min_length": 20, "extensions": EXT_MD},
+              _check_metadata),
+    ParseCase("text_paragraphs", "test.txt", _TXT_TWO_PARA.encode(), {"min_length": 20, "extensions": EXT_TXT},
+              _check_text_paragraphs),
+    ParseCase("cr_line_endings", "test.txt", _TXT_TWO_PARA.replace("\n", "\r").encode(),
+              {"min_length": 20, "extensions": EXT_TXT}, _check_text_paragraphs),
+    ParseCase("crlf_line_endings", "test.txt", _TXT_TWO_PARA.replace("\n", "\r\n").encode(),
+              {"min_length": 20, "extensions": EXT_TXT}, _check_text_paragraphs),
+    ParseCase("json_strings", "test.json", _JSON_FLAT.encode(), {"min_length": 20, "extensions": EXT_JSON},
+              _check_json_strings),
+    ParseCase("nested_json", "test.json", _JSON_NESTED.encode(), {"min_length": 20, "extensions": EXT_JSON},
+              _check_nested_json),
+]
+
+
+@pytest.fixture(scope="module")
+def corpus(tmp_path_factory):
+    """Write every parser fixture file once per module, one subdirectory per case."""
+    root = tmp_path_factory.mktemp("corpus")
+    for case in PARSE_CASES:
+        (root / case.name).mkdir()
+        (root / case.name / case.filename).write_bytes(case.body)
+
+    mixed = root / "mixed_ext"
+    mixed.mkdir()
+    (mixed / "test.md").write_bytes(_MD_FILTER.encode())
+    (mixed / "test.txt").write_bytes(_TXT_FILTER.encode())
+    return root
+
+
+class TestParseDocuments:
+    @pytest.mark.parametrize("case", PARSE_CASES, ids=lambda case: case.name)
+    def test_parses_single_file(self, corpus, case):
+        case.check(parse_documents(corpus / case.name, **case.kwargs))
+
+    def test_filters_by_extension(self, corpus):
+        # Only parse .md files
+        statements = parse_documents(corpus / "mixed_ext", min_length=20, extensions=EXT_MD)
+        assert all(s.source_file.suffix == '.md' for s in statements)
+
+    @pytest.mark.parametrize("pool_fails", [False, True], ids=["pool", "fallback"])
+    def test_parallel_parse_preserves_order(self, tmp_path, monkeypatch, pool_fails):
+        # Force the process pool regardless of corpus size
+        monkeypatch.setattr(parser, "PARALLEL_MIN_BYTES", 0)
+        if pool_fails:
+            def broken_pool(*args, **kwargs):
+                raise BrokenProcessPool("worker failed to start")
+            monkeypatch.setattr(parser, "ProcessPoolExecutor", broken_pool)
+        n_files = 20
+        for i in range(n_files):
+            (tmp_path / f"doc{i:03d}.md").write_text(
+                f"Paragraph one of document {i} with enough content for testing.\n\n"
+                f"Paragraph two of document {i} with enough content for testing.\n"
+            )
+        statements = parse_documents(tmp_path, min_length=20, extensions=EXT_MD)
+        assert len(statements) == 2 * n_files
+        assert [s.source_file.name for s in statements[::2]] == [
+            f"doc{i:03d}.md" for i in range(n_files)
+        ]
+        assert "Paragraph one" in statements[0].text
+        assert "Paragraph two" in statements[1].text
+
+    def test_iter_documents_yields_per_file(self, tmp_path):
+        for name in ("b.md", "a.md"):
+            (tmp_path / name).write_text(
+                f"First paragraph of {name} with enough content for testing.\n\n"
+                f"Second paragraph of {name} with enough content for testing.\n"
+            )
+        per_file = list(iter_documents(tmp_path, min_length=20, extensions=EXT_MD))
+        assert [[s.source_file.name for s in stmts] for stmts in per_file] == [
+            ["a.md", "a.md"], ["b.md", "b.md"],
+        ]
+        flat = [s for stmts in per_file for s in stmts]
+        assert flat == parse_documents(tmp_path, min_length=20, extensions=EXT_MD)
+
+    def test_cached_parse_reuses_result_until_file_changes(self, tmp_path, monkeypatch):
+        cache_dir = tmp_path / "cache"
+        monkeypatch.setattr(parser, "PARSE_CACHE_DIR", cache_dir)
+        md_file = tmp_path / "test.md"
+        md_file.write_text("A paragraph with enough content to pass the length filter.\n")
+
+        first = parse_documents_cached(tmp_path, min_length=20, extensions=EXT_MD)
+        assert first == parse_documents(tmp_path, min_length=20, extensions=EXT_MD)
+        assert len(list(cache_dir.glob("*.pkl"))) == 1
+
+        with monkeypatch.context() as m:
+            m.setattr(parser, "_parse_files", lambda *args: pytest.fail("cache miss"))
+            assert parse_documents_cached(tmp_path, min_length=20, extensions=EXT_MD) == first
+
+        md_file.write_text("A different paragraph, which is also long enough to be kept.\n")
+        changed = parse_documents_cached(tmp_path, min_length=20, extensions=EXT_MD)
+        assert "different paragraph" in changed[0].text
+        # The stale entry is overwritten, not left beside a new one
+        assert len(list(cache_dir.glob("*.pkl"))) == 1
+
+    def test_cached_parse_keeps_the_callers_path_spelling(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(parser, "PARSE_CACHE_DIR", tmp_path / "cache")
+        monkeypatch.chdir(tmp_path)
+        docs = tmp_path / "docs"
+        docs.mkdir()
+        (docs / "test.md").write_text("A paragraph with enough content to pass the length filter.\n")
+
+        relative = parse_documents_cached("docs", min_length=20, extensions=EXT_MD)
+        absolute = parse_documents_cached(docs, min_length=20, extensions=EXT_MD)
+        assert relative[0].source_file.as_posix() == "docs/test.md"
+        assert absolute[0].source_file == docs / "test.md"
+
+    def test_handles_empty_directory(self, tmp_path):
+        statements = parse_documents(tmp_path, min_length=20, extensions=EXT_MD)
+        assert statements == []
+
+
+class TestExtractJsonStrings:
+    def test_preserves_document_order_and_paths(self):
+        data = {"a": ["x", {"b": "y", "c": ["z", " "]}], "d": "w"}
+        assert _extract_json_strings(data) == [
+            ("x", ("a", "0")),
+            ("y", ("a", "1", "b")),
+            ("z", ("a", "1", "c", "0")),
+            ("w", ("d",)),
+        ]
+
+    def test_handles_deep_nesting(self):
+        data: object = "Deep value"
+        for _ in range(5000):
+            data = {"k": data}
+        strings = _extract_json_strings(data)
+        assert strings[0][0] == "Deep value"
+        assert len(strings[0][1]) == 5000
 
 
 class TestGetFileStats:
-    def test_returns_stats_dict(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            md_file = Path(tmpdir) / "test.md"
-            md_file.write_text("Some content here.")
-
-            stats = get_file_stats(tmpdir)
-            assert "total_files" in stats
-            assert stats["total_files"] >= 1
+    def test_returns_stats_dict(self, tmp_path):
+        md_file = tmp_path / "test.md"
+        md_file.write_bytes(b"Some content here.")
+
+        stats = get_file_stats(tmp_path)
+        assert "total_files" in stats
+        assert stats["total_files"] >= 1
@@ -0,0 +1,169 @@
+"""Tests for similarity search."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from doc_analyzer import similarity
+from doc_analyzer.similarity import (
+    average_similarity,
+    find_similar_pairs,
+    get_nearest_neighbors,
+    get_similarity_distribution,
+    iter_similarity_tiles,
+    precompute_similarity,
+)
+from doc_analyzer.models import Statement
+
+
+@pytest.fixture
+def sample_statements():
+    """Create statements spread over two files."""
+    return [
+        Statement(text=f"Statement {i}", source_file=Path(f"{'a' if i % 2 else 'b'}.md"), line_number=i)
+        for i in range(40)
+    ]
+
+
+@pytest.fixture
+def sample_embeddings():
+    """Create sample embeddings."""
+    rng = np.random.default_rng(42)
+    return rng.standard_normal((40, 16))
+
+
+def _reference_pairs(embeddings, statements, threshold, skip_same_file):
+    """Brute-force reference implementation."""
+    normed = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+    sim = normed @ normed.T
+    pairs = []
+    for i in range(len(embeddings)):
+        for j in range(i + 1, len(embeddings)):
+            if sim[i, j] < threshold:
+                continue
+            if skip_same_file and statements[i].source_file == statements[j].source_file:
+                continue
+            pairs.append((i, j, sim[i, j]))
+    pairs.sort(key=lambda p: p[2], reverse=True)
+    return pairs
+
+
+class TestFindSimilarPairs:
+    @pytest.mark.parametrize("skip_same_file", [True, False])
+    def test_matches_reference(self, sample_embeddings, sample_statements, skip_same_file):
+        pairs = find_similar_pairs(
+            sample_embeddings, sample_statements,
+            threshold=0.2, skip_same_file=skip_same_file,
+        )
+        expected = _reference_pairs(sample_embeddings, sample_statements, 0.2, skip_same_file)
+        assert [(p.idx_a, p.idx_b) for p in pairs] == [(i, j) for i, j, _ in expected]
+        np.testing.assert_allclose([p.similarity for p in pairs], [s for _, _, s in expected], rtol=1e-5)
+
+    def test_skips_same_file(self, sample_embeddings, sample_statements):
+        pairs = find_similar_pairs(sample_embeddings, sample_statements, threshold=-1.0)
+        assert pairs
+        assert all(
+            sample_statements[p.idx_a].source_file != sample_statements[p.idx_b].source_file
+            for p in pairs
+        )
+
+    def test_respects_max_pairs(self, sample_embeddings, sample_statements):
+        pairs = find_similar_pairs(sample_embeddings, sample_statements, threshold=-1.0, max_pairs=5)
+        assert len(pairs) == 5
+        sims = [p.similarity for p in pairs]
+        assert sims == sorted(sims, reverse=True)
+
+    def test_zero_max_pairs_skips_search(self, sample_embeddings, sample_statements, monkeypatch):
+        monkeypatch.setattr(similarity, "normalize_rows", lambda *args: pytest.fail("searched"))
+        assert find_similar_pairs(sample_embeddings, sample_statements, threshold=-1.0, max_pairs=0) == []
+
+    def test_small_tiles_match_reference(self, sample_embeddings, monkeypatch):
+        # Few large files so whole tiles fall inside one file and get skipped
+        statements = [
+            Statement(text=f"Statement {i}", source_file=Path(f"{i % 3}.md"), line_number=i)
+            for i in range(len(sample_embeddings))
+        ]
+        monkeypatch.setattr(similarity, "TILE_SIZE", 4)
+        pairs = find_similar_pairs(sample_embeddings, statements, threshold=0.1)
+        expected = _reference_pairs(sample_embeddings, statements, 0.1, True)
+        assert [(p.idx_a, p.idx_b) for p in pairs] == [(i, j) for i, j, _ in expected]
+
+    @pytest.mark.parametrize("max_dense", [0, 1000])
+    def test_precomputed_matches_direct(self, sample_embeddings, sample_statements, max_dense):
+        precomputed = precompute_similarity(sample_embeddings, max_dense=max_dense)
+        direct = find_similar_pairs(sample_embeddings, sample_statements, threshold=0.1)
+        shared = find_similar_pairs(
+            sample_embeddings, sample_statements, threshold=0.1, precomputed=precomputed,
+        )
+        assert [(p.idx_a, p.idx_b) for p in shared] == [(p.idx_a, p.idx_b) for p in direct]
+
+    def test_single_file_returns_no_pairs(self, sample_embeddings):
+        statements = [
+            Statement(text=f"Statement {i}", source_file=Path("single.md"), line_number=i)
+            for i in range(len(sample_embeddings))
+        ]
+        assert find_similar_pairs(sample_embeddings, statements, threshold=-1.0) == []
+
+    def test_handles_single_statement(self, sample_embeddings, sample_statements):
+        assert find_similar_pairs(sample_embeddings[:1], sample_statements[:1]) == []
+
+
+class TestIterSimilarityTiles:
+    def test_tiles_cover_upper_triangle(self, sample_embeddings):
+        normed = sample_embeddings / np.linalg.norm(sample_embeddings, axis=1, keepdims=True)
+        expected = normed @ normed.T
+        n = len(sample_embeddings)
+
+        covered = np.zeros((n, n), dtype=bool)
+        for i0, j0, tile in iter_similarity_tiles(sample_embeddings, block_size=7):
+            assert j0 >= i0
+            rows, cols = tile.shape
+            np.testing.assert_allclose(tile, expected[i0:i0 + rows, j0:j0 + cols], atol=1e-5)
+            covered[i0:i0 + rows, j0:j0 + cols] = True
+
+        assert covered[np.triu_indices(n, k=1)].all()
+
+
+class TestGetNearestNeighbors:
+    @pytest.mark.parametrize("use_faiss", [True, False])
+    def test_returns_top_k_excluding_self(self, sample_embeddings, monkeypatch, use_faiss):
+        if use_faiss and similarity.faiss is None:
+            pytest.skip("faiss not installed")
+        if not use_faiss:
+            monkeypatch.setattr(similarity, "faiss", None)
+
+        normed = sample_embeddings / np.linalg.norm(sample_embeddings, axis=1, keepdims=True)
+        sims = normed @ normed[3]
+        sims[3] = -np.inf
+        expected = list(np.argsort(-sims)[:5])
+
+        neighbors = get_nearest_neighbors(sample_embeddings, 3, k=5)
+        assert [idx for idx, _ in neighbors] == expected
+        np.testing.assert_allclose([s for _, s in neighbors], sims[expected], rtol=1e-5)
+
+
+class TestGetSimilarityDistribution:
+    def test_counts_upper_triangle(self, sample_embeddings):
+        distribution = get_similarity_distribution(sample_embeddings)
+        normed = sample_embeddings / np.linalg.norm(sample_embeddings, axis=1, keepdims=True)
+        sims = (normed @ normed.T)[np.triu_indices(len(normed), k=1)]
+        assert sum(distribution.values()) == int(((sims >= 0) & (sims <= 1)).sum())
+
+    def test_precomputed_matches_direct(self, sample_embeddings):
+        precomputed = precompute_similarity(sample_embeddings)
+        assert get_similarity_distribution(
+            sample_embeddings, precomputed=precomputed,
+        ) == get_similarity_distribution(sample_embeddings)
+
+
+class TestAverageSimilarity:
+    @pytest.mark.parametrize("dtype", [np.float32, np.float16])
+    def test_matches_upper_triangle_mean(self, sample_embeddings, dtype):
+        embeddings = sample_embeddings.astype(dtype)
+        normed = sample_embeddings / np.linalg.norm(sample_embeddings, axis=1, keepdims=True)
+        expected = (normed @ normed.T)[np.triu_indices(len(normed), k=1)].mean()
+        assert average_similarity(embeddings) == pytest.approx(expected, abs=1e-3)
+
+    def test_single_row_is_fully_dense(self, sample_embeddings):
+        assert average_similarity(sample_embeddings[:1]) == 1.0